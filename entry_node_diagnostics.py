@@ -3,28 +3,34 @@ import json
 import folium
 from folium.plugins import MarkerCluster
 import logging
-from pyproj import Transformer
+import numpy as np
+
+from utils.crs import artifact_wgs84, to_wgs84
 
 from utils.constants import (
     FILTERED_SUB_NETWORK_POLYGON_FILE,
     STATION_HELPER_FILE,
-    STATION_ENTRY_NODE_FILE
+    STATION_ENTRY_NODE_FILE,
+    STATION_DIAGNOSTICS_MAP_FILE
 )
 
-def parse_geo_shape(geo_shape_str):
-    try:
-        geojson = json.loads(geo_shape_str.replace("'", '"'))
-        return geojson['coordinates']
-    except Exception as e:
-        logging.warning(f"⚠️ Failed to parse geo shape: {e}")
-        return []
+# Pipeline DAG declaration (file and constant names refer to utils.constants)
+PIPELINE_NODE = {
+    "name": "entry_node_diagnostics",
+    "title": "Entry Node Diagnostics Map",
+    "stage": None,
+    "entry": "plot_station_diagnostics",
+    "inputs": ["FILTERED_SUB_NETWORK_POLYGON_FILE", "STATION_HELPER_FILE", "STATION_ENTRY_NODE_FILE"],
+    "outputs": ["STATION_DIAGNOSTICS_MAP_FILE"],
+    "constants": [],
+}
 
-def transform_coords(coord_list, transformer):
-    """Transform list of [x, y] from EPSG:2056 to [lat, lon] EPSG:4326."""
-    return [list(transformer.transform(x, y)[::-1]) for x, y in coord_list]
+def transform_coords(coord_list, transformer=None):
+    """Transform list of [x, y] from EPSG:2056 to [lat, lon] EPSG:4326 in one array call."""
+    return to_wgs84(np.asarray(coord_list, dtype=np.float64)[:, :2], transformer).tolist()
 
-def plot_station_diagnostics():
-    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+def plot_station_diagnostics(debug=False):
+    logging.basicConfig(level=logging.DEBUG if debug else logging.INFO, format='%(levelname)s: %(message)s')
     logging.info("🚀 Loading data...")
 
     try:
@@ -34,22 +40,19 @@ def plot_station_diagnostics():
             entry_nodes = json.load(f)
     except Exception as e:
         logging.error(f"❌ Failed to load input files: {e}")
-        return
-
-    # EPSG:2056 → EPSG:4326 transformer
-    transformer = Transformer.from_crs(2056, 4326, always_xy=True)
+        raise
 
     m = folium.Map(location=[46.8182, 8.2275], zoom_start=8)
     marker_cluster = MarkerCluster().add_to(m)
 
     # Plot GeoShapes (red polylines)
     logging.info("🔴 Plotting segment lines...")
-    for idx, row in polygon_df.iterrows():
-        coords = parse_geo_shape(row.get('Geo shape', ''))
-        if coords:
-            transformed_coords = transform_coords(coords, transformer)
+    # All segment vertices projected in one call (cached per input file hash)
+    latlon, offsets = artifact_wgs84(FILTERED_SUB_NETWORK_POLYGON_FILE, 'Geo shape')
+    for i in range(len(polygon_df)):
+        if offsets[i + 1] > offsets[i]:
             folium.PolyLine(
-                locations=transformed_coords,
+                locations=latlon[offsets[i]:offsets[i + 1]].tolist(),
                 color='red',
                 weight=2,
                 opacity=0.7
@@ -57,6 +60,7 @@ def plot_station_diagnostics():
 
     # Plot center coordinates (blue X + station code)
     logging.info("🔵 Plotting station centers...")
+    centers = []
     for idx, row in station_df.iterrows():
         center = row.get('center_coordinates')
         station = row.get('station')
@@ -67,29 +71,30 @@ def plot_station_diagnostics():
                 logging.warning(f"⚠️ Failed to parse center_coordinates for {station}: {e}")
                 continue
         if center:
-            latlon = transformer.transform(center[0], center[1])[::-1]
-            folium.Marker(
-                location=latlon,
-                icon=folium.DivIcon(
-                    html=f'<div style="color:blue;font-size:12px;">✕ {station}</div>'
-                )
-            ).add_to(marker_cluster)
+            centers.append((station, center[:2]))
+    center_latlon = transform_coords([c for _, c in centers]) if centers else []
+    for (station, _), location in zip(centers, center_latlon):
+        folium.Marker(
+            location=location,
+            icon=folium.DivIcon(
+                html=f'<div style="color:blue;font-size:12px;">✕ {station}</div>'
+            )
+        ).add_to(marker_cluster)
 
     # Plot entry nodes (yellow circles)
     logging.info("🟡 Plotting entry nodes...")
-    for station, directions in entry_nodes.items():
-        for direction, coord in directions.items():
-            if coord:
-                latlon = transformer.transform(coord[0], coord[1])[::-1]
-                folium.CircleMarker(
-                    location=latlon,
-                    radius=4,
-                    color='yellow',
-                    fill=True,
-                    fill_opacity=0.9
-                ).add_to(m)
+    entry_coords = [coord[:2] for directions in entry_nodes.values() for coord in directions.values() if coord]
+    for location in (transform_coords(entry_coords) if entry_coords else []):
+        folium.CircleMarker(
+            location=location,
+            radius=4,
+            color='yellow',
+            fill=True,
+            fill_opacity=0.9
+        ).add_to(m)
 
-    output_file = 'station_diagnostics_map.html'
+    output_file = STATION_DIAGNOSTICS_MAP_FILE
+    output_file.parent.mkdir(parents=True, exist_ok=True)
     m.save(output_file)
     logging.info(f"✅ Interactive map saved as {output_file}")
 
@@ -1,37 +1,317 @@
 import argparse
+import sys
+import time
+from pathlib import Path
 
-# Aşamaları import et
-from stages.stage_01_clean_stations import run as run_stage_01
-from stages.stage_02_generate_nodes import run as run_stage_02
-# from stages.stage_03_generate_edges import run as run_stage_03
+from utils.constants import PIPELINE_MANIFEST_FILE, RUN_REPORT_FILE, PROFILE_DIR
+from utils.pipeline import (
+    discover_nodes, load_entry_point, entry_kwargs, build_dag, topological_order, node_fingerprint, is_up_to_date,
+    load_manifest, save_manifest, record_success, resolve_path
+)
+from utils.profiling import (
+    profile_call, count_rows, write_report, load_report, previous_report_path,
+    compare_reports, print_comparison
+)
 
-# Stage numarası: (isim, fonksiyon)
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+# Pipeline düğümleri: bu dosya/klasörlerde PIPELINE_NODE tanımlayan her modül kaydedilir.
+# Modüller sadece okunur (import edilmez); giriş fonksiyonu düğüm çalışırken yüklenir.
+NODE_SOURCES = [
+    "stages",
+    "scripts/diagnostics",
+    "entry_node_diagnostics.py",
+]
+
+NODES = discover_nodes(PROJECT_ROOT, NODE_SOURCES)
+
+# Stage numarası: (isim, giriş noktası "modül:fonksiyon")
 STAGES = {
-    1: ("Stage 01 - Clean Stations", run_stage_01),
-    2: ("Stage 02 - Generate Nodes", run_stage_02),
-    # 3: ("Stage 03 - Generate Edges", run_stage_03),
+    node["stage"]: (node["title"], f"{node['module']}:{node['entry']}")
+    for node in NODES.values() if node["stage"] is not None
 }
 
-def run_selected_stages(start: int, end: int, debug_mode=False):
+def select_nodes(start: int, end: int, node_names=None, run_all=False) -> set:
+    """
+    Pick the nodes to run: numbered stages in [start, end], explicit names, or everything.
+    """
+    if run_all:
+        return set(NODES)
+    if node_names:
+        unknown = set(node_names) - set(NODES)
+        if unknown:
+            raise SystemExit(f"❌ Unknown pipeline nodes: {sorted(unknown)}. Known: {sorted(NODES)}")
+        return set(node_names)
     for i in range(start, end + 1):
-        name, func = STAGES.get(i, (None, None))
-        if not func:
+        if i not in STAGES:
             print(f"⚠️ Stage {i} tanımlı değil, atlanıyor.")
+    return {name for name, node in NODES.items() if node["stage"] is not None and start <= node["stage"] <= end}
+
+def _execute_node(module_name: str, entry: str, debug_mode: bool, profile_path=None, config=None,
+                  stage_jobs=None) -> dict:
+    """
+    Import a node's module and call its entry function (runs inside a worker process).
+
+    Returns:
+        dict: wall_s, cpu_s, peak_rss_mb and pstats (see utils.profiling.profile_call).
+    """
+    func = load_entry_point({"module": module_name, "entry": entry})
+    return profile_call(func, profile_path=profile_path, **entry_kwargs(func, debug_mode, config, stage_jobs))
+
+def print_summary(results: dict) -> None:
+    print("\n📋 Pipeline summary")
+    for name, (status, wall_time, message) in results.items():
+        icon = {"ok": "✅", "cached": "♻️", "failed": "❌", "skipped": "⏭️"}[status]
+        timing = f"{wall_time:8.2f} s" if wall_time is not None else " " * 10
+        print(f"   {icon} {name:<32} {status:<8} {timing}  {message}")
+
+def _create_executor(jobs: int, profile: bool):
+    if jobs <= 1 and not profile:
+        return None
+    from concurrent.futures import ProcessPoolExecutor
+    if profile:
+        # One fresh worker per node so peak RSS is measured per node (Python 3.11+)
+        try:
+            return ProcessPoolExecutor(max_workers=jobs, max_tasks_per_child=1)
+        except TypeError:
+            print("⚠️ max_tasks_per_child needs Python 3.11+, peak RSS is a per-worker high-water mark")
+    return ProcessPoolExecutor(max_workers=jobs)
+
+def run_selected_stages(start: int, end: int, debug_mode=False, node_names=None, run_all=False,
+                        force=False, jobs: int = 1, profile: bool = False, profile_dump: bool = False,
+                        config=None, stage_jobs=None) -> dict:
+    """
+    Run the selected nodes in dependency order, up to `jobs` at a time.
+
+    A node starts once every selected upstream node has finished. A failing node
+    only skips its own dependents; independent nodes keep running.
+    With `profile`, per-node wall/CPU time, peak RSS and input/output row counts are
+    written to RUN_REPORT_FILE (and cProfile dumps to PROFILE_DIR with `profile_dump`).
+    `config` (a PipelineConfig) replaces utils.constants for nodes whose entry accepts it,
+    `stage_jobs` sets the worker processes inside nodes whose entry takes `jobs`.
+
+    Returns:
+        dict: Node name → (status, wall time in seconds, message)
+    """
+    selected = select_nodes(start, end, node_names, run_all)
+    dependencies = {name: deps & selected for name, deps in build_dag(NODES).items()}
+    manifest = load_manifest(PIPELINE_MANIFEST_FILE)
+    hash_cache = manifest["file_hashes"]
+
+    pending = [name for name in topological_order(NODES) if name in selected]
+    results = {}
+    running = {}
+    fingerprints = {}
+    metrics = {}
+    executor = _create_executor(jobs, profile)
+
+    def finished(name):
+        return name in results and results[name][0] in ("ok", "cached")
+
+    def failed(name):
+        return name in results and results[name][0] in ("failed", "skipped")
+
+    def complete(name, node_metrics=None, error=None, wall_time=None):
+        node = NODES[name]
+        if node_metrics is not None:
+            wall_time = node_metrics["wall_s"]
+            metrics[name].update(node_metrics)
+        missing_outputs = [o for o in node["outputs"] if not resolve_path(o).exists()]
+        if error is not None:
+            results[name] = ("failed", wall_time, f"{type(error).__name__}: {error}")
+        elif missing_outputs:
+            results[name] = ("failed", wall_time, f"did not produce {missing_outputs}")
+        else:
+            record_success(node, fingerprints[name], manifest, hash_cache)
+            save_manifest(PIPELINE_MANIFEST_FILE, manifest)
+            results[name] = ("ok", wall_time, "")
+        metrics[name]["status"] = results[name][0]
+        if profile:
+            metrics[name]["output_rows"] = {o: count_rows(resolve_path(o)) for o in node["outputs"]}
+        icon = "✅" if results[name][0] == "ok" else "❌"
+        print(f"{icon} {node['title']} {results[name][0]} {results[name][2]}")
+
+    try:
+        while pending or running:
+            waiting = len(pending)
+            for name in list(pending):
+                node = NODES[name]
+                upstream_failed = {d for d in dependencies[name] if failed(d)}
+                if upstream_failed:
+                    pending.remove(name)
+                    results[name] = ("skipped", None, f"upstream failed: {sorted(upstream_failed)}")
+                    print(f"⏭️ {node['title']} atlanıyor: upstream failed ({sorted(upstream_failed)})")
+                    continue
+                if not all(finished(d) for d in dependencies[name]):
+                    continue
+                pending.remove(name)
+
+                missing_inputs = [i for i in node["inputs"] if not resolve_path(i).exists()]
+                if missing_inputs:
+                    results[name] = ("skipped", None, f"missing inputs {missing_inputs}")
+                    print(f"⚠️ {node['title']} atlanıyor: missing inputs {missing_inputs}")
+                    continue
+
+                fingerprints[name] = node_fingerprint(node, hash_cache, config)
+                if not force and is_up_to_date(node, fingerprints[name], manifest):
+                    results[name] = ("cached", None, "")
+                    print(f"♻️ {node['title']} is up to date, skipping")
+                    continue
+
+                print(f"\n🚀 Running {node['title']}")
+                metrics[name] = {}
+                if profile:
+                    metrics[name]["input_rows"] = {i: count_rows(resolve_path(i)) for i in node["inputs"]}
+                profile_path = PROFILE_DIR / f"{name}.pstats" if profile_dump else None
+                args = (node["module"], node["entry"], debug_mode, profile_path, config, stage_jobs)
+                if executor is None:
+                    started = time.perf_counter()
+                    try:
+                        node_metrics = _execute_node(*args)
+                    except Exception as e:
+                        complete(name, error=e, wall_time=time.perf_counter() - started)
+                    else:
+                        complete(name, node_metrics)
+                else:
+                    running[executor.submit(_execute_node, *args)] = (name, time.perf_counter())
+
+            if not running and len(pending) == waiting:
+                raise RuntimeError(f"Pipeline nodes can never start: {pending}")
+            if running:
+                from concurrent.futures import wait, FIRST_COMPLETED
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, submitted = running.pop(future)
+                    try:
+                        complete(name, future.result())
+                    except Exception as e:
+                        complete(name, error=e, wall_time=time.perf_counter() - submitted)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    print_summary(results)
+    if profile:
+        report_nodes = {
+            name: {"status": status, **metrics.get(name, {}), **({"message": message} if message else {})}
+            for name, (status, _, message) in results.items()
+        }
+        write_report(RUN_REPORT_FILE, report_nodes, jobs=jobs, force=force)
+        print(f"📄 Run report saved to: {RUN_REPORT_FILE}")
+    return results
+
+def list_nodes() -> None:
+    """Print every registered node with its stage, dependencies and artifacts."""
+    dependencies = build_dag(NODES)
+    print(f"📚 {len(NODES)} registered pipeline nodes")
+    for name in topological_order(NODES):
+        node = NODES[name]
+        stage = f"{node['stage']:>2}" if node["stage"] is not None else " -"
+        print(f"   [{stage}] {name:<32} {node['title']}")
+        print(f"        entry:   {node['module']}:{node['entry']}")
+        if dependencies[name]:
+            print(f"        after:   {', '.join(sorted(dependencies[name]))}")
+        print(f"        inputs:  {', '.join(node['inputs']) or '-'}")
+        print(f"        outputs: {', '.join(node['outputs']) or '-'}")
+
+def plan_selected_stages(start: int, end: int, node_names=None, run_all=False, force=False, config=None) -> None:
+    """
+    Print what a run would do without importing or running any stage.
+
+    Nodes downstream of a node that would run are shown as "run (upstream)",
+    since their inputs are only known after it has finished.
+    """
+    selected = select_nodes(start, end, node_names, run_all)
+    dependencies = {name: deps & selected for name, deps in build_dag(NODES).items()}
+    manifest = load_manifest(PIPELINE_MANIFEST_FILE)
+    hash_cache = manifest["file_hashes"]
+    will_run, will_skip = set(), set()
+
+    print("🧭 Pipeline plan (dry run)")
+    for name in topological_order(NODES):
+        if name not in selected:
             continue
-        print(f"\n🚀 Running {name}")
-        func(debug=debug_mode)
-        print("✅ Done\n")
+        node = NODES[name]
+        missing_inputs = [i for i in node["inputs"] if not resolve_path(i).exists()]
+        if dependencies[name] & will_skip:
+            action = f"skip (upstream skipped: {', '.join(sorted(dependencies[name] & will_skip))})"
+            will_skip.add(name)
+        elif dependencies[name] & will_run:
+            action = f"run (upstream: {', '.join(sorted(dependencies[name] & will_run))})"
+            will_run.add(name)
+        elif missing_inputs:
+            action = f"skip (missing inputs {missing_inputs})"
+            will_skip.add(name)
+        elif force or not is_up_to_date(node, node_fingerprint(node, hash_cache, config), manifest):
+            action = "run"
+            will_run.add(name)
+        else:
+            action = "up to date"
+        print(f"   {name:<32} {action}")
+
+def compare_run_reports(previous_path, threshold: float) -> bool:
+    """
+    Compare RUN_REPORT_FILE with a previous report and print regressions.
+
+    Returns:
+        bool: True if any metric regressed above the threshold.
+    """
+    previous_path = previous_path or previous_report_path(RUN_REPORT_FILE)
+    try:
+        current, previous = load_report(RUN_REPORT_FILE), load_report(previous_path)
+    except FileNotFoundError as e:
+        raise SystemExit(f"❌ Cannot compare run reports: {e}")
+    rows = compare_reports(current, previous, threshold=threshold)
+    print_comparison(rows, threshold)
+    return any(row["regression"] for row in rows)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run selected pipeline stages.")
     parser.add_argument("--start", type=int, default=1, help="Başlangıç aşaması (varsayılan: 1)")
     parser.add_argument("--end", type=int, help="Bitiş aşaması (varsayılan: start ile aynı)")
+    parser.add_argument("--nodes", nargs="+", help="Run these pipeline nodes by name instead of a stage range")
+    parser.add_argument("--all", action="store_true", help="Run every registered node (stages and diagnostics)")
+    parser.add_argument("--force", action="store_true", help="Ignore the manifest and rerun selected nodes")
+    parser.add_argument("--list", action="store_true", help="List registered pipeline nodes and exit")
+    parser.add_argument("--dry-run", action="store_true", help="Show which selected nodes would run and exit")
+    parser.add_argument("--config", type=Path, help="YAML/TOML file overriding tunables from utils/constants.py")
+    parser.add_argument("--jobs", type=int, default=1, help="Run up to this many independent nodes in parallel")
+    parser.add_argument("--stage-jobs", type=int,
+                        help="Worker processes inside nodes that support it (e.g. stage 01 lines)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Record per-node wall/CPU time, peak RSS and row counts to data/processed/run_report.json")
+    parser.add_argument("--profile-dump", action="store_true", help="With --profile, also write cProfile .pstats dumps")
+    parser.add_argument("--compare", nargs="?", const="", metavar="REPORT",
+                        help="Compare run_report.json with REPORT (default: the previous report) and flag regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative regression threshold for --compare")
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
 
     args = parser.parse_args()
     end_stage = args.end if args.end is not None else args.start
     debug_mode = args.debug
+    config = None
+    if args.config is not None:
+        from utils.config import load_config
+        config = load_config(args.config)
+
+    if args.list:
+        list_nodes()
+        sys.exit(0)
+    if args.dry_run:
+        plan_selected_stages(args.start, end_stage, node_names=args.nodes, run_all=args.all, force=args.force,
+                             config=config)
+        sys.exit(0)
+
+    if args.compare is not None and not args.profile:
+        # Compare-only mode: no stages are run
+        sys.exit(1 if compare_run_reports(args.compare or None, args.threshold) else 0)
 
-    run_selected_stages(args.start, end_stage, debug_mode)
+    results = run_selected_stages(args.start, end_stage, debug_mode, node_names=args.nodes, run_all=args.all,
+                                  force=args.force, jobs=max(1, args.jobs),
+                                  profile=args.profile or args.profile_dump, profile_dump=args.profile_dump,
+                                  config=config, stage_jobs=args.stage_jobs)
 
     print("🏁 Pipeline tamamlandı.")
+    regressed = args.compare is not None and compare_run_reports(args.compare or None, args.threshold)
+    if regressed or any(status == "failed" for status, _, _ in results.values()):
+        sys.exit(1)
@@ -1,5 +1,11 @@
 import os
-import pandas as pd
+import sys
+import argparse
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from utils.csv_profile import DEFAULT_BLOCK_BYTES, format_profile, profile_directory
 
 # ─────────────────────────────────────────────────────
 # Config
@@ -7,58 +13,40 @@ import pandas as pd
 CSV_DIRECTORY = "D:/PhD/dec2025/data/raw"  # 🔧 Change this as needed
 OUTPUT_FILENAME = "raw_dataset_info.txt"
 
-# ─────────────────────────────────────────────────────
-# Diagnostics
-# ─────────────────────────────────────────────────────
-def diagnose_csv(path):
-    try:
-        df = pd.read_csv(path, sep=';', low_memory=False)
-    except Exception as e:
-        return f"❌ Error reading file: {path}\nReason: {e}\n{'─'*60}\n"
-
-    report = []
-    report.append("🧾 CSV Diagnostics Report")
-    report.append("─" * 60)
-    report.append(f"📂 File Path : {path}")
-    report.append(f"📄 File Name : {os.path.basename(path)}")
-    report.append(f"🔢 Number of Rows : {len(df)}")
-
-    report.append(f"\n📌 Column Titles:")
-    report.append(str(df.columns.tolist()))
-
-    report.append(f"\n🧬 Column Data Types:")
-    report.append(str(df.dtypes))
-
-    report.append(f"\n🔍 First 5 Rows:")
-    report.append(str(df.head()))
-
-    report.append("─" * 60 + "\n")
-    return "\n".join(report)
-
 # ─────────────────────────────────────────────────────
 # Main
 # ─────────────────────────────────────────────────────
-def main():
-    if not os.path.exists(CSV_DIRECTORY):
-        print(f"❌ Directory does not exist: {CSV_DIRECTORY}")
+def main(directory=CSV_DIRECTORY, jobs=1, sample=1.0, block_mb=DEFAULT_BLOCK_BYTES // (1024 * 1024)):
+    if not os.path.exists(directory):
+        print(f"❌ Directory does not exist: {directory}")
         return
 
-    output_path = os.path.join(CSV_DIRECTORY, OUTPUT_FILENAME)
-    all_reports = []
+    output_path = os.path.join(directory, OUTPUT_FILENAME)
+    print(f"📊 Profiling CSV files in {directory} ({jobs} workers, sample {sample:.0%})")
+    started = time.perf_counter()
+    # Dosyalar bloklara bölünür; her blok ayrı bir işlemde, sınırlı bellekle okunur
+    summaries = profile_directory(directory, jobs=jobs, sample=sample, block_bytes=block_mb * 1024 * 1024)
 
-    for file in os.listdir(CSV_DIRECTORY):
-        if file.endswith(".csv"):
-            full_path = os.path.join(CSV_DIRECTORY, file)
-            print(f"📊 Diagnosing: {file}")
-            report = diagnose_csv(full_path)
-            print(report)
-            all_reports.append(report)
+    all_reports = []
+    for summary in summaries:
+        report = format_profile(summary)
+        print(report)
+        all_reports.append(report)
 
     # Write all results into one txt file
     with open(output_path, "w", encoding="utf-8") as f:
         f.write("\n".join(all_reports))
 
+    print(f"⏱️ Profiled {len(summaries)} files in {time.perf_counter() - started:.1f} s")
     print(f"✅ All diagnostics saved to: {output_path}")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Profile every CSV file of a directory in parallel blocks.")
+    parser.add_argument("directory", nargs="?", default=CSV_DIRECTORY)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--sample", type=float, default=1.0,
+                        help="Share of blocks parsed for column statistics (row counts stay exact)")
+    parser.add_argument("--block-mb", type=int, default=DEFAULT_BLOCK_BYTES // (1024 * 1024),
+                        help="Block size in MB")
+    args = parser.parse_args()
+    main(args.directory, jobs=args.jobs, sample=args.sample, block_mb=args.block_mb)
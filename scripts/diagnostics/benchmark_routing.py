@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import argparse
+import json
+import logging
+import time
+from datetime import datetime
+import numpy as np
+from utils.constants import (
+    SUMO_NODES_FILE, SUMO_EDGES_FILE, SUMO_CONNECTIONS_FILE, CH_CACHE_DIR, ROUTING_BENCHMARK_FILE
+)
+from utils.graph_ops import dijkstra
+from utils.routing import RoutingGraph
+
+# Pipeline DAG declaration (file and constant names refer to utils.constants)
+PIPELINE_NODE = {
+    "name": "routing_benchmark",
+    "title": "Routing Benchmark (Contraction Hierarchy vs Dijkstra)",
+    "stage": None,
+    "entry": "main",
+    "inputs": ["SUMO_NODES_FILE", "SUMO_EDGES_FILE", "SUMO_CONNECTIONS_FILE"],
+    "outputs": ["ROUTING_BENCHMARK_FILE"],
+    "constants": [],
+}
+
+def timed_queries(solve, pairs) -> tuple:
+    """Run solve(source, target) for every pair; returns distances and per-query times in microseconds."""
+    distances, times = [], []
+    for source, target in pairs:
+        started = time.perf_counter()
+        distances.append(solve(source, target))
+        times.append((time.perf_counter() - started) * 1e6)
+    return np.array(distances), np.array(times)
+
+def summary(times: np.ndarray) -> dict:
+    return {"mean_us": round(float(times.mean()), 1), "median_us": round(float(np.median(times)), 1),
+            "p95_us": round(float(np.percentile(times, 95)), 1)}
+
+def main(debug=False, queries=1000, seed=0):
+    logging.basicConfig(level=logging.DEBUG if debug else logging.INFO, format='%(levelname)s: %(message)s')
+    graph = RoutingGraph.from_network(SUMO_EDGES_FILE, SUMO_CONNECTIONS_FILE, SUMO_NODES_FILE)
+    print(f"🔎 Routing graph: {len(graph.edge_ids)} edges, {len(graph.csr[1])} connections")
+
+    # 🔧 Ön işleme: ağ hash'i başına bir kez (sonraki çalıştırmalar diskten yükler)
+    started = time.perf_counter()
+    hierarchy = graph.use_contraction(CH_CACHE_DIR)
+    prepare_s = time.perf_counter() - started
+
+    # 🎯 Rastgele peron → peron sorguları (yoksa rastgele kenarlar)
+    platforms = np.flatnonzero([edge_id.endswith(("_east_to_west", "_west_to_east")) for edge_id in graph.edge_ids])
+    candidates = platforms if len(platforms) >= 2 else np.arange(len(graph.edge_ids))
+    rng = np.random.default_rng(seed)
+    pairs = rng.choice(candidates, size=(queries, 2)).tolist()
+
+    indptr, indices, data = (array.tolist() for array in graph.csr)
+    plain, plain_times = timed_queries(lambda s, t: dijkstra(indptr, indices, data, s, target=t)[0][t], pairs)
+    fast, fast_times = timed_queries(hierarchy.distance, pairs)
+    mismatches = int(np.sum(~np.isclose(plain, fast) & ~(np.isinf(plain) & np.isinf(fast))))
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec='seconds'),
+        "edges": len(graph.edge_ids), "connections": len(graph.csr[1]), "queries": queries,
+        "reachable": int(np.isfinite(plain).sum()), "shortcuts": hierarchy.shortcut_count,
+        "preprocessing_s": round(prepare_s, 2),
+        "dijkstra": summary(plain_times), "contraction_hierarchy": summary(fast_times),
+        "speedup": round(float(plain_times.mean() / fast_times.mean()), 1), "mismatches": mismatches,
+    }
+    ROUTING_BENCHMARK_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(ROUTING_BENCHMARK_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    if mismatches:
+        print(f"⚠️ {mismatches} queries differ between Dijkstra and the contraction hierarchy")
+    print(f"⏱️ Dijkstra {report['dijkstra']['mean_us']} µs, contraction hierarchy "
+          f"{report['contraction_hierarchy']['mean_us']} µs per query ({report['speedup']}x), "
+          f"preprocessing/load {report['preprocessing_s']} s")
+    print(f"✅ Routing benchmark saved to: {ROUTING_BENCHMARK_FILE}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare contraction hierarchy queries with plain Dijkstra.")
+    parser.add_argument("--queries", type=int, default=1000, help="Number of random platform-to-platform queries")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+    main(debug=args.debug, queries=args.queries, seed=args.seed)
@@ -0,0 +1,63 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import json
+import pandas as pd
+from utils.config import PipelineConfig, default_config
+from utils.constants import FILTERED_SUB_NETWORK_POLYGON_FILE, STATION_HELPER_FILE, NETWORK_MAP_FILE
+from utils.crs import artifact_coordinates, to_wgs84
+from utils.web_map import segment_layer, point_layer, station_center_points, save_layered_map
+
+# Pipeline DAG declaration (file and constant names refer to utils.constants)
+PIPELINE_NODE = {
+    "name": "network_map",
+    "title": "Network Web Map (GeoJSON layers)",
+    "stage": None,
+    "entry": "main",
+    "inputs": ["FILTERED_SUB_NETWORK_POLYGON_FILE", "STATION_HELPER_FILE"],
+    "outputs": ["NETWORK_MAP_FILE"],
+    "constants": ["MAP_SIMPLIFY_TOLERANCE", "MAP_COORDINATE_PRECISION"],
+}
+
+def load_entry_nodes(station_df: pd.DataFrame):
+    """Collect every entry node of STATION_HELPER_FILE as (EPSG:2056 coordinates, tooltip properties)."""
+    coords, properties = [], []
+    for _, row in station_df.iterrows():
+        try:
+            nodes = json.loads(str(row['entry_nodes']).replace("'", '"'))
+        except Exception as e:
+            print(f"⚠️ Entry nodes of station {row.get('station', 'unknown')} could not be parsed: {e}")
+            continue
+        for node in nodes:
+            coords.append(node['Coordinates'][:2])
+            properties.append({"station": row['station'], "connected_station": node['Connected Station'],
+                               "direction": node['Direction'], "line": node['Line']})
+    return coords, properties
+
+def main(debug=False, config: PipelineConfig = None):
+    config = config or default_config()
+    segment_df = pd.read_csv(FILTERED_SUB_NETWORK_POLYGON_FILE, delimiter=';')
+    station_df = pd.read_csv(STATION_HELPER_FILE, delimiter=';')
+
+    # 📍 Segment noktaları (EPSG:2056 + WGS84), dosya hash'ine göre önbellekli
+    xy, latlon, offsets = artifact_coordinates(FILTERED_SUB_NETWORK_POLYGON_FILE, 'Geo shape')
+
+    # 🛤️ Katmanlar: segmentler (Linie rengine göre), istasyon merkezleri, entry node'lar
+    segments = segment_layer(segment_df, xy, latlon, offsets, config.map_simplify_tolerance,
+                             config.map_coordinate_precision)
+    center_latlon, center_props = station_center_points(segment_df, latlon, offsets)
+    stations = point_layer(center_latlon, center_props, config.map_coordinate_precision)
+    entry_coords, entry_props = load_entry_nodes(station_df)
+    entry_latlon = to_wgs84(entry_coords) if entry_coords else center_latlon[:0]
+    entry_nodes = point_layer(entry_latlon, entry_props, config.map_coordinate_precision)
+
+    kept = sum(len(f["geometry"]["coordinates"]) for f in segments["features"])
+    print(f"🧮 Simplified {len(xy)} → {kept} vertices (tolerance {config.map_simplify_tolerance} m)")
+
+    # 💾 Kaydet
+    output_path = save_layered_map(NETWORK_MAP_FILE, segments, stations, entry_nodes)
+    print(f"✅ Map saved to: {output_path} ({output_path.stat().st_size / 1e6:.2f} MB)")
+
+if __name__ == "__main__":
+    main()
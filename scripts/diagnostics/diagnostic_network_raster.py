@@ -0,0 +1,80 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from utils.config import PipelineConfig, default_config
+from utils.constants import FILTERED_SUB_NETWORK_POLYGON_FILE, STATION_HELPER_FILE, NETWORK_RASTER_FILE
+from utils.crs import artifact_coordinates
+from utils.raster import (
+    BACKGROUND, hex_to_rgb, ramp_colors, raster_shape, to_pixels, draw_polylines, draw_points, write_png
+)
+from utils.web_map import line_color_map, station_center_points
+
+# Pipeline DAG declaration (file and constant names refer to utils.constants)
+PIPELINE_NODE = {
+    "name": "network_raster",
+    "title": "Network Raster Image (PNG)",
+    "stage": None,
+    "entry": "main",
+    "inputs": ["FILTERED_SUB_NETWORK_POLYGON_FILE", "STATION_HELPER_FILE"],
+    "outputs": ["NETWORK_RASTER_FILE"],
+    "constants": ["RASTER_WIDTH", "RASTER_COLOR_BY"],
+}
+
+COLOR_MODES = ("linie", "length", "station_type")
+STATION_TYPE_COLORS = {"two-way": '#1f4e9c', "single-direction": '#f58231', "isolated": '#e6194b'}
+SEGMENT_GREY = '#9a9a9a'
+
+def segment_colors(segment_df: pd.DataFrame, color_by: str) -> np.ndarray:
+    """One RGB colour per segment."""
+    if color_by == "linie":
+        colors = line_color_map(segment_df['Linie'])
+        return hex_to_rgb([colors[line_id] for line_id in segment_df['Linie']])
+    if color_by == "length":
+        return ramp_colors(pd.to_numeric(segment_df['polygon_length'], errors='coerce').to_numpy())
+    return hex_to_rgb([SEGMENT_GREY] * len(segment_df))
+
+def main(debug=False, width=None, color_by=None, config: PipelineConfig = None):
+    config = config or default_config()
+    width = width or config.raster_width
+    color_by = color_by or config.raster_color_by
+    if color_by not in COLOR_MODES:
+        raise ValueError(f"Unknown raster colouring {color_by}, expected one of {COLOR_MODES}")
+    started = time.perf_counter()
+    segment_df = pd.read_csv(FILTERED_SUB_NETWORK_POLYGON_FILE, delimiter=';')
+
+    # 📍 Segment noktaları (EPSG:2056), dosya hash'ine göre önbellekli
+    xy, _, offsets = artifact_coordinates(FILTERED_SUB_NETWORK_POLYGON_FILE, 'Geo shape')
+    bounds, height = raster_shape(xy, width)
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[:] = BACKGROUND
+
+    # 🛤️ Tüm segmentler tek seferde çizilir
+    draw_polylines(image, to_pixels(xy, bounds, width, height), offsets, segment_colors(segment_df, color_by),
+                   thickness=2 if width >= 2000 else 1)
+
+    # 🚉 İstasyon merkezleri (istasyon tipine göre renkli)
+    centers, properties = station_center_points(segment_df, xy, offsets)
+    if color_by == "station_type" and os.path.exists(STATION_HELPER_FILE):
+        types = pd.read_csv(STATION_HELPER_FILE, delimiter=';').set_index('station')['type']
+        hex_colors = [STATION_TYPE_COLORS.get(types.get(p['station']), '#000000') for p in properties]
+    else:
+        hex_colors = ['#222222'] * len(properties)
+    if len(centers):
+        draw_points(image, to_pixels(centers, bounds, width, height), hex_to_rgb(hex_colors),
+                    radius=max(1, width // 1500))
+
+    output_path = write_png(NETWORK_RASTER_FILE, image)
+    print(f"✅ Raster ({width}x{height}, {len(xy)} vertices, coloured by {color_by}) saved to: {output_path} "
+          f"in {time.perf_counter() - started:.1f} s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the whole network into a PNG.")
+    parser.add_argument("--width", type=int, help="Image width in pixels (default: RASTER_WIDTH)")
+    parser.add_argument("--color-by", choices=COLOR_MODES, help="Segment colouring (default: RASTER_COLOR_BY)")
+    args = parser.parse_args()
+    main(width=args.width, color_by=args.color_by)
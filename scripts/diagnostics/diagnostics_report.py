@@ -0,0 +1,42 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import argparse
+import logging
+from utils.config import PipelineConfig
+from utils.constants import DIAGNOSTICS_REPORT_HTML_FILE, DIAGNOSTICS_REPORT_JSON_FILE
+from utils.diagnostics import CHECKS, DiagnosticsContext, run_checks, write_html_report, write_json_report
+import utils.diagnostic_checks  # noqa: F401  (registers the checks)
+
+# Pipeline DAG declaration (file and constant names refer to utils.constants)
+PIPELINE_NODE = {
+    "name": "diagnostics_report",
+    "title": "Consolidated Diagnostics Report",
+    "stage": None,
+    "entry": "main",
+    "inputs": ["FILTERED_SUB_NETWORK_POLYGON_FILE", "POLYGON_FILE", "PLATFORM_FILE"],
+    "outputs": ["DIAGNOSTICS_REPORT_HTML_FILE", "DIAGNOSTICS_REPORT_JSON_FILE"],
+    "constants": ["CLOSENESS_THRESHOLD", "LINE_ID_LIST", "DUPLICATE_GRID_SIZE", "DUPLICATE_TOLERANCE",
+                  "OVERLAP_MIN_SHARE"],
+}
+
+def main(debug=False, checks=None, config: PipelineConfig = None):
+    logging.basicConfig(level=logging.DEBUG if debug else logging.INFO, format='%(levelname)s: %(message)s')
+
+    # Her dosya bir kez okunur, tüm kontroller aynı tabloları paylaşır
+    results = run_checks(DiagnosticsContext(config=config), checks)
+
+    write_json_report(DIAGNOSTICS_REPORT_JSON_FILE, results)
+    write_html_report(DIAGNOSTICS_REPORT_HTML_FILE, results)
+    for result in results:
+        for warning in result["warnings"]:
+            print(f"⚠️ {result['name']}: {warning}")
+    print(f"✅ Diagnostics report saved to: {DIAGNOSTICS_REPORT_HTML_FILE} and {DIAGNOSTICS_REPORT_JSON_FILE}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run registered diagnostics checks into one report.")
+    parser.add_argument("--checks", nargs="+", choices=sorted(CHECKS), help="Run only these checks")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+    main(debug=args.debug, checks=args.checks)
@@ -3,14 +3,45 @@ import numpy as np
 import json
 import ast
 import logging
+import argparse
 from pathlib import Path
+from typing import Optional, Sequence
 import sys
 import os
 
 # Add project root to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from utils.constants import STATION_HELPER_FILE, PROCESSED_DIR
+from utils.constants import (
+    STATION_HELPER_FILE, PROCESSED_DIR, FILTERED_SUB_NETWORK_POLYGON_FILE,
+    STATION_DISTANCE_MATRIX_FILE, STATION_MATRIX_INDEX_FILE, STATION_ADJACENCY_FILE,
+    NETWORK_DISTANCE_MATRIX_FILE, NETWORK_PREDECESSOR_FILE, NETWORK_MATRIX_INDEX_FILE
+)
+from utils.crs import pack_coordinates, parse_coordinates
+from utils.graph_ops import build_csr, multi_source_dijkstra, reconstruct_path
+from utils.network_ops import station_points
+
+# Pipeline DAG declaration (file and constant names refer to utils.constants), one node per mode
+PIPELINE_NODE = [
+    {
+        "name": "station_distance_matrix",
+        "title": "Station Distance Matrix (euclidean)",
+        "stage": None,
+        "entry": "run_euclidean",
+        "inputs": ["STATION_HELPER_FILE", "FILTERED_SUB_NETWORK_POLYGON_FILE"],
+        "outputs": ["STATION_DISTANCE_MATRIX_FILE", "STATION_MATRIX_INDEX_FILE", "STATION_ADJACENCY_FILE"],
+        "constants": [],
+    },
+    {
+        "name": "network_distance_matrix",
+        "title": "Network Distance Matrix",
+        "stage": None,
+        "entry": "run",
+        "inputs": ["FILTERED_SUB_NETWORK_POLYGON_FILE"],
+        "outputs": ["NETWORK_DISTANCE_MATRIX_FILE", "NETWORK_PREDECESSOR_FILE", "NETWORK_MATRIX_INDEX_FILE"],
+        "constants": [],
+    },
+]
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -50,73 +81,345 @@ def safe_eval(s: str) -> dict:
         logger.warning(f"⚠️ Failed to parse connected_stations: {s} → {e}")
         return {}
 
-def generate_distance_matrices(threshold: float = 500.0) -> None:
+def open_matrix(path: Path, shape: tuple, dtype=np.float64, mode: str = 'w+') -> np.memmap:
+    """
+    Open a station matrix as a memory-mapped .npy file.
+
+    All station matrices (Euclidean, network distance, predecessors) share this
+    format so they can be sliced row by row without loading them into memory.
+
+    Args:
+        path (Path): Target .npy file.
+        shape (tuple): Matrix shape (rows, columns). Ignored when reading.
+        dtype (optional): Matrix dtype. Defaults to float64.
+        mode (str, optional): 'w+' to create, 'r' to read. Defaults to 'w+'.
+
+    Returns:
+        np.memmap: Memory-mapped matrix.
+    """
+    if mode == 'r':
+        return np.load(path, mmap_mode='r')
+    return np.lib.format.open_memmap(path, mode=mode, dtype=dtype, shape=shape)
+
+def write_matrix_index(path: Path, stations: Sequence[str], source_rows: Optional[Sequence[int]] = None) -> None:
+    """
+    Write the station lookup table for a memory-mapped matrix.
+
+    Args:
+        path (Path): Target CSV file.
+        stations (Sequence[str]): Station abbreviation of every matrix column.
+        source_rows (Sequence[int], optional): Matrix row of every station, -1 if the station is not a source.
+            Defaults to None (square matrix, row == column).
+    """
+    index_df = pd.DataFrame({'station_id': np.arange(len(stations)), 'station': list(stations)})
+    index_df['source_row'] = np.arange(len(stations)) if source_rows is None else list(source_rows)
+    index_df.to_csv(path, index=False, sep=';', encoding='utf-8-sig')
+
+def station_centers(df: pd.DataFrame) -> np.ndarray:
+    """
+    Center [X, Y] per station row: the 'center_coordinates' column when present, otherwise
+    the mean of the cleaned segment end vertices at the station (see station_points).
+
+    Args:
+        df (pd.DataFrame): Station helper data (row order defines station ids).
+
+    Returns:
+        np.ndarray: (n, 2) coordinates; NaN for stations without segments.
+    """
+    if 'center_coordinates' in df.columns:
+        centers = df['center_coordinates'].apply(
+            lambda x: json.loads(x.replace("'", '"')) if pd.notna(x) else None
+        )
+        return np.array(centers.tolist(), dtype=np.float64)
+    segments = pd.read_csv(FILTERED_SUB_NETWORK_POLYGON_FILE, delimiter=';')
+    xy, offsets = pack_coordinates([parse_coordinates(v) for v in segments['_coordinates']])
+    points = station_points(segments, xy, offsets).reindex(df['station'])
+    return points[['x', 'y']].to_numpy(dtype=np.float64)
+
+def build_segment_graph(polygon_df: pd.DataFrame) -> tuple:
+    """
+    Build an undirected station graph from cleaned segments, weighted by polygon_length.
+
+    Args:
+        polygon_df (pd.DataFrame): Cleaned segments with START_OP, END_OP and polygon_length.
+
+    Returns:
+        tuple: (stations, (indptr, indices, data)) where stations[i] is the name of node i.
+    """
+    segments = polygon_df.dropna(subset=['START_OP', 'END_OP', 'polygon_length'])
+    segments = segments[segments['START_OP'] != segments['END_OP']]
+    stations = sorted(set(segments['START_OP']).union(segments['END_OP']))
+    station_ids = {station: i for i, station in enumerate(stations)}
+
+    src = segments['START_OP'].map(station_ids).to_numpy()
+    dst = segments['END_OP'].map(station_ids).to_numpy()
+    weights = pd.to_numeric(segments['polygon_length'], errors='coerce').fillna(np.inf).to_numpy()
+    return stations, build_csr(src, dst, weights, len(stations))
+
+def generate_network_distance_matrix(sources: Optional[Sequence[str]] = None, jobs: Optional[int] = None,
+                                     block_size: int = 64) -> None:
+    """
+    Generate along-track station-to-station distances over the cleaned segment graph.
+
+    Runs one Dijkstra per source station in a process pool and writes the results
+    into memory-mapped distance and predecessor matrices (rows: sources, columns: all stations).
+
+    Args:
+        sources (Sequence[str], optional): Source stations. Defaults to None (every station).
+        jobs (int, optional): Worker processes. Defaults to None (os.cpu_count()).
+        block_size (int, optional): Sources per worker task. Defaults to 64.
+    """
+    try:
+        logger.info("🚀 Loading cleaned segment data...")
+        polygon_df = pd.read_csv(FILTERED_SUB_NETWORK_POLYGON_FILE, delimiter=';')
+        stations, (indptr, indices, data) = build_segment_graph(polygon_df)
+        station_ids = {station: i for i, station in enumerate(stations)}
+        logger.info(f"🕸️ Segment graph: {len(stations)} stations, {len(indices) // 2} segments")
+
+        if sources is None:
+            source_ids = list(range(len(stations)))
+        else:
+            unknown = [s for s in sources if s not in station_ids]
+            if unknown:
+                logger.warning(f"⚠️ Unknown source stations skipped: {unknown}")
+            source_ids = [station_ids[s] for s in sources if s in station_ids]
+
+        shape = (len(source_ids), len(stations))
+        dist_matrix = open_matrix(NETWORK_DISTANCE_MATRIX_FILE, shape, np.float64)
+        pred_matrix = open_matrix(NETWORK_PREDECESSOR_FILE, shape, np.int32)
+
+        logger.info(f"📏 Running {len(source_ids)} shortest path searches...")
+        for start, dist_block, pred_block in multi_source_dijkstra(indptr, indices, data, source_ids,
+                                                                   jobs=jobs, block_size=block_size):
+            dist_matrix[start:start + len(dist_block)] = dist_block
+            pred_matrix[start:start + len(pred_block)] = pred_block
+        dist_matrix.flush()
+        pred_matrix.flush()
+
+        source_rows = np.full(len(stations), -1, dtype=np.int64)
+        source_rows[source_ids] = np.arange(len(source_ids))
+        write_matrix_index(NETWORK_MATRIX_INDEX_FILE, stations, source_rows)
+
+        unreachable = int(np.isinf(dist_matrix).sum())
+        if unreachable:
+            logger.warning(f"⚠️ {unreachable} station pairs are not connected by the segment graph")
+        logger.info(f"✅ Saved network distance matrix to: {NETWORK_DISTANCE_MATRIX_FILE}")
+        logger.info(f"✅ Saved predecessor matrix to: {NETWORK_PREDECESSOR_FILE}")
+
+    except Exception as e:
+        logger.error(f"❌ Failed to generate network distance matrix: {e}")
+        raise
+
+def network_path(station_1: str, station_2: str) -> list:
+    """
+    Reconstruct the along-track station sequence between two stations from saved matrices.
+
+    Args:
+        station_1 (str): Source station (must have been a source row).
+        station_2 (str): Target station.
+
+    Returns:
+        list: Station abbreviations from station_1 to station_2, or empty list if unreachable.
+
+    Raises:
+        KeyError: If a station is not in the network distance matrix.
+    """
+    index_df = pd.read_csv(NETWORK_MATRIX_INDEX_FILE, delimiter=';', encoding='utf-8-sig')
+    station_ids = dict(zip(index_df['station'], index_df['station_id']))
+    unknown = [station for station in (station_1, station_2) if station not in station_ids]
+    if unknown:
+        raise KeyError(f"Stations not in the network distance matrix: {unknown}")
+    source_row = int(index_df.loc[index_df['station'] == station_1, 'source_row'].iloc[0])
+    if source_row < 0:
+        raise ValueError(f"Station {station_1} was not a source of the network distance matrix")
+
+    pred_matrix = open_matrix(NETWORK_PREDECESSOR_FILE, None, mode='r')
+    path = reconstruct_path(pred_matrix[source_row], station_ids[station_1], station_ids[station_2])
+    return index_df['station'].to_numpy()[path].tolist()
+
+def build_adjacency_matrix(df: pd.DataFrame, path: Path) -> np.memmap:
+    """
+    Build a boolean station adjacency matrix from the connected_stations column.
+
+    Each connected_stations string is parsed once; adjacency[i, j] is True when
+    station j is listed in the West or East connections of station i.
+
+    Args:
+        df (pd.DataFrame): Station helper data (row order defines station ids).
+        path (Path): Target .npy file for the memory-mapped matrix.
+
+    Returns:
+        np.memmap: (n, n) boolean adjacency matrix.
+    """
+    station_ids = {station: i for i, station in enumerate(df['station'])}
+    adjacency = open_matrix(path, (len(station_ids), len(station_ids)), np.bool_)
+    for i, connections in enumerate(df['connected_stations']):
+        connections = safe_eval(connections) if isinstance(connections, str) else {}
+        neighbours = set(connections.get('West', set())) | set(connections.get('East', set()))
+        ids = [station_ids[s] for s in neighbours if s in station_ids]
+        if ids:
+            adjacency[i, ids] = True
+    adjacency.flush()
+    return adjacency
+
+def write_wide_matrix(distance_matrix: np.ndarray, stations: Sequence[str], path: Path,
+                      chunk_rows: int = 1024) -> None:
+    """
+    Write a square distance matrix as wide CSV, one block of rows at a time.
+
+    Args:
+        distance_matrix (np.ndarray): (n, n) distance matrix (memory-mapped).
+        stations (Sequence[str]): Station names used as index and header.
+        path (Path): Target CSV file.
+        chunk_rows (int, optional): Rows per written block. Defaults to 1024.
+    """
+    for start in range(0, len(stations), chunk_rows):
+        block = pd.DataFrame(np.asarray(distance_matrix[start:start + chunk_rows]),
+                             index=stations[start:start + chunk_rows], columns=stations)
+        block.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0)
+
+def iter_long_pairs(distance_matrix: np.ndarray, adjacency: np.ndarray, cutoff: Optional[float] = None,
+                    chunk_rows: int = 256):
+    """
+    Yield upper-triangle station pairs of a distance matrix in chunks.
+
+    Args:
+        distance_matrix (np.ndarray): (n, n) distance matrix (memory-mapped).
+        adjacency (np.ndarray): (n, n) boolean adjacency matrix.
+        cutoff (float, optional): Only yield pairs closer than this distance. Defaults to None (all pairs).
+        chunk_rows (int, optional): Matrix rows per chunk. Defaults to 256.
+
+    Yields:
+        pd.DataFrame: Chunk with station_1_id, station_2_id, distance_m and connected columns.
+    """
+    n_stations = distance_matrix.shape[0]
+    columns = np.arange(n_stations)
+    for start in range(0, n_stations, chunk_rows):
+        rows = np.arange(start, min(start + chunk_rows, n_stations))
+        dist_block = np.asarray(distance_matrix[rows])
+        mask = columns[None, :] > rows[:, None]  # skip duplicates and self-pairs
+        if cutoff is not None:
+            mask &= dist_block < cutoff
+        row_idx, col_idx = np.nonzero(mask)
+        if len(row_idx) == 0:
+            continue
+        yield pd.DataFrame({
+            'station_1_id': rows[row_idx].astype(np.int32),
+            'station_2_id': col_idx.astype(np.int32),
+            'distance_m': dist_block[row_idx, col_idx],
+            'connected': np.asarray(adjacency[rows])[row_idx, col_idx]
+        })
+
+def write_long_matrix(distance_matrix: np.ndarray, adjacency: np.ndarray, stations: Sequence[str],
+                      path: Path, close_unconnected_path: Path, threshold: float = 500.0,
+                      cutoff: Optional[float] = None, chunk_rows: int = 256) -> tuple:
+    """
+    Stream the long-format distance table and the close-but-unconnected pairs to CSV.
+
+    Station ids refer to the station_id column of the matrix lookup table.
+
+    Args:
+        distance_matrix (np.ndarray): (n, n) distance matrix (memory-mapped).
+        adjacency (np.ndarray): (n, n) boolean adjacency matrix.
+        stations (Sequence[str]): Station names by id (used for the flagged pairs report).
+        path (Path): Long matrix CSV file.
+        close_unconnected_path (Path): CSV file for unconnected pairs under threshold.
+        threshold (float, optional): Flagging distance in meters. Defaults to 500.0.
+        cutoff (float, optional): Only write pairs closer than this distance. Defaults to None.
+        chunk_rows (int, optional): Matrix rows per chunk. Defaults to 256.
+
+    Returns:
+        tuple: (number of written pairs, number of flagged pairs)
+    """
+    stations = np.asarray(stations, dtype=object)
+    pair_count = flagged_count = 0
+    pd.DataFrame(columns=['station_1_id', 'station_2_id', 'distance_m', 'connected']).to_csv(path, index=False)
+    pd.DataFrame(columns=['station_1', 'station_2', 'distance_m']).to_csv(close_unconnected_path, index=False)
+
+    for chunk in iter_long_pairs(distance_matrix, adjacency, cutoff=cutoff, chunk_rows=chunk_rows):
+        chunk.to_csv(path, mode='a', header=False, index=False)
+        pair_count += len(chunk)
+
+        flagged = chunk[(chunk['distance_m'] < threshold) & (~chunk['connected'])]
+        if not flagged.empty:
+            pd.DataFrame({
+                'station_1': stations[flagged['station_1_id']],
+                'station_2': stations[flagged['station_2_id']],
+                'distance_m': flagged['distance_m']
+            }).to_csv(close_unconnected_path, mode='a', header=False, index=False)
+            flagged_count += len(flagged)
+
+    return pair_count, flagged_count
+
+def generate_distance_matrices(threshold: float = 500.0, cutoff: Optional[float] = None,
+                               chunk_rows: int = 1024) -> None:
     """
     Generate station-to-station distance matrices and flag close-but-unconnected pairs.
 
     Args:
         threshold (float, optional): Distance threshold in meters to flag unconnected close stations. Defaults to 500.0.
+        cutoff (float, optional): Only write long-format pairs closer than this distance. Defaults to None (all pairs).
+        chunk_rows (int, optional): Matrix rows processed per chunk. Defaults to 1024.
     """
     try:
         logger.info("🚀 Loading station helper data...")
-        df = pd.read_csv(STATION_HELPER_FILE)
-
-        # Parse center coordinates
-        df['center_coordinates'] = df['center_coordinates'].apply(
-            lambda x: json.loads(x.replace("'", '"')) if pd.notna(x) else None
-        )
+        df = pd.read_csv(STATION_HELPER_FILE, delimiter=';', encoding='utf-8-sig')
 
         # Prepare wide matrix
         stations = df['station'].tolist()
-        wide_matrix = pd.DataFrame(index=stations, columns=stations, dtype=float)
-        
+        centers = station_centers(df)
+
         logger.info("📏 Calculating pairwise distances...")
-        for i, row_i in df.iterrows():
-            for j, row_j in df.iterrows():
-                if row_i['station'] == row_j['station']:
-                    dist = 0.0
-                else:
-                    dist = euclidean_distance(row_i['center_coordinates'], row_j['center_coordinates'])
-                wide_matrix.at[row_i['station'], row_j['station']] = dist
+        distance_matrix = open_matrix(STATION_DISTANCE_MATRIX_FILE, (len(stations), len(stations)))
+        for start in range(0, len(stations), chunk_rows):
+            block = centers[start:start + chunk_rows]
+            distance_matrix[start:start + len(block)] = np.hypot(
+                block[:, None, 0] - centers[None, :, 0],
+                block[:, None, 1] - centers[None, :, 1]
+            )
+        distance_matrix.flush()
+        write_matrix_index(STATION_MATRIX_INDEX_FILE, stations)
+        logger.info(f"✅ Saved distance matrix to: {STATION_DISTANCE_MATRIX_FILE}")
 
         wide_matrix_path = PROCESSED_DIR / 'station_distance_matrix_wide.csv'
-        wide_matrix.to_csv(wide_matrix_path)
+        write_wide_matrix(distance_matrix, stations, wide_matrix_path, chunk_rows=chunk_rows)
         logger.info(f"✅ Saved wide matrix to: {wide_matrix_path}")
 
         # Prepare long matrix
         logger.info("📊 Preparing long matrix with connection info...")
-        records = []
-        for i, row_i in df.iterrows():
-            connections_i = safe_eval(row_i['connected_stations'])
-            for j, row_j in df.iterrows():
-                if i >= j:
-                    continue  # skip duplicates and self-pairs
-                dist = wide_matrix.at[row_i['station'], row_j['station']]
-                connected = (
-                    row_j['station'] in connections_i.get('West', set())
-                    or row_j['station'] in connections_i.get('East', set())
-                )
-                records.append({
-                    'station_1': row_i['station'],
-                    'station_2': row_j['station'],
-                    'distance_m': dist,
-                    'connected': connected
-                })
-        long_df = pd.DataFrame(records)
+        adjacency = build_adjacency_matrix(df, STATION_ADJACENCY_FILE)
         long_matrix_path = PROCESSED_DIR / 'station_distance_matrix_long.csv'
-        long_df.to_csv(long_matrix_path, index=False)
-        logger.info(f"✅ Saved long matrix to: {long_matrix_path}")
-
-        # Flag close but unconnected
-        logger.info(f"⚠️ Flagging pairs under {threshold} m without connection...")
-        close_unconnected = long_df[(long_df['distance_m'] < threshold) & (~long_df['connected'])]
         close_unconnected_path = PROCESSED_DIR / 'close_unconnected_stations.csv'
-        close_unconnected.to_csv(close_unconnected_path, index=False)
-        logger.info(f"⚠️ Saved close-but-unconnected stations to: {close_unconnected_path}")
+        logger.info(f"⚠️ Flagging pairs under {threshold} m without connection...")
+        pair_count, flagged_count = write_long_matrix(
+            distance_matrix, adjacency, stations, long_matrix_path, close_unconnected_path,
+            threshold=threshold, cutoff=cutoff, chunk_rows=chunk_rows
+        )
+        logger.info(f"✅ Saved long matrix ({pair_count} pairs) to: {long_matrix_path}")
+        logger.info(f"⚠️ Saved {flagged_count} close-but-unconnected stations to: {close_unconnected_path}")
 
     except Exception as e:
         logger.error(f"❌ Failed to generate distance matrices: {e}")
         raise
 
-if __name__ == "__main__":
+def run(debug=False):
+    logger.setLevel(logging.DEBUG if debug else logging.INFO)
+    generate_network_distance_matrix()
+
+def run_euclidean(debug=False):
+    logger.setLevel(logging.DEBUG if debug else logging.INFO)
     generate_distance_matrices()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate station distance matrices.")
+    parser.add_argument("--mode", choices=["euclidean", "network"], default="euclidean",
+                        help="euclidean: center-to-center, network: along-track over cleaned segments")
+    parser.add_argument("--sources", nargs="+", help="Network mode: only compute rows for these stations")
+    parser.add_argument("--jobs", type=int, help="Network mode: number of worker processes")
+    parser.add_argument("--cutoff", type=float, help="Euclidean mode: only write long-format pairs closer than this (m)")
+    args = parser.parse_args()
+
+    if args.mode == "network":
+        generate_network_distance_matrix(sources=args.sources, jobs=args.jobs)
+    else:
+        generate_distance_matrices(cutoff=args.cutoff)
@@ -0,0 +1,135 @@
+import ast
+import json
+import logging
+import numpy as np
+import pandas as pd
+import argparse
+import sys
+import os
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.config import PipelineConfig, default_config
+from utils.constants import (
+    FILTERED_SUB_NETWORK_POLYGON_FILE, STATION_HELPER_FILE, SIMPLIFIED_SUB_NETWORK_POLYGON_FILE
+)
+from utils.crs import pack_coordinates, parse_coordinates
+from utils.geometry_ops import simplify_buffer_mask, compact_offsets, polyline_lengths, nearest_vertex
+
+# Pipeline DAG declaration (file and constant names refer to utils.constants)
+PIPELINE_NODE = {
+    "name": "simplify_segments",
+    "title": "Simplify Segment Geometry",
+    "stage": None,
+    "entry": "run",
+    "inputs": ["FILTERED_SUB_NETWORK_POLYGON_FILE", "STATION_HELPER_FILE"],
+    "outputs": ["SIMPLIFIED_SUB_NETWORK_POLYGON_FILE"],
+    "constants": ["SIMPLIFY_MAX_DEVIATION"],
+}
+
+# Set up logger
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+if not logger.hasHandlers():
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+
+def entry_node_keep_mask(segment_df: pd.DataFrame, station_df: pd.DataFrame,
+                         xy: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    Flag the vertex closest to every entry node so simplification keeps it.
+
+    An entry node of station S towards station C lies on the segment S-C or C-S.
+
+    Args:
+        segment_df (pd.DataFrame): Segments aligned with the buffer.
+        station_df (pd.DataFrame): STATION_HELPER_FILE rows with an 'entry_nodes' column.
+        xy (np.ndarray): (N, 2) EPSG:2056 buffer.
+        offsets (np.ndarray): (rows + 1,) offsets.
+
+    Returns:
+        np.ndarray: (N,) bool mask.
+    """
+    segment_rows = {}
+    for i, (start_op, end_op) in enumerate(zip(segment_df['START_OP'], segment_df['END_OP'])):
+        segment_rows.setdefault(frozenset((start_op, end_op)), []).append(i)
+
+    keep = np.zeros(len(xy), dtype=bool)
+    for station, entry_nodes in zip(station_df['station'], station_df['entry_nodes']):
+        try:
+            entry_nodes = ast.literal_eval(entry_nodes) if isinstance(entry_nodes, str) else []
+        except (ValueError, SyntaxError):
+            logger.warning(f"⚠️ Could not parse entry nodes of {station}")
+            continue
+        for node in entry_nodes:
+            for i in segment_rows.get(frozenset((station, node['Connected Station'])), []):
+                start, end = offsets[i], offsets[i + 1]
+                if end > start:
+                    keep[start + nearest_vertex(xy[start:end], node['Coordinates'])] = True
+    return keep
+
+def simplify_segments(segment_df: pd.DataFrame, station_df: pd.DataFrame, max_deviation: float,
+                      jobs: int = 1) -> pd.DataFrame:
+    """
+    Simplify every segment to `max_deviation` meters, keeping endpoints and entry-node vertices.
+
+    Args:
+        segment_df (pd.DataFrame): Stage 01 output.
+        station_df (pd.DataFrame): Stage 02 output (for entry nodes).
+        max_deviation (float): Maximum distance (meters) of a dropped vertex to the simplified polyline.
+        jobs (int, optional): Worker processes. Defaults to 1.
+
+    Returns:
+        pd.DataFrame: segment_df with '_simplified_coordinates' next to '_coordinates',
+        the simplified vertex count and the absolute/relative length error per segment.
+    """
+    xy, offsets = pack_coordinates([parse_coordinates(v) for v in segment_df['_coordinates']])
+    keep = entry_node_keep_mask(segment_df, station_df, xy, offsets)
+    mask = simplify_buffer_mask(xy, offsets, max_deviation, keep=keep, jobs=jobs)
+    simple_xy, simple_offsets = xy[mask], compact_offsets(mask, offsets)
+
+    full_length = polyline_lengths(xy, offsets)
+    simple_length = polyline_lengths(simple_xy, simple_offsets)
+
+    result = segment_df.copy()
+    result['_simplified_coordinates'] = [
+        json.dumps(simple_xy[simple_offsets[i]:simple_offsets[i + 1]].tolist()) for i in range(len(segment_df))
+    ]
+    result['number_of_simplified_points'] = np.diff(simple_offsets)
+    result['simplified_length'] = simple_length.round(3)
+    result['length_error_m'] = (full_length - simple_length).round(3)
+    result['length_error_pct'] = np.divide(full_length - simple_length, full_length,
+                                           out=np.zeros_like(full_length), where=full_length > 0) * 100
+    return result
+
+def run(debug=False, jobs=1, config: PipelineConfig = None):
+    config = config or default_config()
+    logger.setLevel(logging.DEBUG if debug else logging.INFO)
+    logger.info(f"\n🚀 Simplifying segments (max deviation {config.simplify_max_deviation} m)")
+
+    segment_df = pd.read_csv(FILTERED_SUB_NETWORK_POLYGON_FILE, delimiter=';')
+    station_df = pd.read_csv(STATION_HELPER_FILE, delimiter=';')
+    result = simplify_segments(segment_df, station_df, config.simplify_max_deviation, jobs=jobs)
+
+    before, after = result['number_of_polygon_points'].sum(), result['number_of_simplified_points'].sum()
+    logger.info(f"🧮 Vertices: {before} → {after} ({after / max(before, 1):.1%} kept)")
+    logger.info(f"📏 Length error: max {result['length_error_m'].max():.3f} m, "
+                f"mean {result['length_error_m'].mean():.3f} m, max {result['length_error_pct'].max():.4f} %")
+    for _, row in result.nlargest(5, 'length_error_m').iterrows():
+        logger.debug(f"   {row['START_OP']} - {row['END_OP']} (Linie {row['Linie']}): "
+                     f"{row['length_error_m']:.3f} m ({row['length_error_pct']:.4f} %)")
+
+    result.to_csv(SIMPLIFIED_SUB_NETWORK_POLYGON_FILE, index=False, sep=';', encoding='utf-8-sig')
+    logger.info(f"✅ Simplified segments saved to: {SIMPLIFIED_SUB_NETWORK_POLYGON_FILE.resolve()}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simplify stage 01 segment geometry with bounded error.")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes")
+    parser.add_argument("--max-deviation", type=float, help="Override SIMPLIFY_MAX_DEVIATION (meters)")
+    args = parser.parse_args()
+    config = default_config()
+    if args.max_deviation is not None:
+        config = config.replace(simplify_max_deviation=args.max_deviation)
+    run(jobs=args.jobs, config=config)
@@ -1,13 +1,11 @@
 import pandas as pd
 import json
 import logging
+from utils.config import PipelineConfig, default_config
 from utils.constants import (
-    POLYGON_FILE, PLATFORM_FILE, PROCESSED_DIR, LINE_ID_LIST,
-    MAX_PLATFORM_COUNT, MIN_PLATFORM_COUNT, DEFAULT_PLATFORM_COUNT,
-    MAX_PLATFORM_LENGTH, MIN_PLATFORM_LENGTH, DEFAULT_PLATFORM_LENGTH,
-    PLATFORM_LENGTH_DECISION_METHOD, FILL_EMPTY_PLATFORM_LENGTH_DATA_WITH,
-    FILL_EMPTY_PLATFORM_NO_DATA_WITH, STATION_MASTER_FILE, NEVER_SKIP_LIST
+    POLYGON_FILE, PLATFORM_FILE, PROCESSED_DIR, STATION_MASTER_FILE
 )
+from utils.platform_ops import get_fallback_values, decide_platform_length
 from utils.segment_ops import parse_geo_shape
 
 def setup_logger(debug_mode=False):
@@ -20,34 +18,9 @@ def setup_logger(debug_mode=False):
     logger.setLevel(logging.DEBUG if debug_mode else logging.INFO)
     return logger
 
-def get_fallback_values():
-    if FILL_EMPTY_PLATFORM_LENGTH_DATA_WITH == "X":
-        platform_length = MAX_PLATFORM_LENGTH
-    elif FILL_EMPTY_PLATFORM_LENGTH_DATA_WITH == "N":
-        platform_length = MIN_PLATFORM_LENGTH
-    else:
-        platform_length = DEFAULT_PLATFORM_LENGTH
-
-    if FILL_EMPTY_PLATFORM_NO_DATA_WITH == "X":
-        platform_count = MAX_PLATFORM_COUNT
-    elif FILL_EMPTY_PLATFORM_NO_DATA_WITH == "N":
-        platform_count = MIN_PLATFORM_COUNT
-    else:
-        platform_count = DEFAULT_PLATFORM_COUNT
-
-    return platform_length, platform_count
-
-def decide_platform_length(min_len, max_len, avg_len):
-    if PLATFORM_LENGTH_DECISION_METHOD == "X":
-        return min(MAX_PLATFORM_LENGTH, max_len)
-    elif PLATFORM_LENGTH_DECISION_METHOD == "N":
-        return max(MIN_PLATFORM_LENGTH, min_len)
-    elif PLATFORM_LENGTH_DECISION_METHOD == "A":
-        return max(MIN_PLATFORM_LENGTH, min(MAX_PLATFORM_LENGTH, avg_len))
-    else:
-        return DEFAULT_PLATFORM_LENGTH
-
-def validate_master_data(master_df: pd.DataFrame, stations_set: set, logger: logging.Logger) -> None:
+def validate_master_data(master_df: pd.DataFrame, stations_set: set, logger: logging.Logger,
+                         config: PipelineConfig = None) -> None:
+    config = config or default_config()
     report_lines = []
     error_count = 0
 
@@ -71,7 +44,7 @@ def validate_master_data(master_df: pd.DataFrame, stations_set: set, logger: log
             report_lines.append(f"❌ Row {idx} station {row['station']} has malformed center_coordinates.")
             error_count += 1
 
-    allowed_line_ids = set(LINE_ID_LIST)
+    allowed_line_ids = set(config.line_id_list)
     for idx, row in master_df.iterrows():
         line_ids = row['line_ids']
         if isinstance(line_ids, str):
@@ -98,7 +71,7 @@ def validate_master_data(master_df: pd.DataFrame, stations_set: set, logger: log
             report_lines.append(f"❌ Column {col} has {count} negative values.")
             error_count += count
 
-    missing_never_skip = set(NEVER_SKIP_LIST) - stations_set
+    missing_never_skip = set(config.never_skip_list) - stations_set
     if missing_never_skip:
         report_lines.append(f"❌ Missing stations from NEVER_SKIP_LIST: {missing_never_skip}")
         error_count += len(missing_never_skip)
@@ -116,7 +89,8 @@ def validate_master_data(master_df: pd.DataFrame, stations_set: set, logger: log
         f.write("\n".join(report_lines))
     logger.info(f"📄 Validation report saved to: {report_path.resolve()}")
 
-def run(debug=False):
+def run(debug=False, config: PipelineConfig = None):
+    config = config or default_config()
     logger = setup_logger(debug)
     logger.info("🚀 Stage 00 started: Prepare master station info")
 
@@ -125,7 +99,7 @@ def run(debug=False):
     polygon_df = pd.read_csv(POLYGON_FILE, delimiter=';')
     perron_df = pd.read_csv(PLATFORM_FILE, delimiter=';')
 
-    polygon_df = polygon_df[polygon_df['Linie'].isin(LINE_ID_LIST)].copy()
+    polygon_df = polygon_df[polygon_df['Linie'].isin(config.line_id_list)].copy()
     stations = set(polygon_df['START_OP']).union(polygon_df['END_OP'])
 
     master_data = []
@@ -141,11 +115,11 @@ def run(debug=False):
             min_len, max_len, avg_len, platform_count = None, None, None, None
 
         if min_len is None:
-            platform_length, platform_count = get_fallback_values()
+            platform_length, platform_count = get_fallback_values(config)
             min_len = max_len = avg_len = platform_length
         else:
-            platform_length = decide_platform_length(min_len, max_len, avg_len)
-            platform_count = max(MIN_PLATFORM_COUNT, min(MAX_PLATFORM_COUNT, platform_count))
+            platform_length = decide_platform_length(min_len, max_len, avg_len, config)
+            platform_count = max(config.min_platform_count, min(config.max_platform_count, platform_count))
 
         line_ids = sorted(set(
             polygon_df[(polygon_df['START_OP'] == station) | (polygon_df['END_OP'] == station)]['Linie'].tolist()
@@ -184,4 +158,4 @@ def run(debug=False):
     logger.info(f"✅ Saved master station info to: {STATION_MASTER_FILE.resolve()}")
 
     # Run validation
-    validate_master_data(master_df, stations, logger)
+    validate_master_data(master_df, stations, logger, config)
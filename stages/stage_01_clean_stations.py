@@ -2,6 +2,7 @@ import os
 import json
 import logging
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from shapely.geometry import LineString
 from utils.segment_ops import (
@@ -15,7 +16,24 @@ from utils.segment_ops import (
     remove_first_segment,
     remove_last_segment
 )
-from utils.constants import (CLOSENESS_THRESHOLD, PROCESSED_DIR, POLYGON_FILE, FILTERED_SUB_NETWORK_POLYGON_FILE, LINE_ID_LIST as CONST_LINE_ID_LIST, NEVER_SKIP_LIST)
+from utils.checkpoint_ops import checkpoint_key, load_checkpoint, save_checkpoint
+from utils.config import PipelineConfig, default_config
+from utils.constants import (PROCESSED_DIR, POLYGON_FILE, FILTERED_SUB_NETWORK_POLYGON_FILE, STAGE_01_CHECKPOINT_DIR)
+from utils.pipeline import code_files
+
+# Pipeline DAG declaration (file and constant names refer to utils.constants)
+PIPELINE_NODE = {
+    "name": "stage_01",
+    "title": "Stage 01 - Clean Stations",
+    "stage": 1,
+    "entry": "run",
+    "inputs": ["POLYGON_FILE"],
+    "outputs": ["FILTERED_SUB_NETWORK_POLYGON_FILE"],
+    "constants": ["LINE_ID_LIST", "NEVER_SKIP_LIST", "CLOSENESS_THRESHOLD"],
+}
+
+# Source files whose edits invalidate the checkpoints: this module and the project modules it imports
+CODE_FILES = code_files(Path(__file__).resolve(), Path(__file__).resolve().parents[1])
 
 # ------------------------
 # Logging setup
@@ -91,8 +109,42 @@ def choose_action(i, segment_df: pd.DataFrame, threshold: int, never_skip: list)
 
     return segment_df, i + 1
 
-def run(debug=False):
-    LINE_ID_LIST = list(set(CONST_LINE_ID_LIST))
+def process_line(segment_df: pd.DataFrame, config: PipelineConfig) -> pd.DataFrame:
+    """
+    Merge or drop short segments of one line (segments sorted by KM START).
+    """
+    i = 0
+    while i < len(segment_df):
+        segment_df, i = choose_action(i, segment_df, config.closeness_threshold, list(config.never_skip_list))
+    return segment_df
+
+def line_checkpoint_key(segment_df: pd.DataFrame, config: PipelineConfig) -> str:
+    """
+    Checkpoint key of one line: its raw input rows, the cleaning config and the cleaning code.
+    """
+    return checkpoint_key(
+        segment_df[["Linie", "START_OP", "END_OP", "KM START", "KM END", "Geo shape"]],
+        {"CLOSENESS_THRESHOLD": config.closeness_threshold, "NEVER_SKIP_LIST": sorted(config.never_skip_list)},
+        code_files=CODE_FILES,
+    )
+
+def run(debug=False, jobs=1, resume=True, config: PipelineConfig = None):
+    """
+    Clean every line in LINE_ID_LIST and write the filtered sub-network file.
+
+    Each finished line is checkpointed under STAGE_01_CHECKPOINT_DIR, keyed by the
+    line's input rows, config and code, so an interrupted run only redoes missing lines.
+
+    Args:
+        debug (bool, optional): Unused, kept for the pipeline runner. Defaults to False.
+        jobs (int, optional): Number of worker processes for missing lines. Defaults to 1.
+        resume (bool, optional): Reuse matching line checkpoints. Defaults to True.
+        config (PipelineConfig, optional): Tunables. Defaults to utils.constants (default_config()).
+    """
+    config = config or default_config()
+    LINE_ID_LIST = list(set(config.line_id_list))
+    NEVER_SKIP_LIST = list(config.never_skip_list)
+    CLOSENESS_THRESHOLD = config.closeness_threshold
     logger.info(f"\n🚧 CLOSENESS_THRESHOLD calculated as: {CLOSENESS_THRESHOLD} meters")
     logger.info("\n🚀 Stage 01 started: Clean and analyze line segment geometries")
 
@@ -117,19 +169,35 @@ def run(debug=False):
     ]
     df = df[keep_cols].reset_index(drop=True)
 
-    all_processed_dfs = []
-
+    processed = {}
+    missing = {}
     for idx, line_id in enumerate(LINE_ID_LIST, 1):
-        logger.info(f"\n📊 Line {idx}/{len(LINE_ID_LIST)} - Linie {line_id}")
         segment_df = df[df["Linie"] == line_id].sort_values("KM START").reset_index(drop=True)
-        #print_all_segments(segment_df)
-
-        i = 0
-        while i < len(segment_df):
-            segment_df, i = choose_action(i, segment_df, CLOSENESS_THRESHOLD, NEVER_SKIP_LIST)
+        key = line_checkpoint_key(segment_df, config)
+        cached = load_checkpoint(STAGE_01_CHECKPOINT_DIR, f"line_{line_id}", key) if resume else None
+        if cached is not None:
+            logger.info(f"♻️ Line {idx}/{len(LINE_ID_LIST)} - Linie {line_id} loaded from checkpoint")
+            processed[line_id] = cached
+        else:
+            missing[line_id] = (segment_df, key)
+    logger.info(f"📦 {len(processed)} lines restored from checkpoints, {len(missing)} to process")
+
+    def finish(line_id, segment_df):
+        save_checkpoint(STAGE_01_CHECKPOINT_DIR, f"line_{line_id}", missing[line_id][1], segment_df)
+        processed[line_id] = segment_df
+        logger.info(f"✅ Linie {line_id} done ({len(processed)}/{len(LINE_ID_LIST)})")
+
+    if jobs > 1 and len(missing) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {executor.submit(process_line, segment_df, config): line_id for line_id, (segment_df, _) in missing.items()}
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+    else:
+        for line_id, (segment_df, _) in missing.items():
+            logger.info(f"\n📊 Linie {line_id}")
+            finish(line_id, process_line(segment_df, config))
 
-        all_processed_dfs.append(segment_df)
-        print(f"all_processed_dfs length: {str(len(all_processed_dfs))}")
+    all_processed_dfs = [processed[line_id] for line_id in LINE_ID_LIST]
     duplicates = df[df.duplicated(subset=['Linie', 'START_OP', 'END_OP', 'KM START', 'KM END'], keep=False)]
 
 
@@ -1,13 +1,38 @@
 import pandas as pd
 import logging
 from pathlib import Path
+from utils.checkpoint_ops import (
+    row_hashes, partition_fingerprints, load_partitions, save_partitions, stale_partitions, merge_partitions
+)
+from utils.config import PipelineConfig, default_config
 from utils.constants import (
-    PROCESSED_DIR, FILTERED_SUB_NETWORK_POLYGON_FILE, PLATFORM_FILE, STATION_HELPER_FILE, NEVER_SKIP_LIST
+    PROCESSED_DIR, FILTERED_SUB_NETWORK_POLYGON_FILE, PLATFORM_FILE, STATION_HELPER_FILE, STAGE_02_PARTITION_FILE
 )
+from utils.network_ops import incident_stations
+from utils.pipeline import constant_values, code_files
 from utils.platform_ops import (
     filter_perron_data, build_station_info, find_station_connections, define_station_types, find_entry_nodes
 )
 
+# Pipeline DAG declaration (file and constant names refer to utils.constants)
+PIPELINE_NODE = {
+    "name": "stage_02",
+    "title": "Stage 02 - Generate Nodes",
+    "stage": 2,
+    "entry": "run",
+    "inputs": ["FILTERED_SUB_NETWORK_POLYGON_FILE", "PLATFORM_FILE"],
+    "outputs": ["STATION_HELPER_FILE"],
+    "constants": [
+        "MAX_PLATFORM_COUNT", "MIN_PLATFORM_COUNT", "DEFAULT_PLATFORM_COUNT",
+        "MIN_PLATFORM_LENGTH", "MAX_PLATFORM_LENGTH", "DEFAULT_PLATFORM_LENGTH",
+        "PLATFORM_LENGTH_DECISION_METHOD", "FILL_EMPTY_PLATFORM_LENGTH_DATA_WITH",
+        "FILL_EMPTY_PLATFORM_NO_DATA_WITH", "ENTRY_OFFSET_BUFFER", "NEVER_SKIP_LIST"
+    ],
+}
+
+# Source files whose edits invalidate the checkpoints: this module and the project modules it imports
+CODE_FILES = code_files(Path(__file__).resolve(), Path(__file__).resolve().parents[1])
+
 def setup_logger(debug_mode=False):
     logger = logging.getLogger(__name__)
     if not logger.hasHandlers():
@@ -18,7 +43,60 @@ def setup_logger(debug_mode=False):
     logger.setLevel(logging.DEBUG if debug_mode else logging.INFO)
     return logger
 
-def run(debug=False):
+def station_fingerprints(polygon_df: pd.DataFrame, perron_df: pd.DataFrame, config: PipelineConfig) -> pd.Series:
+    """
+    Fingerprint of every station: its segments, its perronkante rows, the stage constants and code.
+    """
+    stations, rows = incident_stations(polygon_df)
+    perron_df = filter_perron_data(perron_df, set(stations))
+    return partition_fingerprints(
+        pd.concat([pd.Series(stations), perron_df['Station abbreviation']], ignore_index=True),
+        pd.concat([pd.Series(row_hashes(polygon_df)[rows]), pd.Series(row_hashes(perron_df))],
+                  ignore_index=True).to_numpy(),
+        constant_values(PIPELINE_NODE["constants"], config),
+        code_files=CODE_FILES,
+    )
+
+def build_stations(polygon_df: pd.DataFrame, perron_df: pd.DataFrame, stations, logger,
+                   config: PipelineConfig) -> pd.DataFrame:
+    """
+    Station info rows of `stations` only, from the segments touching them.
+
+    Every value of a station row depends only on its own segments and perronkante
+    rows, so a subset gives the same rows as the whole network.
+    """
+    stations = set(stations)
+    polygon_df = polygon_df[polygon_df['START_OP'].isin(stations) | polygon_df['END_OP'].isin(stations)]
+    perron_df_filtered = filter_perron_data(perron_df, stations)
+    logger.info(f"🔎 Filtered perronkante: {len(perron_df_filtered)} rows")
+
+    # Build station info
+    station_info_df = build_station_info(polygon_df, perron_df_filtered, logger, config)
+    station_info_df = station_info_df[station_info_df['station'].isin(stations)].reset_index(drop=True)
+
+    # Add connected stations
+    station_info_df = find_station_connections(station_info_df, polygon_df, logger)
+
+    # Define station types
+    station_info_df = define_station_types(station_info_df)
+
+    # Find Entry Nodes
+    return find_entry_nodes(station_info_df, polygon_df, logger, config)
+
+def run(debug=False, resume=True, config: PipelineConfig = None):
+    """
+    Build STATION_HELPER_FILE, rebuilding only stations whose inputs changed.
+
+    Station rows are stored per station in STAGE_02_PARTITION_FILE with a fingerprint
+    of the station's segments, perronkante rows, constants and code; a run rebuilds
+    the stale stations and merges them with the stored ones.
+
+    Args:
+        debug (bool, optional): Debug logging. Defaults to False.
+        resume (bool, optional): Reuse stored stations with matching fingerprints. Defaults to True.
+        config (PipelineConfig, optional): Tunables. Defaults to utils.constants (default_config()).
+    """
+    config = config or default_config()
     logger = setup_logger(debug)
     logger.info("🚀 Stage 02 started: Generate station info")
 
@@ -29,24 +107,20 @@ def run(debug=False):
         polygon_df = pd.read_csv(FILTERED_SUB_NETWORK_POLYGON_FILE, delimiter=';')
         perron_df = pd.read_csv(PLATFORM_FILE, delimiter=';')
 
-        # Filter perron data to only include used stations
         unique_ops = set(polygon_df['START_OP']).union(polygon_df['END_OP'])
-        perron_df_filtered = filter_perron_data(perron_df, unique_ops)
-
         logger.info(f"🔎 Found {len(unique_ops)} unique stations in polygon file")
-        logger.info(f"🔎 Filtered perronkante: {len(perron_df_filtered)} rows")
-
-        # Build station info
-        station_info_df = build_station_info(polygon_df, perron_df_filtered, logger)
 
-        # Add connected stations
-        station_info_df = find_station_connections(station_info_df, polygon_df, logger)
+        # ♻️ Yalnızca girdisi değişen istasyonlar yeniden üretilir
+        fingerprints = station_fingerprints(polygon_df, perron_df, config)
+        stored_fingerprints, stored = load_partitions(STAGE_02_PARTITION_FILE) if resume else (pd.Series(dtype=object), {})
+        stale = stale_partitions(stored_fingerprints, fingerprints)
+        logger.info(f"📦 {len(fingerprints) - len(stale)} stations restored, {len(stale)} to build")
 
-        # Define station types
-        station_info_df = define_station_types(station_info_df)
-        
-        # Find Entry Nodes
-        station_info_df = find_entry_nodes(station_info_df, polygon_df, logger)
+        fresh = build_stations(polygon_df, perron_df, stale, logger, config) if len(stale) else pd.DataFrame()
+        fresh = fresh.assign(partition=fresh['station']) if len(fresh) else fresh
+        station_info_df = merge_partitions(stored.get("stations"), fresh, fingerprints, stale)
+        save_partitions(STAGE_02_PARTITION_FILE, fingerprints, {"stations": station_info_df})
+        station_info_df = station_info_df.drop(columns=["partition"])
 
         # Save station info CSV
         station_info_df.sort_values(by='station', inplace=True)
@@ -67,7 +141,7 @@ def run(debug=False):
     else:
         logger.info("✅ Number of stations validation PASSED")
     # 2️⃣ NEVER SKIP LIST VALIDATION
-    missing_never_skip = set(NEVER_SKIP_LIST) - polygon_unique_stations
+    missing_never_skip = set(config.never_skip_list) - polygon_unique_stations
     if missing_never_skip:
         logger.warning(f"⚠️ NEVER_SKIP_LIST stations missing in final data: {missing_never_skip}")
     else:
@@ -0,0 +1,284 @@
+import logging
+import argparse
+import sys
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Optional
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.checkpoint_ops import (
+    PartitionStore, row_hashes, partition_fingerprints, stale_partitions, merge_partitions
+)
+from utils.config import PipelineConfig, default_config
+from utils.constants import (
+    FILTERED_SUB_NETWORK_POLYGON_FILE, STATION_HELPER_FILE, SUMO_NODES_FILE, SUMO_EDGES_FILE, SUMO_CONNECTIONS_FILE,
+    STAGE_03_PARTITION_DIR
+)
+from utils.crs import pack_coordinates, parse_coordinates
+from utils.network_ops import (
+    parse_entry_nodes, station_points, station_axes, build_station_network, incident_stations,
+    segment_index, main_line_edges, drop_missing_main_edges, station_axis_lines
+)
+from utils.pipeline import constant_values, code_files
+from utils.station_layout import LayoutTemplateCache
+from utils.sumo_xml import XmlStreamWriter, format_shape
+
+# Segment columns the network depends on (fingerprinted per station and station pair)
+SEGMENT_COLUMNS = ["Linie", "START_OP", "END_OP", "_coordinates"]
+# Source files whose edits invalidate the checkpoints: this module and the project modules it imports
+CODE_FILES = code_files(Path(__file__).resolve(), Path(__file__).resolve().parents[1])
+
+# Pipeline DAG declaration (file and constant names refer to utils.constants)
+PIPELINE_NODE = {
+    "name": "stage_03",
+    "title": "Stage 03 - Generate Edges",
+    "stage": 3,
+    "entry": "run",
+    "inputs": ["FILTERED_SUB_NETWORK_POLYGON_FILE", "STATION_HELPER_FILE"],
+    "outputs": ["SUMO_NODES_FILE", "SUMO_EDGES_FILE", "SUMO_CONNECTIONS_FILE"],
+    "constants": ["DEFAULT_PLATFORM_OFFSET", "DEFAULT_PLATFORM_LENGTH", "MAIN_LINE_SPEED", "STATION_SPEED",
+                  "MAX_PLATFORM_LENGTH", "PLATFORM_MITER_LIMIT"],
+}
+
+def setup_logger(debug_mode=False):
+    logger = logging.getLogger(__name__)
+    if not logger.hasHandlers():
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG if debug_mode else logging.INFO)
+    return logger
+
+def write_nodes(xml: XmlStreamWriter, nodes: pd.DataFrame) -> None:
+    """Write entry or track nodes into an open SUMO .nod.xml writer."""
+    for node_id, x, y in zip(nodes['id'], nodes['x'], nodes['y']):
+        xml.element("node", id=node_id, x=x, y=y, type="priority")
+
+def write_edges(xml: XmlStreamWriter, main: Optional[pd.DataFrame], station_edges: Optional[pd.DataFrame],
+                config: PipelineConfig, counts: dict) -> None:
+    """
+    Write main line, station entry/exit and platform edges into an open SUMO .edg.xml writer.
+
+    Shapes are stored formatted in the partitions, so this is a single pass over the
+    given rows; run() calls it once per partition store bucket.
+
+    Args:
+        main (pd.DataFrame, optional): Main line edges; None writes none.
+        station_edges (pd.DataFrame, optional): Station entry/exit and platform edges; None writes none.
+        counts (dict): Edges per kind ("main_line", "station_entry", "platform"), updated in place.
+    """
+    main = main if main is not None else pd.DataFrame(columns=["id", "from", "to", "shape"])
+    station_edges = station_edges if station_edges is not None else pd.DataFrame(
+        columns=["id", "from", "to", "kind", "shape"])
+    # 🛤️ Ana hat: iki istasyonun karşılıklı entry node'ları arasında, iki yönde
+    for edge_id, from_node, to_node, shape in zip(main['id'], main['from'], main['to'], main['shape']):
+        xml.element("edge", id=edge_id, **{"from": from_node}, to=to_node, priority=2, numLanes=1,
+                    speed=config.main_line_speed, allow="rail", shape=None if pd.isna(shape) else shape)
+        counts["main_line"] += 1
+
+    # 🚉 Entry node ↔ aynı taraftaki tüm track node'lar, 🔁 her peron hattı iki yönde
+    for edge_id, from_node, to_node, kind, shape in zip(station_edges['id'], station_edges['from'],
+                                                        station_edges['to'], station_edges['kind'],
+                                                        station_edges['shape']):
+        xml.element("edge", id=edge_id, **{"from": from_node}, to=to_node, priority=1, numLanes=1,
+                    speed=config.station_speed, allow="rail", shape=None if pd.isna(shape) else shape)
+        counts[kind] += 1
+
+def write_connections(xml: XmlStreamWriter, connections: pd.DataFrame) -> None:
+    """Write connections (single-lane edges, so lane 0 to lane 0) into an open SUMO .con.xml writer."""
+    for from_edge, to_edge in zip(connections['from'], connections['to']):
+        xml.element("connection", **{"from": from_edge}, to=to_edge, fromLane=0, toLane=0)
+
+def pair_partitions(start_ops, end_ops) -> np.ndarray:
+    """Partition name of the main line edges between two stations ("main:<A>|<B>", A < B)."""
+    start_ops, end_ops = np.asarray(start_ops, dtype=object).astype(str), np.asarray(end_ops, dtype=object).astype(str)
+    low, high = np.where(start_ops < end_ops, start_ops, end_ops), np.where(start_ops < end_ops, end_ops, start_ops)
+    return "main:" + pd.Series(low, dtype=object) + "|" + pd.Series(high, dtype=object)
+
+def network_fingerprints(segment_df: pd.DataFrame, station_df: pd.DataFrame, entries: pd.DataFrame, extend: float,
+                         config: PipelineConfig) -> pd.Series:
+    """
+    Fingerprint of every station ("station:<S>") and station pair ("main:<A>|<B>") partition.
+
+    A station depends on its stage 02 row, the segments touching it, the layout
+    constants and the platform extension; a station pair on its segments and its
+    two facing entry nodes.
+    """
+    segment_hashes = row_hashes(segment_df[SEGMENT_COLUMNS])
+    stations, rows = incident_stations(segment_df)
+    station_parts = pd.concat([pd.Series("station:" + station_df['station'].astype(str), dtype=object),
+                               pd.Series("station:" + pd.Series(stations, dtype=object).astype(str))],
+                              ignore_index=True)
+    station_keys = partition_fingerprints(
+        station_parts, np.concatenate([row_hashes(station_df), segment_hashes[rows]]),
+        {**constant_values(PIPELINE_NODE["constants"], config), "extend": extend}, CODE_FILES)
+    pair_keys = partition_fingerprints(
+        pd.concat([pair_partitions(segment_df['START_OP'], segment_df['END_OP']),
+                   pair_partitions(entries['station'], entries['connected_station'])], ignore_index=True),
+        np.concatenate([segment_hashes, row_hashes(entries[["station", "connected_station", "direction", "x", "y"]])]),
+        {}, CODE_FILES)
+    return pd.concat([station_keys, pair_keys])
+
+def build_stations(segment_df: pd.DataFrame, station_df: pd.DataFrame, entries: pd.DataFrame, stations,
+                   extend: float, layouts: LayoutTemplateCache, config: PipelineConfig) -> dict:
+    """
+    Track nodes, station edges and connections of `stations` only, from the segments touching them.
+
+    Returns:
+        dict: "tracks", "edges" (shapes formatted) and "connections", each with a 'partition' column.
+    """
+    stations = set(stations)
+    if not stations:
+        return {"tracks": pd.DataFrame(), "edges": pd.DataFrame(), "connections": pd.DataFrame()}
+    segments = segment_df[segment_df['START_OP'].isin(stations) | segment_df['END_OP'].isin(stations)]
+    xy, offsets = pack_coordinates([parse_coordinates(v) for v in segments['_coordinates']])
+    entries = entries[entries['station'].isin(stations)]
+    axes = station_axes(station_points(segments, xy, offsets), entries)
+    # 🛤️ Peron hatları istasyondaki ana hat geometrisini takip eder (offset eğrisi)
+    axis_lines = station_axis_lines(segments, xy, offsets, entries, extend=extend)
+    network = build_station_network(station_df[station_df['station'].isin(stations)], axes, entries, config,
+                                    cache=layouts, axis_lines=axis_lines)
+
+    tracks = network["tracks"]
+    node_station = pd.concat([tracks.set_index('id')['station'], entries.set_index('id')['station']])
+    edges = network["edges"].assign(shape=[None if shape is None else format_shape(shape)
+                                           for shape in network["edges"]['shape']])
+    return {
+        "tracks": tracks.assign(partition="station:" + tracks['station'].astype(str)),
+        "edges": edges.assign(partition="station:" + edges['from'].map(node_station).astype(str)),
+        "connections": network["connections"].assign(
+            partition="station:" + network["connections"]['via'].map(node_station).astype(str)),
+    }
+
+def build_main_lines(segment_df: pd.DataFrame, entries: pd.DataFrame, pairs, logger) -> pd.DataFrame:
+    """Main line edges (both directions, shapes formatted) of the `pairs` partitions only."""
+    if not len(pairs):
+        return pd.DataFrame()
+    segments = segment_df[pair_partitions(segment_df['START_OP'], segment_df['END_OP']).isin(set(pairs)).to_numpy()]
+    xy, offsets = pack_coordinates([parse_coordinates(v) for v in segments['_coordinates']])
+    edges = pd.DataFrame([(edge_id, from_node, to_node, format_shape(shape)) for edge_id, from_node, to_node, shape
+                          in main_line_edges(segments, xy, offsets, entries, logger)],
+                         columns=["id", "from", "to", "shape"])
+    by_node = entries.set_index('id')
+    from_station = edges['from'].map(by_node['station'])
+    to_station = edges['to'].map(by_node['station'])
+    return edges.assign(line=edges['from'].map(by_node['line']).to_numpy(),
+                        partition=pair_partitions(from_station, to_station).to_numpy())
+
+def run(debug=False, resume=True, config: PipelineConfig = None):
+    """
+    Write the SUMO network, rebuilding only stations and station pairs whose inputs changed.
+
+    The network is stored under STAGE_03_PARTITION_DIR partitioned by station (track
+    nodes, station edges, connections) and station pair (main line edges, tagged with
+    their Linie), each with a content fingerprint (see network_fingerprints). A run
+    rebuilds the stale partitions, then merges, saves and streams the store one bucket
+    at a time (see PartitionStore); connections follow in a second pass, once the
+    written main line edges are known. Memory is bounded by the rebuilt partitions
+    plus one bucket, but every run still reads every bucket, because the network files
+    are always written in full.
+
+    Args:
+        debug (bool, optional): Debug logging. Defaults to False.
+        resume (bool, optional): Reuse stored partitions with matching fingerprints. Defaults to True.
+        config (PipelineConfig, optional): Tunables. Defaults to utils.constants (default_config()).
+    """
+    config = config or default_config()
+    logger = setup_logger(debug)
+    logger.info("🚀 Stage 03 started: Generate edges")
+
+    segment_df = pd.read_csv(FILTERED_SUB_NETWORK_POLYGON_FILE, delimiter=';')
+    station_df = pd.read_csv(STATION_HELPER_FILE, delimiter=';')
+    entries = parse_entry_nodes(station_df, logger)
+    extend = max(config.max_platform_length, station_df['decided_platform_length'].fillna(0).max()) / 2.0
+
+    # ♻️ Parmak izi değişen istasyon ve istasyon çiftleri yeniden üretilir, diğerleri saklı bölümlerden gelir
+    store = PartitionStore(STAGE_03_PARTITION_DIR)
+    fingerprints = network_fingerprints(segment_df, station_df, entries, extend, config)
+    stored_fingerprints = store.fingerprints() if resume else pd.Series(dtype=object)
+    stale = stale_partitions(stored_fingerprints, fingerprints)
+    stale_stations = [p[len("station:"):] for p in stale if p.startswith("station:")]
+    stale_pairs = [p for p in stale if p.startswith("main:")]
+    logger.info(f"📦 {len(fingerprints) - len(stale)} partitions restored; rebuilding {len(stale_stations)} stations "
+                f"and {len(stale_pairs)} station pairs")
+
+    layouts = LayoutTemplateCache(config)
+    fresh = build_stations(segment_df, station_df, entries, stale_stations, extend, layouts, config)
+    fresh["main"] = build_main_lines(segment_df, entries, stale_pairs, logger)
+    if len(fresh["main"]):
+        logger.info(f"🛤️ Rebuilt main line edges per Linie: {fresh['main']['line'].value_counts().to_dict()}")
+    logger.info(f"🧩 {len(stale_stations)} station layouts placed from {len(layouts)} templates")
+
+    bucket_of = pd.Series(store.bucket_of(fingerprints.index), index=fingerprints.index)
+    fresh_bucket = {name: store.bucket_of(table['partition']) if len(table) else np.zeros(0, dtype=np.int64)
+                    for name, table in fresh.items()}
+    removed = store.bucket_of(stored_fingerprints.index.difference(fingerprints.index))
+    changed = set(bucket_of[stale].tolist()) | set(removed.tolist())
+    store.save_fingerprints(stored_fingerprints.drop(stale, errors='ignore'))
+
+    counts = {"main_line": 0, "station_entry": 0, "platform": 0}
+    main_ids, track_count, track_stations = set(), 0, set()
+    with XmlStreamWriter(SUMO_NODES_FILE, "nodes") as nodes_xml, XmlStreamWriter(SUMO_EDGES_FILE, "edges") as edges_xml:
+        write_nodes(nodes_xml, entries)
+        for bucket in range(store.buckets):
+            tables = store.load_bucket(bucket) if resume else {}
+            if bucket in changed or not resume:
+                part = fingerprints[(bucket_of == bucket).to_numpy()]
+                tables = {name: merge_partitions(tables.get(name), fresh[name][fresh_bucket[name] == bucket],
+                                                 part, stale) for name in fresh}
+                store.save_bucket(bucket, tables)
+            # Boş bölümler sütunsuz saklanabilir
+            tables = {name: table for name, table in tables.items() if len(table)}
+            if "tracks" in tables:
+                write_nodes(nodes_xml, tables["tracks"])
+                track_count += len(tables["tracks"])
+                track_stations.update(tables["tracks"]['station'])
+            write_edges(edges_xml, tables.get("main"), tables.get("edges"), config, counts)
+            if "main" in tables:
+                main_ids.update(tables["main"]['id'])
+        node_count = nodes_xml.count
+    store.save_fingerprints(fingerprints)
+    logger.info(f"🔎 {len(entries)} entry nodes, {track_count} track nodes at {len(track_stations)} stations")
+    logger.info(f"✅ Saved {node_count} nodes to: {SUMO_NODES_FILE.resolve()}")
+    logger.info(f"✅ Saved {counts['main_line'] + counts['station_entry'] + counts['platform']} edges "
+                f"({counts['main_line']} main line, {counts['station_entry']} station entry/exit, "
+                f"{counts['platform']} platform) to: {SUMO_EDGES_FILE.resolve()}")
+
+    # 🔗 Bağlantılar: yazılmayan ana hat kenarlarına giden bağlantılar düşülür
+    per_kind = {}
+    with XmlStreamWriter(SUMO_CONNECTIONS_FILE, "connections") as xml:
+        for bucket in range(store.buckets):
+            connections = store.load_bucket(bucket).get("connections")
+            if connections is None or not len(connections):
+                continue
+            connections = drop_missing_main_edges(connections, main_ids)
+            write_connections(xml, connections)
+            for kind, count in connections['kind'].value_counts().items():
+                per_kind[kind] = per_kind.get(kind, 0) + int(count)
+        connection_count = xml.count
+    logger.info(f"✅ Saved {connection_count} connections {per_kind} to: {SUMO_CONNECTIONS_FILE.resolve()}")
+
+    # ------------------------
+    # ✅ Final Validation Layer
+    # ------------------------
+    missing_main = len(segment_index(segment_df)) * 2 - counts['main_line']
+    if missing_main:
+        logger.warning(f"⚠️ {missing_main} main line edges could not be built (missing entry nodes)")
+    else:
+        logger.info("✅ Every station pair has main line edges in both directions")
+    without_tracks = set(entries['station']) - track_stations
+    if without_tracks:
+        logger.warning(f"⚠️ Stations with entry nodes but no tracks: {sorted(without_tracks)}")
+    logger.info("✅ STAGE 03 complete.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stage 03: write SUMO nodes and edges.")
+    parser.add_argument("--debug", action="store_true")
+    parser.add_argument("--no-resume", action="store_true", help="Rebuild every partition")
+    args = parser.parse_args()
+    run(debug=args.debug, resume=not args.no_resume)
@@ -0,0 +1,127 @@
+import logging
+import argparse
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.config import PipelineConfig, default_config
+from utils.constants import (
+    TIMETABLE_FILE, STATION_HELPER_FILE, SUMO_NODES_FILE, SUMO_EDGES_FILE, SUMO_CONNECTIONS_FILE, SUMO_ROUTES_FILE
+)
+from utils.routing import RoutingGraph
+from utils.sumo_xml import XmlStreamWriter
+from utils.timetable import load_timetable, assign_stop_edges, choose_stop_edges, iter_train_chunks
+
+# Pipeline DAG declaration (file and constant names refer to utils.constants)
+PIPELINE_NODE = {
+    "name": "stage_04",
+    "title": "Stage 04 - Generate Routes",
+    "stage": 4,
+    "entry": "run",
+    "inputs": ["TIMETABLE_FILE", "STATION_HELPER_FILE", "SUMO_NODES_FILE", "SUMO_EDGES_FILE",
+               "SUMO_CONNECTIONS_FILE"],
+    "outputs": ["SUMO_ROUTES_FILE"],
+    "constants": ["ROUTE_CHUNK_SIZE", "MAIN_LINE_SPEED", "DEFAULT_PLATFORM_LENGTH"],
+}
+
+def setup_logger(debug_mode=False):
+    logger = logging.getLogger(__name__)
+    if not logger.hasHandlers():
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG if debug_mode else logging.INFO)
+    return logger
+
+def consist_types(stops: pd.DataFrame, config: PipelineConfig) -> pd.Series:
+    """
+    Vehicle type id per train; one type per consist length rounded to 10 m
+    (trains without a consist length get the default platform length).
+    """
+    lengths = pd.to_numeric(stops.groupby('train_id', sort=False)['consist_length'].first(), errors='coerce')
+    lengths = (lengths.fillna(config.default_platform_length) / 10.0).round().clip(lower=1).astype(np.int64) * 10
+    return "rail_" + lengths.astype(str) + "m"
+
+def write_routes(path, stops: pd.DataFrame, graph: RoutingGraph, config: PipelineConfig, logger) -> dict:
+    """
+    Stream vehicle types and one vehicle per train (sorted by depart) into a SUMO .rou.xml file.
+
+    Trains are routed and written in blocks of `route_chunk_size`, so only one block of
+    routes is held in memory. The platform edge direction of each stop is chosen from
+    the network per block (see choose_stop_edges). Every vehicle carries its full
+    route and a <stop> on the platform edge of each timetable stop.
+
+    Returns:
+        dict: Number of written and skipped (unroutable) trains.
+    """
+    types = consist_types(stops, config)
+    counts = {"vehicles": 0, "skipped": 0}
+    with XmlStreamWriter(path, "routes") as xml:
+        for type_id in sorted(types.unique(), key=lambda t: int(t[5:-1])):
+            xml.element("vType", id=type_id, vClass="rail", length=float(type_id[5:-1]),
+                        maxSpeed=config.main_line_speed)
+
+        for chunk in iter_train_chunks(stops, config.route_chunk_size):
+            chunk = choose_stop_edges(chunk, graph)
+            trains = list(chunk.groupby('train_id', sort=False))
+            routes = graph.route_many([train['edge'].tolist() for _, train in trains])
+            for (train_id, train), route in zip(trains, routes):
+                if route is None:
+                    counts["skipped"] += 1
+                    logger.debug(f"⏭️ Train {train_id} skipped: no route through {train['edge'].tolist()}")
+                    continue
+                first = train.iloc[0]
+                xml.start("vehicle", id=train_id, type=types[train_id], depart=float(first['depart']),
+                          line=first['line'])
+                xml.element("route", edges=" ".join(route))
+                for edge, arrival, departure in zip(train['edge'], train['arrival'], train['departure']):
+                    xml.element("stop", lane=f"{edge}_0", arrival=None if np.isnan(arrival) else float(arrival),
+                                until=None if np.isnan(departure) else float(departure))
+                xml.end("vehicle")
+                counts["vehicles"] += 1
+            logger.debug(f"📝 {counts['vehicles']} vehicles written, {counts['skipped']} skipped")
+    return counts
+
+def run(debug=False, config: PipelineConfig = None):
+    config = config or default_config()
+    logger = setup_logger(debug)
+    logger.info("🚀 Stage 04 started: Generate routes")
+
+    timetable = load_timetable(TIMETABLE_FILE)
+    station_df = pd.read_csv(STATION_HELPER_FILE, delimiter=';')
+    logger.info(f"🕒 Timetable: {timetable['train_id'].nunique()} trains, {len(timetable)} stops")
+
+    # 🚉 Her durak bir peron hattına (round-robin) atanır; yön ağ üzerinden seçilir
+    stops = assign_stop_edges(timetable, station_df, logger)
+
+    # 🛤️ Yollar bağlantı grafiği üzerinden; contraction hierarchy ağ başına bir kez kurulur
+    graph = RoutingGraph.from_network(SUMO_EDGES_FILE, SUMO_CONNECTIONS_FILE, SUMO_NODES_FILE)
+    graph.use_contraction()
+    logger.info(f"🔎 Routing graph: {len(graph.edge_ids)} edges")
+
+    counts = write_routes(SUMO_ROUTES_FILE, stops, graph, config, logger)
+    logger.info(f"✅ Saved {counts['vehicles']} vehicles to: {SUMO_ROUTES_FILE.resolve()}")
+
+    # ------------------------
+    # ✅ Final Validation Layer
+    # ------------------------
+    dropped = timetable['train_id'].nunique() - stops['train_id'].nunique()
+    if dropped:
+        logger.warning(f"⚠️ {dropped} trains have no stop at a station of the network")
+    if counts['skipped']:
+        logger.warning(f"⚠️ {counts['skipped']} trains could not be routed through all their stops")
+    else:
+        logger.info("✅ Every train with network stops has a route")
+    logger.info(f"📦 Path cache: {len(graph.cache)} legs, {graph.cache.hits} hits, {graph.cache.misses} misses")
+    logger.info("✅ STAGE 04 complete.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stage 04: write SUMO routes from the timetable.")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+    run(debug=args.debug)
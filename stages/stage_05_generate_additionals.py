@@ -0,0 +1,96 @@
+import logging
+import argparse
+import sys
+import os
+import pandas as pd
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.additionals import DETECTOR_OUTPUT_FILE, train_stops, main_line_edge_table, main_line_detectors
+from utils.config import PipelineConfig, default_config
+from utils.constants import (
+    FILTERED_SUB_NETWORK_POLYGON_FILE, STATION_HELPER_FILE, SUMO_NODES_FILE, SUMO_EDGES_FILE, SUMO_ADDITIONALS_FILE
+)
+from utils.crs import pack_coordinates, parse_coordinates
+from utils.linear_referencing import LinearReferenceIndex
+from utils.network_ops import parse_entry_nodes
+from utils.sumo_xml import XmlStreamWriter, edge_table
+
+# Pipeline DAG declaration (file and constant names refer to utils.constants)
+PIPELINE_NODE = {
+    "name": "stage_05",
+    "title": "Stage 05 - Generate Stops and Detectors",
+    "stage": 5,
+    "entry": "run",
+    "inputs": ["FILTERED_SUB_NETWORK_POLYGON_FILE", "STATION_HELPER_FILE", "SUMO_NODES_FILE", "SUMO_EDGES_FILE"],
+    "outputs": ["SUMO_ADDITIONALS_FILE"],
+    "constants": ["DETECTOR_SPACING", "DETECTOR_SPACING_BY_LINE", "ENTRY_DETECTOR_OFFSET", "DETECTOR_PERIOD"],
+}
+
+def setup_logger(debug_mode=False):
+    logger = logging.getLogger(__name__)
+    if not logger.hasHandlers():
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG if debug_mode else logging.INFO)
+    return logger
+
+def chainage_index(segment_df: pd.DataFrame, logger):
+    """Linear referencing index of the segments, or None without KM START / KM END columns."""
+    if not {"KM START", "KM END"} <= set(segment_df.columns):
+        logger.warning("⚠️ Segments have no KM START / KM END, main line detectors are spaced from each edge start")
+        return None
+    xy, offsets = pack_coordinates([parse_coordinates(v) for v in segment_df['_coordinates']])
+    return LinearReferenceIndex.from_segments(segment_df, xy, offsets)
+
+def write_additionals(path, stops: pd.DataFrame, detectors: pd.DataFrame, config: PipelineConfig) -> int:
+    """Stream train stops and induction loops into a SUMO .add.xml file in one pass."""
+    with XmlStreamWriter(path, "additional") as xml:
+        for stop_id, lane, length, station, lines in zip(stops['id'], stops['lane'], stops['length'],
+                                                          stops['station'], stops['lines']):
+            xml.element("trainStop", id=stop_id, lane=lane, startPos=0.0, endPos=length, name=station,
+                        lines=lines or None, friendlyPos="true")
+        for detector_id, lane, pos in zip(detectors['id'], detectors['lane'], detectors['pos']):
+            xml.element("inductionLoop", id=detector_id, lane=lane, pos=pos, period=config.detector_period,
+                        file=DETECTOR_OUTPUT_FILE, friendlyPos="true")
+        return xml.count
+
+def run(debug=False, config: PipelineConfig = None):
+    config = config or default_config()
+    logger = setup_logger(debug)
+    logger.info("🚀 Stage 05 started: Generate stops and detectors")
+
+    segment_df = pd.read_csv(FILTERED_SUB_NETWORK_POLYGON_FILE, delimiter=';')
+    station_df = pd.read_csv(STATION_HELPER_FILE, delimiter=';')
+    entries = parse_entry_nodes(station_df, logger)
+    edges = edge_table(SUMO_EDGES_FILE, SUMO_NODES_FILE)
+    logger.info(f"🔎 {len(edges)} edges, {len(entries)} entry nodes")
+
+    # 🚉 Her peron kenarında bir trainStop; 📏 ana hatta KM işaretlerinde ve istasyon girişlerinde dedektör
+    stops = train_stops(station_df, entries, edges)
+    main = main_line_edge_table(entries, edges)
+    detectors = main_line_detectors(main, chainage_index(segment_df, logger), config)
+
+    count = write_additionals(SUMO_ADDITIONALS_FILE, stops, detectors, config)
+    per_kind = detectors['kind'].value_counts().to_dict()
+    logger.info(f"✅ Saved {count} additionals ({len(stops)} train stops, detectors {per_kind}) "
+                f"to: {SUMO_ADDITIONALS_FILE.resolve()}")
+
+    # ------------------------
+    # ✅ Final Validation Layer
+    # ------------------------
+    without_stops = set(station_df.loc[station_df['platform_count'].fillna(0) > 0, 'station']) - set(stops['station'])
+    if without_stops:
+        logger.warning(f"⚠️ Stations with platforms but no platform edges in the network: {sorted(without_stops)}")
+    else:
+        logger.info("✅ Every station with platforms has train stops")
+    logger.info("✅ STAGE 05 complete.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stage 05: write SUMO train stops and detectors.")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+    run(debug=args.debug)
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+from utils.additionals import line_spacing, train_stops, main_line_edge_table, main_line_detectors
+from utils.config import default_config
+from utils.linear_referencing import LinearReferenceIndex
+
+ENTRIES = pd.DataFrame({"station": ["A", "B"], "connected_station": ["B", "A"], "line": [710, 710]})
+EDGES = pd.DataFrame({
+    "id": ["main_A_B", "main_B_A", "A_track_1_west_to_east", "A_track_1_east_to_west"],
+    "length": [3000.0, 3000.0, 400.0, 400.0],
+    "start_x": [1000.0, 4000.0, 0.0, 0.0], "start_y": [0.0] * 4,
+    "end_x": [4000.0, 1000.0, 0.0, 0.0], "end_y": [0.0] * 4,
+})
+
+def test_line_spacing_uses_per_line_overrides():
+    config = default_config().replace(detector_spacing=2000.0, detector_spacing_by_line={"710": 500})
+    assert line_spacing([710, 100], config).tolist() == [500.0, 2000.0]
+
+def test_train_stops_cover_platform_edges_in_the_network():
+    stations = pd.DataFrame({"station": ["A", "B"], "platform_count": [1, 2]})
+    stops = train_stops(stations, ENTRIES, EDGES)
+    assert stops['id'].tolist() == ["A_track_1_west_to_east_stop", "A_track_1_east_to_west_stop"]
+    assert stops['lane'].tolist()[0] == "A_track_1_west_to_east_0"
+    assert stops['length'].tolist() == [400.0, 400.0] and stops['lines'].tolist() == ["710", "710"]
+
+def test_detectors_sit_on_chainage_marks_in_both_directions():
+    # Linie 710: km 0 at x=0, km 5 at x=5000
+    segment_df = pd.DataFrame({"Linie": [710], "KM START": [0.0], "KM END": [5.0]})
+    index = LinearReferenceIndex.from_segments(segment_df, np.array([[0.0, 0.0], [5000.0, 0.0]]), np.array([0, 2]))
+    config = default_config().replace(detector_spacing=1000.0, entry_detector_offset=50.0)
+    detectors = main_line_detectors(main_line_edge_table(ENTRIES, EDGES), index, config)
+    forward = detectors[detectors['lane'] == "main_A_B_0"]
+    assert forward['id'].tolist() == ["e1_main_A_B_km2.000", "e1_main_A_B_km3.000", "e1_entry_main_A_B"]
+    assert np.allclose(forward['pos'], [1000.0, 2000.0, 2950.0])
+    backward = detectors[detectors['lane'] == "main_B_A_0"]
+    assert np.allclose(backward['pos'], [1000.0, 2000.0, 2950.0])
+    assert backward['id'].tolist()[0] == "e1_main_B_A_km3.000"
+
+def test_detectors_without_chainage_are_spaced_from_edge_start():
+    config = default_config().replace(detector_spacing=1000.0)
+    detectors = main_line_detectors(main_line_edge_table(ENTRIES, EDGES), None, config)
+    assert np.allclose(detectors.loc[detectors['kind'] == "line", 'pos'], [1000.0, 2000.0] * 2)
@@ -0,0 +1,68 @@
+import pandas as pd
+from utils.checkpoint_ops import (
+    PartitionStore, checkpoint_key, load_checkpoint, save_checkpoint, row_hashes, partition_fingerprints,
+    load_partitions, save_partitions, stale_partitions, merge_partitions
+)
+
+FRAME = pd.DataFrame({"START_OP": ["A", "B"], "END_OP": ["B", "C"], "KM START": [0.0, 1.5]})
+
+def test_key_changes_with_rows_and_config():
+    key = checkpoint_key(FRAME, {"CLOSENESS_THRESHOLD": 100})
+    assert key == checkpoint_key(FRAME.copy(), {"CLOSENESS_THRESHOLD": 100})
+    assert key != checkpoint_key(FRAME, {"CLOSENESS_THRESHOLD": 200})
+    assert key != checkpoint_key(FRAME.iloc[::-1], {"CLOSENESS_THRESHOLD": 100})
+
+def test_save_load_and_replace_stale(tmp_path):
+    old_key = checkpoint_key(FRAME, {"a": 1})
+    new_key = checkpoint_key(FRAME, {"a": 2})
+    save_checkpoint(tmp_path, "line_10", old_key, FRAME)
+    save_checkpoint(tmp_path, "line_100", old_key, FRAME)
+    save_checkpoint(tmp_path, "line_10", new_key, FRAME.head(1))
+
+    assert load_checkpoint(tmp_path, "line_10", old_key) is None
+    pd.testing.assert_frame_equal(load_checkpoint(tmp_path, "line_10", new_key), FRAME.head(1))
+    assert load_checkpoint(tmp_path, "line_100", old_key) is not None
+
+def test_partition_fingerprints_follow_their_own_rows():
+    hashes = row_hashes(FRAME)
+    # Segment A-B feeds A and B, segment B-C feeds B and C
+    stations, rows = ["A", "B", "B", "C"], [0, 0, 1, 1]
+    before = partition_fingerprints(stations, hashes[rows], {"a": 1})
+    changed = FRAME.assign(**{"KM START": [0.0, 2.0]})
+    after = partition_fingerprints(stations, row_hashes(changed)[rows], {"a": 1})
+    assert list(before.index) == ["A", "B", "C"]
+    assert list(stale_partitions(before, after)) == ["B", "C"]
+    assert list(stale_partitions(before, partition_fingerprints(stations, hashes[rows], {"a": 2}))) == ["A", "B", "C"]
+    assert list(stale_partitions(pd.Series(dtype=object), before)) == ["A", "B", "C"]
+
+def test_merge_partitions_replaces_rebuilt_and_drops_removed(tmp_path):
+    fingerprints = pd.Series(["1", "2", "3"], index=["A", "B", "C"])
+    stored = pd.DataFrame({"partition": ["A", "A", "B", "D"], "value": [1, 2, 3, 4]})
+    save_partitions(tmp_path / "store.pkl", fingerprints, {"rows": stored})
+    loaded_fingerprints, tables = load_partitions(tmp_path / "store.pkl")
+    pd.testing.assert_series_equal(loaded_fingerprints, fingerprints)
+
+    fresh = pd.DataFrame({"partition": ["C", "B"], "value": [30, 20]})
+    merged = merge_partitions(tables["rows"], fresh, fingerprints, pd.Index(["B", "C"]))
+    assert merged['partition'].tolist() == ["A", "A", "B", "C"]
+    assert merged['value'].tolist() == [1, 2, 20, 30]
+    assert load_partitions(tmp_path / "missing.pkl")[1] == {}
+
+def test_partition_store_keeps_partitions_in_stable_buckets(tmp_path):
+    store = PartitionStore(tmp_path / "store", buckets=4)
+    names = ["station:A", "station:B", "main:A|B"]
+    buckets = store.bucket_of(names)
+    assert buckets.tolist() == PartitionStore(tmp_path, buckets=4).bucket_of(names).tolist()
+    assert store.fingerprints().empty and store.load_bucket(0) == {}
+
+    fingerprints = pd.Series(["1", "2", "3"], index=names)
+    for bucket in set(buckets.tolist()):
+        rows = pd.DataFrame({"partition": [n for n, b in zip(names, buckets) if b == bucket]})
+        store.save_bucket(bucket, {"rows": rows})
+    store.save_fingerprints(fingerprints)
+    pd.testing.assert_series_equal(store.fingerprints(), fingerprints)
+
+    # Kayıp bucket dosyası: içindeki bölümler yeniden üretilmek üzere listeden düşer
+    (tmp_path / "store" / f"bucket_{buckets[0]:04d}.pkl").unlink()
+    assert "station:A" not in store.fingerprints().index
+    assert PartitionStore(tmp_path / "store", buckets=8).fingerprints().empty
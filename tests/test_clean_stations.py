@@ -0,0 +1,40 @@
+import pandas as pd
+import stages.stage_01_clean_stations as stage_01
+from utils.config import default_config
+
+def shape(*points):
+    return str({"type": "LineString", "coordinates": [list(p) for p in points]})
+
+POLYGONS = pd.DataFrame({
+    "Linie": [100, 100, 200],
+    "START_OP": ["A", "B", "C"],
+    "END_OP": ["B", "C", "D"],
+    "KM START": [0.0, 10.0, 0.0],
+    "KM END": [10.0, 20.0, 10.0],
+    "Geo shape": [shape((7.0, 47.0), (7.1, 47.0)), shape((7.1, 47.0), (7.2, 47.0)), shape((8.0, 47.0), (8.1, 47.0))],
+})
+
+def test_resumed_run_only_cleans_missing_lines(tmp_path, monkeypatch):
+    polygon_file, output_file = tmp_path / "polygons.csv", tmp_path / "filtered.csv"
+    checkpoint_dir = tmp_path / "checkpoints"
+    POLYGONS.to_csv(polygon_file, sep=';', index=False)
+    monkeypatch.setattr(stage_01, "POLYGON_FILE", polygon_file)
+    monkeypatch.setattr(stage_01, "FILTERED_SUB_NETWORK_POLYGON_FILE", output_file)
+    monkeypatch.setattr(stage_01, "STAGE_01_CHECKPOINT_DIR", checkpoint_dir)
+    monkeypatch.setattr(stage_01, "PROCESSED_DIR", tmp_path)
+    config = default_config().replace(line_id_list=[100, 200])
+
+    stage_01.run(config=config)
+    full = pd.read_csv(output_file, sep=';', encoding='utf-8-sig')
+    assert sorted(p.name.split('_')[1] for p in checkpoint_dir.glob("line_*.pkl")) == ["100", "200"]
+
+    # Yarıda kalmış çalıştırma: Linie 200'ün checkpoint'i yok
+    next(checkpoint_dir.glob("line_200_*.pkl")).unlink()
+    cleaned = []
+    process_line = stage_01.process_line
+    monkeypatch.setattr(stage_01, "process_line",
+                        lambda segment_df, config: cleaned.append(segment_df['Linie'].iloc[0]) or
+                        process_line(segment_df, config))
+    stage_01.run(config=config)
+    assert cleaned == [200]
+    pd.testing.assert_frame_equal(pd.read_csv(output_file, sep=';', encoding='utf-8-sig'), full)
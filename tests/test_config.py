@@ -0,0 +1,53 @@
+import pytest
+from utils.config import PipelineConfig, default_config, load_config
+from utils.constants import CLOSENESS_THRESHOLD, LINE_ID_LIST
+
+def test_default_config_matches_constants():
+    config = default_config()
+    assert config.closeness_threshold == CLOSENESS_THRESHOLD
+    assert config.line_id_list == tuple(LINE_ID_LIST)
+    assert config.value("CLOSENESS_THRESHOLD") == CLOSENESS_THRESHOLD
+
+def test_config_is_frozen_and_hashable():
+    config = default_config()
+    with pytest.raises(Exception):
+        config.max_platform_length = 1
+    other = config.replace(max_platform_length=800)
+    assert other.closeness_threshold == config.closeness_threshold + 100
+    assert len({config, default_config(), other}) == 2
+    assert config.fingerprint() != other.fingerprint()
+
+def test_load_toml_config(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text('PLATFORM_LENGTH_DECISION_METHOD = "N"\nnever_skip_list = ["ZUE"]\n')
+    config = load_config(path)
+    assert config.platform_length_decision_method == "N"
+    assert config.never_skip_list == ("ZUE",)
+    assert config.max_platform_length == default_config().max_platform_length
+
+def test_unknown_config_key_is_rejected(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text('MAX_PLATFROM_LENGTH = 1\n')
+    with pytest.raises(ValueError):
+        load_config(path)
+
+def test_explicit_threshold_survives_replace(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text('CLOSENESS_THRESHOLD = 900\n')
+    config = load_config(path)
+    assert config.closeness_threshold == 900
+    other = config.replace(raster_width=100, max_platform_length=800)
+    assert other.closeness_threshold == 900
+    assert other.fingerprint() == config.replace(raster_width=100, max_platform_length=800).fingerprint()
+
+def test_derived_threshold_follows_replace():
+    config = default_config().replace(raster_width=100)
+    assert config.closeness_threshold == CLOSENESS_THRESHOLD
+    assert config.replace(entry_offset_buffer=600).closeness_threshold == CLOSENESS_THRESHOLD + 200
+
+def test_hand_edited_constant_threshold_is_kept(monkeypatch, tmp_path):
+    import utils.constants as constants
+    monkeypatch.setattr(constants, "CLOSENESS_THRESHOLD", 1234)
+    path = tmp_path / "config.toml"
+    path.write_text('RASTER_WIDTH = 100\n')
+    assert load_config(path).closeness_threshold == 1234
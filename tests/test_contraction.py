@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+from utils.contraction import CACHE_FORMAT, ContractionHierarchy, network_hash
+from utils.graph_ops import build_csr, dijkstra
+from utils.routing import RoutingGraph
+
+def random_graph(n=120, seed=3):
+    rng = np.random.default_rng(seed)
+    src = np.concatenate([np.arange(n - 1), np.arange(1, n), rng.integers(0, n, n // 2)])
+    dst = np.concatenate([np.arange(1, n), np.arange(n - 1), rng.integers(0, n, n // 2)])
+    return build_csr(src, dst, rng.uniform(1, 10, len(src)), n + 1, directed=True)
+
+def test_queries_match_dijkstra():
+    csr = random_graph()
+    hierarchy = ContractionHierarchy.build(csr)
+    weights = {}
+    for u in range(len(csr[0]) - 1):
+        for k in range(csr[0][u], csr[0][u + 1]):
+            weights[(u, int(csr[1][k]))] = min(csr[2][k], weights.get((u, int(csr[1][k])), np.inf))
+    rng = np.random.default_rng(0)
+    for source, target in rng.integers(0, 120, size=(60, 2)).tolist():
+        distances, _ = dijkstra(*csr, source, target=target)
+        distance, path = hierarchy.query(source, target)
+        assert np.isclose(distance, distances[target])
+        # The unpacked path uses original edges only and has the same cost
+        assert np.isclose(sum(weights[edge] for edge in zip(path[:-1], path[1:])), distance)
+    # Node 120 has no edges at all
+    assert hierarchy.query(0, 120) == (np.inf, None)
+
+def test_hierarchy_is_stored_per_network_hash(tmp_path):
+    csr = random_graph(30)
+    key = network_hash(["e"] * 31, csr)
+    built = ContractionHierarchy.load_or_build(csr, key, tmp_path)
+    assert len(list(tmp_path.glob("ch_*.npz"))) == 1
+    loaded = ContractionHierarchy.load_or_build(csr, key, tmp_path)
+    assert loaded.query(0, 29) == built.query(0, 29)
+    # Ağlar arasında gidip gelmek: her ağın dosyası kalır, eski format ve en eski dosya silinir
+    (tmp_path / "ch_v0_0123456789abcdef.npz").write_bytes(b"")
+    other = random_graph(30, seed=4)
+    other_key = network_hash(["e"] * 31, other)
+    ContractionHierarchy.load_or_build(other, other_key, tmp_path)
+    assert len(list(tmp_path.glob("ch_*.npz"))) == 2
+    ContractionHierarchy.load_or_build(csr, key, tmp_path)
+    third = random_graph(30, seed=5)
+    ContractionHierarchy.load_or_build(third, network_hash(["e"] * 31, third), tmp_path, max_files=2)
+    assert sorted(p.name for p in tmp_path.glob("ch_*.npz")) == sorted(
+        f"ch_v{CACHE_FORMAT}_{k[:16]}.npz" for k in (key, network_hash(["e"] * 31, third)))
+
+def test_routing_graph_with_contraction(tmp_path):
+    edges = ["a", "b", "c", "d"]
+    connections = pd.DataFrame([("a", "b"), ("b", "c"), ("a", "d"), ("d", "c")], columns=["from", "to"])
+    graph = RoutingGraph(edges, [1.0, 5.0, 1.0, 2.0], connections)
+    graph.use_contraction(tmp_path)
+    assert graph.route_many([["a", "c"], ["c", "a"]]) == [["a", "d", "c"], None]
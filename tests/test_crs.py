@@ -0,0 +1,30 @@
+import numpy as np
+from utils.crs import get_transformer, pack_coordinates, unpack_coordinates, to_wgs84, artifact_wgs84
+
+LINES = [[[2600000, 1200000], [2600100, 1200050]], [], [[2683000, 1248000, 400.0]]]
+
+def test_pack_and_unpack_roundtrip():
+    xy, offsets = pack_coordinates(LINES)
+    assert offsets.tolist() == [0, 2, 2, 3]
+    parts = unpack_coordinates(xy, offsets)
+    assert parts[1].shape == (0, 2)
+    assert parts[2].tolist() == [[2683000, 1248000]]
+
+def test_to_wgs84_matches_per_point_transform():
+    xy, _ = pack_coordinates(LINES)
+    latlon = to_wgs84(xy)
+    lon, lat = get_transformer().transform(2600000, 1200000)
+    assert np.allclose(latlon[0], [lat, lon])
+    assert get_transformer() is get_transformer()
+
+def test_artifact_cache_is_keyed_by_content(tmp_path):
+    path = tmp_path / "segments.csv"
+    path.write_text('Linie;Geo shape\n1;"{\'coordinates\': [[2600000, 1200000], [2600100, 1200050]]}"\n2;bad\n')
+    latlon, offsets = artifact_wgs84(path, cache_dir=tmp_path / "cache")
+    assert offsets.tolist() == [0, 2, 2]
+    assert len(list((tmp_path / "cache").glob("*.npz"))) == 1
+
+    path.write_text('Linie;Geo shape\n1;"{\'coordinates\': [[2600000, 1200000]]}"\n')
+    latlon, offsets = artifact_wgs84(path, cache_dir=tmp_path / "cache")
+    assert offsets.tolist() == [0, 1]
+    assert len(list((tmp_path / "cache").glob("*.npz"))) == 1
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+from utils.csv_profile import (distinct_sketch, estimate_distinct, format_profile, merge_sketches,
+                               profile_directory, split_blocks)
+
+def write_csv(path, rows):
+    df = pd.DataFrame({
+        "Linie": np.arange(rows) % 7,
+        "KM": np.where(np.arange(rows) % 10 == 0, np.nan, np.arange(rows) * 0.5),
+        "Name": [f"S{i}" for i in range(rows)],
+        "Geo shape": ["{'coordinates': [[0, 0], [1, 1]]}"] * rows,
+    })
+    df.to_csv(path, sep=';', index=False)
+    return df
+
+def test_blocks_end_on_line_breaks(tmp_path):
+    write_csv(tmp_path / "a.csv", 500)
+    data = (tmp_path / "a.csv").read_bytes()
+    blocks = split_blocks(tmp_path / "a.csv", block_bytes=1000)
+    assert len(blocks) > 5 and blocks[-1][1] == len(data)
+    assert all(data[end - 1:end] == b'\n' for _, end in blocks)
+    assert all(a[1] == b[0] for a, b in zip(blocks, blocks[1:]))
+
+def test_profile_matches_full_read(tmp_path):
+    write_csv(tmp_path / "a.csv", 3000)
+    full, = profile_directory(tmp_path, block_bytes=4096)
+    parallel, = profile_directory(tmp_path, jobs=2, block_bytes=4096)
+    assert full == parallel
+    columns = {c["column"]: c for c in full["columns"]}
+    assert full["rows"] == 3000
+    assert columns["Linie"]["type"] == "integer" and columns["Linie"]["distinct_approx"] == 7
+    assert columns["KM"]["null_rate"] == 0.1 and columns["KM"]["max"] == 1499.5
+    assert columns["Name"]["type"] == "string"
+    assert columns["Geo shape"]["type"] == "geometry" and columns["Geo shape"]["chars_max"] == 33
+
+    sampled, = profile_directory(tmp_path, sample=0.3, block_bytes=4096)
+    assert sampled["rows"] == 3000 and sampled["profiled_rows"] < 3000
+
+def test_distinct_sketch_estimate():
+    a = distinct_sketch(pd.Series(np.arange(50_000).astype(str)))
+    b = distinct_sketch(pd.Series(np.arange(25_000, 100_000).astype(str)))
+    assert abs(estimate_distinct(merge_sketches(a, b)) - 100_000) < 10_000
+
+def test_unreadable_file_is_reported_without_aborting(tmp_path):
+    write_csv(tmp_path / "a.csv", 100)
+    (tmp_path / "b.csv").write_bytes(b"Linie;Name\n1;Z\xffrich\n")
+    good, bad = profile_directory(tmp_path)
+    assert good["rows"] == 100 and "error" not in good
+    assert bad["file_name"] == "b.csv" and "UnicodeDecodeError" in bad["error"]
+    assert format_profile(bad).startswith("❌ Error reading file")
@@ -0,0 +1,55 @@
+import json
+import pandas as pd
+import pytest
+import utils.diagnostic_checks  # noqa: F401
+from utils.config import default_config
+from utils.diagnostics import CHECKS, DiagnosticsContext, register_check, run_checks, write_html_report, write_json_report
+
+SHAPE = '{\'coordinates\': [[0, 0], [300, 400]]}'
+
+@pytest.fixture
+def context(tmp_path):
+    segments = pd.DataFrame({
+        "Linie": [100, 100, 200], "START_OP": ["A", "B", "B"], "END_OP": ["B", "A", "C"],
+        "KM START": [0.0, 0.0, 1.0], "KM END": [1.0, 1.0, 2.0],
+        "polygon_length": [500.0, 500.0, 40.0], "Geo shape": [SHAPE, SHAPE, SHAPE],
+    })
+    segments.to_csv(tmp_path / "segments.csv", sep=';', index=False)
+    pd.concat([segments, segments.iloc[[2]]]).to_csv(tmp_path / "raw.csv", sep=';', index=False)
+    return DiagnosticsContext(paths={"segments": tmp_path / "segments.csv", "raw_segments": tmp_path / "raw.csv",
+                                     "platforms": tmp_path / "missing.csv"},
+                              config=default_config().replace(line_id_list=[100, 200]))
+
+def test_checks_share_tables_and_report(context, tmp_path):
+    results = {r["name"]: r for r in run_checks(context)}
+    assert results["perronkante_stats"]["status"] == "skipped"
+    assert results["multi_segment_station_pairs"]["summary"]["pairs_with_several_segments"] == 1
+    assert results["duplicate_segments"]["summary"]["raw_segments_duplicate_rows"] == 2
+    # Stored length 40 m vs. 500 m geometry is reported
+    assert results["polygon_length_distribution"]["summary"]["geometry_length_mismatches"] == 1
+    assert context.table("segments") is context.table("segments")
+
+    write_json_report(tmp_path / "report.json", list(results.values()))
+    write_html_report(tmp_path / "report.html", list(results.values()))
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert len(report["checks"]) == len(CHECKS)
+    assert "Station pairs" in (tmp_path / "report.html").read_text()
+
+def test_failing_check_is_isolated(context):
+    with pytest.raises(KeyError):
+        run_checks(context, ["no_such_check"])
+
+    @register_check("_always_fails", "Fails", tables=["segments"])
+    def always_fails(ctx):
+        raise RuntimeError("boom")
+    try:
+        result, = run_checks(context, ["_always_fails"])
+        assert result["status"] == "error" and "boom" in result["warnings"][0]
+    finally:
+        CHECKS.pop("_always_fails")
+
+def test_checks_follow_the_context_config(context):
+    context.config = default_config().replace(closeness_threshold=100.0)
+    result, = run_checks(context, ["polygon_length_distribution"])
+    assert result["summary"]["below_closeness_threshold"] == 1
+    assert "(100.0 m)" in result["warnings"][-1]
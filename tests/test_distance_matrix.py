@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+from stages.generate_distance_matrix import (
+    build_adjacency_matrix, iter_long_pairs, write_long_matrix, write_matrix_index
+)
+
+# A - B - C on a line (100 m apart), D 300 m from C and not connected
+STATIONS = pd.DataFrame({
+    "station": ["A", "B", "C", "D"],
+    "connected_stations": [
+        "{'West': set(), 'East': {'B'}}",
+        "{'West': {'A'}, 'East': {'C'}}",
+        "{'West': {'B'}, 'East': set()}",
+        None,
+    ],
+})
+POSITIONS = np.array([0.0, 100.0, 200.0, 500.0])
+DISTANCES = np.abs(POSITIONS[:, None] - POSITIONS[None, :])
+
+def test_adjacency_matrix_from_connected_stations(tmp_path):
+    adjacency = build_adjacency_matrix(STATIONS, tmp_path / "adjacency.npy")
+    assert adjacency.dtype == np.bool_
+    assert adjacency[0, 1] and adjacency[1, 0] and adjacency[1, 2] and adjacency[2, 1]
+    assert not adjacency[0, 2] and not adjacency[2, 3] and not adjacency[3].any()
+
+def test_long_pairs_are_chunked_and_cut_off(tmp_path):
+    adjacency = build_adjacency_matrix(STATIONS, tmp_path / "adjacency.npy")
+    chunks = list(iter_long_pairs(DISTANCES, adjacency, chunk_rows=1))
+    # 6 çift, 3 satır bloğunda (son satırın üst üçgeni boş)
+    assert [len(chunk) for chunk in chunks] == [3, 2, 1]
+    pairs = pd.concat(chunks)
+    assert (pairs['station_1_id'] < pairs['station_2_id']).all()
+    assert pairs['station_1_id'].dtype == np.int32 and pairs['station_2_id'].dtype == np.int32
+
+    close = pd.concat(iter_long_pairs(DISTANCES, adjacency, cutoff=250.0, chunk_rows=2))
+    assert sorted(zip(close['station_1_id'], close['station_2_id'])) == [(0, 1), (0, 2), (1, 2)]
+
+def test_long_matrix_flags_close_unconnected_pairs(tmp_path):
+    adjacency = build_adjacency_matrix(STATIONS, tmp_path / "adjacency.npy")
+    write_matrix_index(tmp_path / "index.csv", STATIONS['station'])
+    pair_count, flagged_count = write_long_matrix(
+        DISTANCES, adjacency, STATIONS['station'], tmp_path / "long.csv", tmp_path / "close.csv",
+        threshold=250.0, cutoff=400.0, chunk_rows=2
+    )
+    long_df = pd.read_csv(tmp_path / "long.csv")
+    assert pair_count == len(long_df) == 4  # A–D (500 m) and B–D (400 m) are cut off
+    connected = {(a, b) for a, b, c in zip(long_df['station_1_id'], long_df['station_2_id'], long_df['connected']) if c}
+    assert connected == {(0, 1), (1, 2)}
+
+    # Integer ids resolve through the lookup table
+    index_df = pd.read_csv(tmp_path / "index.csv", delimiter=';', encoding='utf-8-sig')
+    names = dict(zip(index_df['station_id'], index_df['station']))
+    assert {(names[a], names[b]) for a, b in connected} == {("A", "B"), ("B", "C")}
+
+    close_df = pd.read_csv(tmp_path / "close.csv")
+    assert flagged_count == 1
+    assert close_df[['station_1', 'station_2']].values.tolist() == [["A", "C"]]
@@ -0,0 +1,37 @@
+import numpy as np
+from utils.crs import pack_coordinates
+from utils.duplicate_ops import find_duplicate_geometry, geometry_fingerprints
+from utils.geometry_ops import interpolate_along, resample_fractions
+
+BASE = [[2600000.0 + x, 1200000.0 + 0.001 * x * x] for x in range(0, 1001, 50)]
+
+def lines():
+    densified = np.array([[2600000.0 + x, 1200000.0 + 0.001 * x * x] for x in range(0, 1001, 10)])
+    return [
+        BASE,                                        # 0
+        (densified[::-1] + [0.8, -0.6]).tolist(),    # 1: same track, reversed, other vertices, shifted < 1 m
+        BASE[:11] + [[2600600.0, 1200100.0]],        # 2: first half of 0, then leaves
+        [[x, y + 50.0] for x, y in BASE],            # 3: parallel track 50 m away
+        [BASE[-1], [2601500.0, 1201000.0]],          # 4: continues 0
+        [],
+    ]
+
+def test_interpolation_and_resampling():
+    xy, offsets = pack_coordinates([[[0, 0], [10, 0], [10, 10]], [], [[5, 5]]])
+    points = interpolate_along(xy, offsets, np.array([0, 0, 0, 1, 2]), np.array([0.0, 15.0, 99.0, 0.0, 3.0]))
+    assert points[:3].tolist() == [[0, 0], [10, 5], [10, 10]]
+    assert np.isnan(points[3]).all() and points[4].tolist() == [5, 5]
+    assert resample_fractions(xy, offsets, 3)[0].tolist() == [[0, 0], [10, 0], [10, 10]]
+
+def test_fingerprint_is_orientation_independent():
+    xy, offsets = pack_coordinates([BASE, BASE[::-1]])
+    fingerprints, reverse = geometry_fingerprints(xy, offsets, grid=10.0)
+    assert fingerprints[0] == fingerprints[1] and reverse.tolist() == [False, True]
+
+def test_find_duplicates_and_overlaps():
+    xy, offsets = pack_coordinates(lines())
+    pairs = find_duplicate_geometry(xy, offsets, grid=10.0, tolerance=5.0, min_overlap_share=0.5)
+    found = {(a, b): kind for a, b, kind in zip(pairs['a'], pairs['b'], pairs['kind'])}
+    assert found[(0, 1)] == "duplicate" and pairs.loc[0, 'reversed']
+    assert found[(0, 2)] == "overlap" and found[(1, 2)] == "overlap"
+    assert not any(3 in pair or 4 in pair for pair in found)
@@ -0,0 +1,66 @@
+import numpy as np
+from utils.geometry_ops import (
+    point_segment_distances, douglas_peucker_mask, simplify_buffer_mask, compact_offsets, polyline_lengths,
+    offset_polylines, trim_polylines, select_polylines
+)
+
+def wiggly_line(n=500):
+    x = np.linspace(0, 5000, n)
+    return np.column_stack([x, 3.0 * np.sin(x / 40.0)])
+
+def test_point_segment_distance_is_clamped():
+    points = np.array([[5.0, 2.0], [-3.0, 4.0]])
+    d = point_segment_distances(points, np.array([0.0, 0.0]), np.array([10.0, 0.0]))
+    assert np.allclose(d, [2.0, 5.0])
+
+def test_douglas_peucker_respects_tolerance():
+    xy = wiggly_line()
+    mask = douglas_peucker_mask(xy, tolerance=1.0)
+    assert mask[0] and mask[-1]
+    assert 2 < mask.sum() < len(xy)
+    kept = np.flatnonzero(mask)
+    for a, b in zip(kept[:-1], kept[1:]):
+        if b - a > 1:
+            assert point_segment_distances(xy[a + 1:b], xy[a], xy[b]).max() <= 1.0
+
+def test_forced_vertices_are_kept():
+    xy = np.column_stack([np.linspace(0, 100, 11), np.zeros(11)])
+    keep = np.zeros(11, dtype=bool)
+    keep[4] = True
+    assert np.flatnonzero(douglas_peucker_mask(xy, 1.0, keep)).tolist() == [0, 4, 10]
+
+def test_buffer_mask_and_offsets():
+    xy = np.vstack([wiggly_line(50), wiggly_line(30)])
+    offsets = np.array([0, 50, 50, 80])
+    mask = simplify_buffer_mask(xy, offsets, 100.0)
+    assert np.flatnonzero(mask).tolist() == [0, 49, 50, 79]
+    assert compact_offsets(mask, offsets).tolist() == [0, 2, 2, 4]
+
+def test_polyline_lengths_skip_gaps_between_lines():
+    xy = np.array([[0.0, 0.0], [3.0, 4.0], [100.0, 100.0], [100.0, 110.0], [500.0, 500.0]])
+    offsets = np.array([0, 2, 4, 4, 5])
+    assert np.allclose(polyline_lengths(xy, offsets), [5.0, 10.0, 0.0, 0.0])
+
+def test_parallel_mask_matches_serial():
+    xy = np.vstack([wiggly_line(40) + [0, i] for i in range(12)])
+    offsets = np.arange(0, 40 * 12 + 1, 40)
+    serial = simplify_buffer_mask(xy, offsets, 0.5)
+    assert np.array_equal(simplify_buffer_mask(xy, offsets, 0.5, jobs=2, chunk_size=5), serial)
+
+def test_offset_polylines_miter_and_bevel():
+    xy = np.array([[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [0.0, 0.0], [10.0, 0.0], [10.0, 0.0], [0.0, 0.1]])
+    points, offsets = offset_polylines(xy, np.array([0, 3, 7]), np.array([1.0, -1.0]))
+    # Left turn, offset to the left: inner miter corner
+    assert np.allclose(points[:3], [[0, 1], [9, 1], [9, 10]])
+    # Hairpin offset to the right: repeated vertex dropped, the corner is bevelled into two points
+    assert offsets.tolist() == [0, 3, 7]
+    assert np.allclose(points[4], [10, -1]) and np.allclose(points[5], [10, 1], atol=0.01)
+
+def test_trim_and_select_polylines():
+    xy = np.array([[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [0.0, 0.0], [4.0, 0.0]])
+    points, offsets = trim_polylines(xy, np.array([0, 3, 5]), np.array([5.0, 1.0]), np.array([15.0, 2.0]))
+    assert offsets.tolist() == [0, 3, 5]
+    assert np.allclose(points, [[5, 0], [10, 0], [10, 5], [1, 0], [2, 0]])
+    picked, picked_offsets = select_polylines(xy, np.array([0, 3, 5]), np.array([1, 0, 1]))
+    assert picked_offsets.tolist() == [0, 2, 5, 7]
+    assert np.allclose(picked[2:5], xy[:3])
@@ -0,0 +1,29 @@
+import numpy as np
+from utils.graph_ops import build_csr, dijkstra, reconstruct_path, multi_source_dijkstra
+
+def _chain_graph():
+    # 0 - 1 - 2 - 3 with a long shortcut 0 - 3
+    return build_csr([0, 1, 2, 0], [1, 2, 3, 3], [1.0, 2.0, 3.0, 10.0], 4)
+
+def test_build_csr_undirected():
+    indptr, indices, data = _chain_graph()
+    assert indptr.tolist() == [0, 2, 4, 6, 8]
+    assert sorted(indices[indptr[3]:indptr[4]].tolist()) == [0, 2]
+
+def test_dijkstra_and_path():
+    indptr, indices, data = _chain_graph()
+    dist, pred = dijkstra(indptr, indices, data, 0)
+    assert dist.tolist() == [0.0, 1.0, 3.0, 6.0]
+    assert reconstruct_path(pred, 0, 3) == [0, 1, 2, 3]
+
+def test_unreachable_node():
+    indptr, indices, data = build_csr([0], [1], [5.0], 3)
+    dist, pred = dijkstra(indptr, indices, data, 0)
+    assert np.isinf(dist[2])
+    assert reconstruct_path(pred, 0, 2) == []
+
+def test_multi_source_in_process():
+    indptr, indices, data = _chain_graph()
+    blocks = list(multi_source_dijkstra(indptr, indices, data, [0, 3], jobs=1, block_size=1))
+    assert [start for start, _, _ in blocks] == [0, 1]
+    assert blocks[1][1][0].tolist() == [6.0, 5.0, 3.0, 0.0]
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+from utils.crs import pack_coordinates
+from utils.linear_referencing import LinearReferenceIndex
+
+# Line 1: A → B (km 10.0 → 11.0) and B → C drawn against the chainage (km 12.0 → 11.0); line 2 crosses it
+SEGMENTS = pd.DataFrame({"Linie": [1, 1, 2], "START_OP": ["A", "C", "X"], "END_OP": ["B", "B", "Y"],
+                         "KM START": [10.0, 12.0, 0.0], "KM END": [11.0, 11.0, 0.2]})
+COORDS = [[[0, 0], [500, 0], [1000, 0]], [[1000, 1000], [1000, 0]], [[600, -100], [600, 100]]]
+
+def index():
+    return LinearReferenceIndex.from_segments(SEGMENTS, *pack_coordinates(COORDS))
+
+def test_locate_is_calibrated_per_segment():
+    points = index().locate([1, 1, 1, 2, 1, 3], [10.25, 11.0, 11.5, 0.1, 12.5, 1.0])
+    assert np.allclose(points[:4], [[250, 0], [1000, 0], [1000, 500], [600, 0]])
+    assert np.isnan(points[4:]).all()
+    assert index().line_range(1) == (10.0, 12.0)
+
+def test_project_inverts_locate():
+    idx = index()
+    result = idx.project([[250, 3], [998, 600], [601, 3], [5000, 5000]])
+    assert result['line'].tolist()[:3] == [1, 1, 2] and result['line'][3] is None
+    assert np.allclose(result['km'][:3], [10.25, 11.6, 0.103])
+    assert np.allclose(result['distance'][:3], [3, 2, 1])
+    # Restricting to line 1 skips the nearer crossing line
+    assert np.isclose(idx.project([[601, 3]], lines=1)['km'][0], 10.601)
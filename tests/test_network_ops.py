@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+from utils.config import default_config
+from utils.crs import pack_coordinates
+from utils.network_ops import (
+    build_station_network, build_track_nodes, main_line_edges, parse_entry_nodes, platform_edges, station_axes,
+    station_entry_edges, station_points, station_axis_lines
+)
+
+SEGMENTS = pd.DataFrame({"Linie": [1], "START_OP": ["A"], "END_OP": ["B"]})
+COORDS = [[[0.0, 0.0], [500.0, 0.0], [1000.0, 0.0], [1500.0, 0.0], [2000.0, 0.0]]]
+STATIONS = pd.DataFrame({
+    "station": ["A", "B"], "platform_count": [2, 1], "decided_platform_length": [400, 300],
+    "entry_nodes": [
+        "[{'Direction': 'East', 'Connected Station': 'B', 'Line': 1, 'Coordinates': [500.0, 0.0]}]",
+        "[{'Direction': 'West', 'Connected Station': 'A', 'Line': 1, 'Coordinates': [1500.0, 0.0]}]",
+    ],
+})
+
+def build():
+    xy, offsets = pack_coordinates(COORDS)
+    entries = parse_entry_nodes(STATIONS)
+    axes = station_axes(station_points(SEGMENTS, xy, offsets), entries)
+    tracks = build_track_nodes(STATIONS, axes, default_config().replace(default_platform_offset=4))
+    return xy, offsets, entries, tracks
+
+def test_track_nodes_follow_station_axis():
+    _, _, entries, tracks = build()
+    assert entries['id'].tolist() == ["A_entry_B", "B_entry_A"]
+    a = tracks[tracks['station'] == "A"].set_index('id')
+    assert np.allclose(a.loc["A_track_1_west", ["x", "y"]].to_numpy(dtype=float), [-200, -2])
+    assert np.allclose(a.loc["A_track_2_east", ["x", "y"]].to_numpy(dtype=float), [200, 2])
+    b = tracks[tracks['station'] == "B"].set_index('id')
+    assert np.allclose(b.loc["B_track_1_west", ["x", "y"]].to_numpy(dtype=float), [1850, 0])
+
+def test_edges():
+    xy, offsets, entries, tracks = build()
+    main = list(main_line_edges(SEGMENTS, xy, offsets, entries))
+    assert [(e[0], e[1], e[2]) for e in main] == [("main_A_B", "A_entry_B", "B_entry_A"),
+                                                  ("main_B_A", "B_entry_A", "A_entry_B")]
+    assert main[0][3].tolist() == [[500, 0], [1000, 0], [1500, 0]]
+
+    entry = station_entry_edges(entries, tracks)
+    assert set(entry['id']) == {"A_entry_B_to_track_1", "A_entry_B_to_track_2", "A_track_1_to_entry_B",
+                                "A_track_2_to_entry_B", "B_entry_A_to_track_1", "B_track_1_to_entry_A"}
+    assert set(entry.loc[entry['from'] == "A_entry_B", 'to']) == {"A_track_1_east", "A_track_2_east"}
+
+    platforms = platform_edges(tracks).set_index('id')
+    assert len(platforms) == 6
+    assert platforms.loc["A_track_2_east_to_west", ["from", "to"]].tolist() == ["A_track_2_east", "A_track_2_west"]
+
+def test_station_connections():
+    _, _, entries, tracks = build()
+    connections = build_station_network(STATIONS, station_axes(tracks.groupby('station')[['x', 'y']].mean(), entries),
+                                        entries, main_edges={"main_A_B"})["connections"]
+    pairs = set(zip(connections['from'], connections['to'], connections['kind']))
+    assert ("A_track_2_east_to_west", "A_track_2_west_to_east", "uturn") in pairs
+    assert ("A_track_2_west_to_east", "A_track_2_east_to_west", "uturn") in pairs
+    assert ("A_entry_B_to_track_1", "A_track_1_east_to_west", "entry_to_platform") in pairs
+    assert ("A_track_1_west_to_east", "A_track_1_to_entry_B", "platform_to_exit") in pairs
+    assert ("A_track_1_to_entry_B", "main_A_B", "exit_to_main") in pairs
+    # main_B_A was not written, so nothing connects from or to it
+    assert not (connections['from'].eq("main_B_A") | connections['to'].eq("main_B_A")).any()
+    assert (connections['kind'] == "uturn").sum() == 2 * 3
+
+def test_platform_tracks_follow_axis_lines():
+    xy, offsets, entries, _ = build()
+    lines = station_axis_lines(SEGMENTS, xy, offsets, entries, extend=350)
+    assert lines[0].loc["A", "center"] == 350 and lines[0].loc["B", "center"] == 850
+    config = default_config().replace(default_platform_offset=4)
+    network = build_station_network(STATIONS, station_axes(station_points(SEGMENTS, xy, offsets), entries), entries,
+                                    config, axis_lines=lines)
+    tracks = network["tracks"].set_index('id')
+    assert np.allclose(tracks.loc["A_track_1_west", ["x", "y"]].to_numpy(dtype=float), [-200, -2])
+    platforms = network["edges"].set_index('id')
+    assert np.allclose(platforms.loc["B_track_1_west_to_east", "shape"], [[1850, 0], [2000, 0], [2150, 0]])
+    assert np.allclose(platforms.loc["B_track_1_east_to_west", "shape"][0], [2150, 0])
+    assert platforms.loc["A_entry_B_to_track_1", "shape"] is None
@@ -0,0 +1,171 @@
+import pytest
+import sys
+from utils.pipeline import (
+    build_dag, topological_order, node_fingerprint, file_digest, discover_nodes, code_files, entry_kwargs
+)
+
+NODES = {
+    "stage_02": {"name": "stage_02", "stage": 2, "inputs": ["FILTERED_SUB_NETWORK_POLYGON_FILE"],
+                 "outputs": ["STATION_HELPER_FILE"], "constants": []},
+    "stage_01": {"name": "stage_01", "stage": 1, "inputs": ["POLYGON_FILE"],
+                 "outputs": ["FILTERED_SUB_NETWORK_POLYGON_FILE"], "constants": ["LINE_ID_LIST"]},
+    "map": {"name": "map", "stage": None, "inputs": ["STATION_HELPER_FILE"],
+            "outputs": ["GEOSHAPE_MAP_FILE"], "constants": []},
+}
+
+def test_build_dag_matches_outputs_to_inputs():
+    dag = build_dag(NODES)
+    assert dag == {"stage_01": set(), "stage_02": {"stage_01"}, "map": {"stage_02"}}
+
+def test_topological_order():
+    assert topological_order(NODES) == ["stage_01", "stage_02", "map"]
+
+def test_cycle_is_rejected():
+    nodes = {
+        "a": {"name": "a", "inputs": ["POLYGON_FILE"], "outputs": ["PLATFORM_FILE"]},
+        "b": {"name": "b", "inputs": ["PLATFORM_FILE"], "outputs": ["POLYGON_FILE"]},
+    }
+    with pytest.raises(ValueError):
+        topological_order(nodes)
+
+def test_fingerprint_follows_constants(monkeypatch):
+    before = node_fingerprint(NODES["stage_01"])
+    monkeypatch.setattr("utils.constants.LINE_ID_LIST", [710])
+    after = node_fingerprint(NODES["stage_01"])
+    assert before["fingerprint"] != after["fingerprint"]
+    assert node_fingerprint(NODES["stage_02"]) == node_fingerprint(NODES["stage_02"])
+
+def test_file_digest_uses_cache(tmp_path):
+    path = tmp_path / "a.csv"
+    path.write_text("x;y\n1;2\n")
+    cache = {}
+    digest = file_digest(path, cache)
+    assert cache[str(path)][2] == digest
+    assert file_digest(tmp_path / "missing.csv") is None
+
+def test_discover_nodes_reads_declarations_without_import(tmp_path):
+    stages = tmp_path / "stages"
+    stages.mkdir()
+    (stages / "stage_09_plugin.py").write_text(
+        "import not_installed_module\n"
+        "PIPELINE_NODE = {'name': 'stage_09', 'title': 'Plugin', 'stage': 9, 'entry': 'run',\n"
+        "                 'inputs': [], 'outputs': [], 'constants': []}\n"
+    )
+    (stages / "helper.py").write_text("VALUE = 1\n")
+    nodes = discover_nodes(tmp_path, ["stages"])
+    assert list(nodes) == ["stage_09"]
+    assert nodes["stage_09"]["module"] == "stages.stage_09_plugin"
+    assert "stages.stage_09_plugin" not in sys.modules
+
+def test_discover_nodes_accepts_a_list_of_declarations(tmp_path):
+    (tmp_path / "matrix.py").write_text(
+        "PIPELINE_NODE = [{'name': 'a', 'stage': None, 'entry': 'run_a'},\n"
+        "                 {'name': 'b', 'stage': None, 'entry': 'run_b'}]\n"
+    )
+    nodes = discover_nodes(tmp_path, ["matrix.py"])
+    assert [(n["name"], n["entry"], n["module"]) for n in nodes.values()] == [("a", "run_a", "matrix"),
+                                                                             ("b", "run_b", "matrix")]
+
+def test_code_fingerprint_follows_imported_project_modules(tmp_path):
+    (tmp_path / "utils").mkdir()
+    (tmp_path / "utils" / "__init__.py").write_text("")
+    (tmp_path / "utils" / "helper.py").write_text("import json\nVALUE = 1\n")
+    (tmp_path / "utils" / "constants.py").write_text("X = 1\n")
+    (tmp_path / "stages").mkdir()
+    (tmp_path / "stages" / "node.py").write_text(
+        "import numpy\nfrom utils import helper\nfrom utils.constants import X\n"
+        "PIPELINE_NODE = {'name': 'node', 'stage': None, 'entry': 'run', 'inputs': [], 'constants': []}\n"
+    )
+    files = code_files(tmp_path / "stages" / "node.py", tmp_path)
+    # Sabitler "constants" üzerinden izlenir, kod olarak değil
+    assert [p.relative_to(tmp_path).as_posix() for p in files] == [
+        "stages/node.py", "utils/__init__.py", "utils/helper.py"]
+    node = discover_nodes(tmp_path, ["stages"])["node"]
+    before = node_fingerprint(node)
+    (tmp_path / "utils" / "helper.py").write_text("import json\nVALUE = 2\n")
+    assert node_fingerprint(node)["code"] != before["code"]
+
+STUB_NODES = '''
+from pathlib import Path
+
+HERE = Path(__file__).parent
+
+def broken(debug=False):
+    raise ValueError("boom")
+
+def downstream(debug=False):
+    (HERE / "downstream.txt").write_text("ok")
+
+def independent(debug=False):
+    (HERE / "independent.txt").write_text("ok")
+
+def after_independent(debug=False):
+    (HERE / "after_independent.txt").write_text((HERE / "independent.txt").read_text())
+'''
+
+@pytest.fixture
+def stub_pipeline(tmp_path, monkeypatch):
+    """run_pipeline with four stub nodes: broken → downstream, independent → after_independent."""
+    import run_pipeline
+    import utils.constants as constants
+    (tmp_path / "stub_nodes.py").write_text(STUB_NODES)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for name in ["broken", "downstream", "independent", "after_independent"]:
+        monkeypatch.setattr(constants, f"STUB_{name.upper()}_FILE", tmp_path / f"{name}.txt", raising=False)
+    edges = {"broken": [], "downstream": ["broken"], "independent": [], "after_independent": ["independent"]}
+    nodes = {
+        name: {"name": name, "title": name, "stage": None, "module": "stub_nodes", "entry": name,
+               "inputs": [f"STUB_{u.upper()}_FILE" for u in upstream], "outputs": [f"STUB_{name.upper()}_FILE"],
+               "constants": []}
+        for name, upstream in edges.items()
+    }
+    monkeypatch.setattr(run_pipeline, "NODES", nodes)
+    monkeypatch.setattr(run_pipeline, "PIPELINE_MANIFEST_FILE", tmp_path / "manifest.json")
+    yield run_pipeline
+    # Bir sonraki testin stub modülü kendi tmp_path'inden yüklensin
+    sys.modules.pop("stub_nodes", None)
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_failing_node_skips_only_its_dependents(stub_pipeline, jobs, capsys):
+    results = stub_pipeline.run_selected_stages(0, 0, run_all=True, jobs=jobs)
+    assert {name: status for name, (status, _, _) in results.items()} == {
+        "broken": "failed", "downstream": "skipped", "independent": "ok", "after_independent": "ok"}
+    assert "ValueError: boom" in results["broken"][2]
+    assert "upstream failed: ['broken']" in results["downstream"][2]
+    summary = capsys.readouterr().out.split("Pipeline summary")[1]
+    assert "❌ broken" in summary and "⏭️ downstream" in summary and "✅ after_independent" in summary
+
+    # Başarılı düğümler manifest'e yazıldı: ikinci çalıştırmada önbellekten gelir
+    results = stub_pipeline.run_selected_stages(0, 0, node_names=["independent", "after_independent"], jobs=jobs)
+    assert {name: status for name, (status, _, _) in results.items()} == {
+        "independent": "cached", "after_independent": "cached"}
+
+def test_pool_is_bounded_by_jobs(stub_pipeline, monkeypatch):
+    import concurrent.futures
+    real_executor, sizes = concurrent.futures.ProcessPoolExecutor, []
+
+    def recording_executor(max_workers=None, **kwargs):
+        sizes.append(max_workers)
+        return real_executor(max_workers=max_workers, **kwargs)
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", recording_executor)
+    stub_pipeline.run_selected_stages(0, 0, node_names=["independent", "after_independent"], jobs=2)
+    stub_pipeline.run_selected_stages(0, 0, node_names=["independent"], jobs=1, force=True)
+    assert sizes == [2]
+
+def test_nodes_that_can_never_start_raise(stub_pipeline, monkeypatch):
+    monkeypatch.setattr(stub_pipeline, "build_dag", lambda nodes: {
+        "broken": {"downstream"}, "downstream": {"broken"}, "independent": set(), "after_independent": set()})
+    with pytest.raises(RuntimeError, match="can never start"):
+        stub_pipeline.run_selected_stages(0, 0, run_all=True, jobs=1)
+
+def test_entry_kwargs_only_pass_what_the_entry_accepts():
+    def plain(debug=False):
+        pass
+
+    def parallel(debug=False, jobs=1, config=None):
+        pass
+
+    assert entry_kwargs(plain, True, config="cfg", jobs=4) == {"debug": True}
+    assert entry_kwargs(parallel, False, config="cfg", jobs=4) == {"debug": False, "config": "cfg", "jobs": 4}
+    assert entry_kwargs(parallel) == {"debug": False}
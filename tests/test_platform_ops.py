@@ -4,6 +4,7 @@ from utils.platform_ops import (
     decide_platform_length,
     find_direction_between_coordinates
 )
+from utils.config import default_config
 from utils.constants import (
     MAX_PLATFORM_LENGTH, MIN_PLATFORM_LENGTH, DEFAULT_PLATFORM_LENGTH,
     FILL_EMPTY_PLATFORM_LENGTH_DATA_WITH, FILL_EMPTY_PLATFORM_NO_DATA_WITH,
@@ -16,22 +17,26 @@ def test_get_fallback_values():
     assert isinstance(count, int)
     assert length in [MIN_PLATFORM_LENGTH, MAX_PLATFORM_LENGTH, DEFAULT_PLATFORM_LENGTH]
 
-def test_decide_platform_length_X(monkeypatch):
-    monkeypatch.setattr('utils.platform_ops.PLATFORM_LENGTH_DECISION_METHOD', 'X')
-    result = decide_platform_length(100, 400, 300)
+def test_decide_platform_length_X():
+    config = default_config().replace(platform_length_decision_method='X')
+    result = decide_platform_length(100, 400, 300, config)
     assert result == min(MAX_PLATFORM_LENGTH, 400)
 
-def test_decide_platform_length_N(monkeypatch):
-    monkeypatch.setattr('utils.platform_ops.PLATFORM_LENGTH_DECISION_METHOD', 'N')
-    result = decide_platform_length(100, 400, 300)
+def test_decide_platform_length_N():
+    config = default_config().replace(platform_length_decision_method='N')
+    result = decide_platform_length(100, 400, 300, config)
     assert result == max(MIN_PLATFORM_LENGTH, 100)
 
-def test_decide_platform_length_A(monkeypatch):
-    monkeypatch.setattr('utils.platform_ops.PLATFORM_LENGTH_DECISION_METHOD', 'A')
-    result = decide_platform_length(100, 400, 300)
+def test_decide_platform_length_A():
+    config = default_config().replace(platform_length_decision_method='A')
+    result = decide_platform_length(100, 400, 300, config)
     assert isinstance(result, (int, float))
 
 def test_find_direction_between_coordinates():
     assert find_direction_between_coordinates([0, 0], [1, 0]) == "East"
     assert find_direction_between_coordinates([1, 0], [0, 0]) == "West"
     assert find_direction_between_coordinates([1, 0], [1, 5]) == "Same"
+
+def test_get_fallback_values_follows_config():
+    config = default_config().replace(fill_empty_platform_length_data_with='X', fill_empty_platform_no_data_with='D')
+    assert get_fallback_values(config) == (config.max_platform_length, config.default_platform_count)
@@ -0,0 +1,36 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from utils.profiling import compare_reports, count_rows, profile_call
+
+def test_count_rows_csv(tmp_path):
+    path = tmp_path / "segments.csv"
+    path.write_text("Linie;START_OP\n710;A\n710;B")
+    assert count_rows(path) == 2
+    assert count_rows(tmp_path / "missing.csv") is None
+
+def test_profile_call_measures_times():
+    metrics = profile_call(lambda debug: sum(range(1000)), debug=False)
+    assert metrics["wall_s"] >= 0 and metrics["cpu_s"] >= 0
+    assert metrics["pstats"] is None
+
+def _spin(seconds):
+    started = time.process_time()
+    while time.process_time() - started < seconds:
+        pass
+
+def _spin_in_pool(debug=False):
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        list(executor.map(_spin, [0.3, 0.3]))
+
+def test_profile_call_counts_worker_cpu_time():
+    metrics = profile_call(_spin_in_pool, debug=False)
+    assert metrics["cpu_s"] >= 0.5
+
+def test_compare_reports_flags_regressions():
+    previous = {"nodes": {"stage_01": {"wall_s": 10.0, "cpu_s": 9.0, "peak_rss_mb": 100.0}}}
+    current = {"nodes": {"stage_01": {"wall_s": 15.0, "cpu_s": 9.1, "peak_rss_mb": 100.0},
+                         "stage_02": {"wall_s": 1.0}}}
+    rows = compare_reports(current, previous, threshold=0.2)
+    flagged = {row["metric"] for row in rows if row["regression"]}
+    assert flagged == {"wall_s"}
+    assert {row["node"] for row in rows} == {"stage_01"}
@@ -0,0 +1,35 @@
+import struct
+import zlib
+import numpy as np
+from utils.raster import draw_polylines, ramp_colors, raster_shape, to_pixels, write_png
+
+def test_draw_polylines_connects_vertices():
+    image = np.zeros((10, 10, 3), dtype=np.uint8)
+    pixels = np.array([[1.0, 1.0], [8.0, 1.0], [2.0, 5.0], [2.0, 9.0]])
+    colors = np.array([[255, 0, 0], [0, 255, 0]], dtype=np.uint8)
+    draw_polylines(image, pixels, np.array([0, 2, 4]), colors, max_steps=3)
+    assert (image[1, 1:9] == [255, 0, 0]).all()
+    assert (image[5:10, 2] == [0, 255, 0]).all()
+    # No edge between the end of the first and the start of the second polyline
+    assert image[3, 5].sum() == 0
+
+def test_raster_shape_keeps_aspect_ratio():
+    xy = np.array([[2600000.0, 1200000.0], [2602000.0, 1201000.0]])
+    bounds, height = raster_shape(xy, 200, margin=0.0)
+    assert abs(height - 100) <= 1
+    pixels = to_pixels(xy, bounds, 200, height)
+    assert pixels[0, 1] > pixels[1, 1]  # north up
+
+def test_ramp_and_png(tmp_path):
+    colors = ramp_colors(np.array([0.0, 50.0, 100.0, np.nan]))
+    assert colors[0].tolist() == [68, 1, 84] and colors[2].tolist() == [253, 231, 37]
+    assert colors[3].tolist() == [160, 160, 160]
+
+    image = np.arange(2 * 3 * 3, dtype=np.uint8).reshape(2, 3, 3)
+    data = write_png(tmp_path / "a.png", image).read_bytes()
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    width, height = struct.unpack('>II', data[16:24])
+    assert (width, height) == (3, 2)
+    length = struct.unpack('>I', data[33:37])[0]
+    raw = np.frombuffer(zlib.decompress(data[41:41 + length]), dtype=np.uint8).reshape(2, 10)
+    assert (raw[:, 1:].reshape(2, 3, 3) == image).all()
@@ -0,0 +1,49 @@
+import pandas as pd
+from utils.routing import PathCache, RoutingGraph
+from utils.sumo_xml import XmlStreamWriter
+
+# A ⇄ B main line, platform 1 at B with a u-turn only at its east end
+EDGES = ["main_A_B", "main_B_A", "B_in", "B_p1_we", "B_p1_ew", "B_out", "B_short"]
+LENGTHS = [1000.0, 1000.0, 50.0, 300.0, 300.0, 50.0, 10.0]
+CONNECTIONS = pd.DataFrame([
+    ("main_A_B", "B_in"), ("B_in", "B_p1_we"), ("B_p1_we", "B_p1_ew"), ("B_p1_ew", "B_out"), ("B_out", "main_B_A"),
+    ("main_A_B", "B_short"), ("B_short", "B_p1_we"),
+], columns=["from", "to"])
+
+def test_path_follows_connections_and_lengths():
+    graph = RoutingGraph(EDGES, LENGTHS, CONNECTIONS)
+    assert graph.path("main_A_B", "B_p1_we") == ["main_A_B", "B_short", "B_p1_we"]
+    # No connection main_A_B → main_B_A: the train has to turn on the platform
+    assert graph.path("main_A_B", "main_B_A") == ["main_A_B", "B_short", "B_p1_we", "B_p1_ew", "B_out", "main_B_A"]
+    assert graph.path("main_B_A", "main_A_B") is None
+
+def test_route_many_uses_cache():
+    graph = RoutingGraph(EDGES, LENGTHS, CONNECTIONS)
+    stops = [["main_A_B", "B_p1_we", "main_B_A"]] * 3 + [["main_A_B", "unknown"]]
+    routes = graph.route_many(stops, jobs=1)
+    assert routes[0] == ["main_A_B", "B_short", "B_p1_we", "B_p1_ew", "B_out", "main_B_A"]
+    assert routes[0] == routes[2] and routes[3] is None
+    assert graph.cache.misses == 2 and len(graph.cache) == 2
+    assert graph.route_many(stops[:1], jobs=2) == routes[:1]
+    assert graph.cache.hits == 2
+
+def test_path_cache_evicts_least_recently_used():
+    cache = PathCache(maxsize=2)
+    cache.put((0, 1), (0, 1))
+    cache.put((1, 2), None)
+    cache.get((0, 1))
+    cache.put((2, 3), (2, 3))
+    assert (0, 1) in cache and (1, 2) not in cache and len(cache) == 2
+
+def test_from_network_reads_lengths(tmp_path):
+    with XmlStreamWriter(tmp_path / "n.nod.xml", "nodes") as xml:
+        for node_id, x in (("a", 0.0), ("b", 30.0), ("c", 30.0)):
+            xml.element("node", id=node_id, x=x, y=0.0)
+    with XmlStreamWriter(tmp_path / "n.edg.xml", "edges") as xml:
+        xml.element("edge", id="ab", **{"from": "a"}, to="b")
+        xml.element("edge", id="bc", **{"from": "b"}, to="c", shape="30,0 30,40 30,0")
+    with XmlStreamWriter(tmp_path / "n.con.xml", "connections") as xml:
+        xml.element("connection", **{"from": "ab"}, to="bc")
+    graph = RoutingGraph.from_network(tmp_path / "n.edg.xml", tmp_path / "n.con.xml", tmp_path / "n.nod.xml")
+    assert graph.lengths.tolist() == [30.0, 80.0]
+    assert graph.route(["ab", "bc"]) == ["ab", "bc"]
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+from utils.config import default_config
+from utils.station_layout import LayoutTemplateCache, build_template, place_track_nodes
+
+STATIONS = pd.DataFrame({
+    "station": ["A", "B", "C"], "platform_count": [2, 2, 3], "decided_platform_length": [400, 400.01, 300],
+    "type": ["two-way", "two-way", "single-direction"],
+})
+AXES = pd.DataFrame({"x": [0.0, 1000.0, 0.0], "y": [0.0, 0.0, 500.0], "ux": [1.0, 0.0, 1.0], "uy": [0.0, 1.0, 0.0]},
+                    index=["A", "B", "C"])
+
+def test_template_local_frame():
+    template = build_template((2, 400.0), default_config().replace(default_platform_offset=4))
+    assert template.suffix.tolist() == ["_track_1_west", "_track_1_east", "_track_2_west", "_track_2_east"]
+    assert template.local.tolist() == [[-200, -2], [200, -2], [-200, 2], [200, 2]]
+
+def test_stations_share_templates_and_are_rotated():
+    cache = LayoutTemplateCache(default_config().replace(default_platform_offset=4))
+    tracks = place_track_nodes(STATIONS, AXES, cache=cache).set_index('id')
+    # A and B share one template (lengths equal after rounding), C has its own
+    assert len(cache) == 2 and cache.hits == 0
+    assert np.allclose(tracks.loc["A_track_1_east", ["x", "y"]].to_numpy(dtype=float), [200, -2])
+    # B is heading north: East end is 200 m north, track 1 lies to the right (+x)
+    assert np.allclose(tracks.loc["B_track_1_east", ["x", "y"]].to_numpy(dtype=float), [1002, 200])
+    assert len(tracks) == 2 * (2 + 2 + 3)
+
+    place_track_nodes(STATIONS, AXES, cache=cache)
+    assert cache.hits == 2 and cache.misses == 2
+
+def test_station_type_does_not_split_templates():
+    # Tek yönlü istasyonların da her hattı iki uçlu: tip anahtarın parçası değil
+    stations = STATIONS.assign(type=["two-way", "single-direction", "single-direction"])
+    cache = LayoutTemplateCache()
+    tracks = place_track_nodes(stations, AXES, cache)
+    assert len(cache) == 2
+    assert set(tracks.loc[tracks['station'] == "B", 'side']) == {"West", "East"}
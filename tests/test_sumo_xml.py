@@ -0,0 +1,30 @@
+import xml.etree.ElementTree as ET
+import numpy as np
+import pytest
+from utils.sumo_xml import XmlStreamWriter, format_shape
+
+def test_stream_writer_output_parses(tmp_path):
+    path = tmp_path / "net.edg.xml"
+    with XmlStreamWriter(path, "edges") as xml:
+        xml.element("edge", id='a&"b', **{"from": "x"}, to="y", speed=44.444, shape=None)
+        xml.start("edge", id="c")
+        xml.element("lane", index=0)
+        xml.end("edge")
+    root = ET.parse(path).getroot()
+    assert root.tag == "edges" and xml.count == 3
+    edge = root.find("edge")
+    assert edge.get("id") == 'a&"b' and edge.get("speed") == "44.44" and edge.get("shape") is None
+    assert root.findall("edge")[1].find("lane").get("index") == "0"
+
+def test_failed_write_keeps_previous_file(tmp_path):
+    path = tmp_path / "net.nod.xml"
+    path.write_text("old")
+    with pytest.raises(RuntimeError):
+        with XmlStreamWriter(path, "nodes") as xml:
+            xml.element("node", id="a")
+            raise RuntimeError("boom")
+    assert path.read_text() == "old" and not list(tmp_path.glob("*.tmp"))
+
+def test_format_shape():
+    assert format_shape(np.array([[0, 0], [1.234, 5.678]])) == "0.00,0.00 1.23,5.68"
+    assert format_shape(np.array([[0, 0]])) is None
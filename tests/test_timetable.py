@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+from utils.routing import RoutingGraph
+from utils.timetable import parse_clock, order_timetable, assign_stop_edges, choose_stop_edges, iter_train_chunks
+
+STATIONS = pd.DataFrame({"station": ["A", "B", "C"], "platform_count": [2, 1, 0]})
+
+def line_graph(stations="ABC"):
+    """One track per station on a west → east line, u-turns at both track ends."""
+    edges, connections = {}, []
+    for s in stations:
+        edges[f"{s}_track_1_west_to_east"] = edges[f"{s}_track_1_east_to_west"] = 400.0
+        connections += [(f"{s}_track_1_east_to_west", f"{s}_track_1_west_to_east"),
+                        (f"{s}_track_1_west_to_east", f"{s}_track_1_east_to_west")]
+    for a, b in zip(stations[:-1], stations[1:]):
+        edges[f"main_{a}_{b}"] = edges[f"main_{b}_{a}"] = 3000.0
+        connections += [(f"{a}_track_1_west_to_east", f"main_{a}_{b}"), (f"main_{a}_{b}", f"{b}_track_1_west_to_east"),
+                        (f"{b}_track_1_east_to_west", f"main_{b}_{a}"), (f"main_{b}_{a}", f"{a}_track_1_east_to_west")]
+    return RoutingGraph(list(edges), list(edges.values()), pd.DataFrame(connections, columns=["from", "to"]))
+
+def timetable(rows):
+    return order_timetable(pd.DataFrame(rows, columns=["train_id", "line", "stop_sequence", "station", "arrival",
+                                                      "departure", "consist_length"]))
+
+def test_parse_clock_accepts_seconds_and_clock_strings():
+    times = parse_clock(["08:00:30", "25:01", 90, "", None])
+    assert times[:3].tolist() == [28830.0, 90060.0, 90.0]
+    assert np.isnan(times[3:]).all()
+
+def test_order_timetable_sorts_trains_by_first_departure():
+    stops = timetable([("late", 1, 2, "B", "09:10", None, 200), ("late", 1, 1, "A", None, "09:00", 200),
+                       ("early", 1, 1, "B", None, "08:00", 200), ("early", 1, 2, "A", "08:10", None, 200)])
+    assert stops['train_id'].tolist() == ["early", "early", "late", "late"]
+    assert stops['station'].tolist() == ["B", "A", "A", "B"]
+    # Eksik zaman aynı duraktaki diğer zamanla doldurulur
+    assert stops['arrival'].tolist() == [28800.0, 29400.0, 32400.0, 33000.0]
+    assert stops['departure'].tolist() == stops['arrival'].tolist()
+
+def test_assign_stop_edges_drops_unknown_stations_and_rotates_tracks():
+    stops = assign_stop_edges(timetable([
+        ("1", 1, 1, "A", None, 100, 200), ("1", 1, 2, "C", 150, 160, 200), ("1", 1, 3, "B", 200, None, 200),
+        ("2", 1, 1, "B", None, 300, 200), ("2", 1, 2, "A", 400, None, 200),
+    ]), STATIONS)
+    # C has no platform tracks: dropped
+    assert stops['platform'].tolist() == ["A_track_1", "B_track_1", "B_track_1", "A_track_2"]
+
+def test_choose_stop_edges_follows_the_network():
+    stations = pd.DataFrame({"station": ["A", "B", "C"], "platform_count": [1, 1, 1]})
+    stops = assign_stop_edges(timetable([
+        ("east", 1, 1, "A", None, 100, 200), ("east", 1, 2, "B", 200, 210, 200), ("east", 1, 3, "C", 300, None, 200),
+        # Ekspres: B'de durmaz, C → A doğrudan
+        ("express", 1, 1, "C", None, 400, 200), ("express", 1, 2, "A", 500, None, 200),
+    ]), stations)
+    stops = choose_stop_edges(stops, line_graph())
+    assert stops['edge'].tolist() == ["A_track_1_west_to_east", "B_track_1_west_to_east", "C_track_1_west_to_east",
+                                      "C_track_1_east_to_west", "A_track_1_east_to_west"]
+
+def test_iter_train_chunks_keeps_trains_whole():
+    stops = timetable([(t, 1, k, "A", None, 10 * i + k, 200) for i, t in enumerate("abc") for k in range(3)])
+    chunks = list(iter_train_chunks(stops, 2))
+    assert [chunk['train_id'].unique().tolist() for chunk in chunks] == [["a", "b"], ["c"]]
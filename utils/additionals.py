@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+from utils.config import PipelineConfig, default_config
+from utils.linear_referencing import LinearReferenceIndex
+from utils.network_ops import _id_part
+
+# Detector output, relative to the .add.xml file (SUMO resolves it there)
+DETECTOR_OUTPUT_FILE = "detectors.out.xml"
+
+
+def line_spacing(lines, config: Optional[PipelineConfig] = None) -> np.ndarray:
+    """Detector spacing (meters) per line: DETECTOR_SPACING_BY_LINE, else DETECTOR_SPACING."""
+    config = config or default_config()
+    overrides = dict(config.detector_spacing_by_line)
+    numeric = pd.to_numeric(pd.Series(lines, dtype=object), errors='coerce')
+    return numeric.map(overrides).fillna(config.detector_spacing).to_numpy(dtype=np.float64)
+
+
+def train_stops(station_df: pd.DataFrame, entries: pd.DataFrame, edges: pd.DataFrame) -> pd.DataFrame:
+    """
+    One train stop over the full length of every platform edge (both directions of every track).
+
+    Platform edge ids follow stage 03 ("<station>_track_<n>_west_to_east" / "_east_to_west");
+    edges missing from the network are left out.
+
+    Args:
+        station_df (pd.DataFrame): STATION_HELPER_FILE rows (station, platform_count).
+        entries (pd.DataFrame): parse_entry_nodes output (the lines serving each station).
+        edges (pd.DataFrame): sumo_xml.edge_table output.
+
+    Returns:
+        pd.DataFrame: id, lane, length, station, lines (space separated).
+    """
+    counts = station_df['platform_count'].fillna(0).clip(lower=0).astype(np.int64).to_numpy()
+    station = np.repeat(station_df['station'].to_numpy(), counts * 2)
+    track = np.repeat(np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + 1, 2)
+    direction = np.tile(["_west_to_east", "_east_to_west"], counts.sum())
+    stops = pd.DataFrame({"edge": (_id_part(station) + "_track_" + track.astype(str) + direction).to_numpy(),
+                          "station": station})
+    stops = stops.merge(edges[['id', 'length']], left_on='edge', right_on='id', how='inner')
+    lines = entries.drop_duplicates(["station", "line"]).sort_values("line", kind='stable')
+    lines = lines.groupby('station')['line'].agg(lambda values: " ".join(map(str, values)))
+    return pd.DataFrame({"id": stops['edge'] + "_stop", "lane": stops['edge'] + "_0", "length": stops['length'],
+                         "station": stops['station'], "lines": stops['station'].map(lines).fillna("").to_numpy()})
+
+
+def main_line_edge_table(entries: pd.DataFrame, edges: pd.DataFrame) -> pd.DataFrame:
+    """Main line edges ("main_<from>_<to>") of the network with the line of their entry node pair."""
+    main = pd.DataFrame({"id": ("main_" + _id_part(entries['station']) + "_" +
+                                _id_part(entries['connected_station'])).to_numpy(),
+                         "line": entries['line'].to_numpy()})
+    return main.drop_duplicates("id").merge(edges, on="id", how="inner")
+
+
+def main_line_detectors(main: pd.DataFrame, index: Optional[LinearReferenceIndex],
+                        config: Optional[PipelineConfig] = None) -> pd.DataFrame:
+    """
+    Induction loops on main line edges: one before every station entry and one at every
+    multiple of the line's detector spacing along the KM chainage.
+
+    Both ends of every edge are projected onto its line in one batch; the chainage
+    marks in between are mapped to edge positions linearly, so the detectors of
+    both directions sit at the same KM. Edges whose ends cannot be referenced get
+    detectors every spacing meters from the edge start instead. Marks are expanded
+    with np.repeat, so the work is linear in the number of edges and detectors.
+
+    Args:
+        main (pd.DataFrame): main_line_edge_table output.
+        index (LinearReferenceIndex, optional): Chainage index of the segments; None uses meters from the edge start.
+        config (PipelineConfig, optional): Tunables. Defaults to utils.constants.
+
+    Returns:
+        pd.DataFrame: id, lane, pos, kind ('entry' or 'line'), ordered by edge and position.
+    """
+    config = config or default_config()
+    length = main['length'].to_numpy(dtype=np.float64)
+    spacing = line_spacing(main['line'], config)
+    entry = pd.DataFrame({"owner": np.arange(len(main)), "id": ("e1_entry_" + main['id']).to_numpy(),
+                          "pos": np.maximum(length - config.entry_detector_offset, 0.0), "kind": "entry"})
+
+    km_from = km_to = np.full(len(main), np.nan)
+    if index is not None and len(main):
+        ends = np.concatenate([main[['start_x', 'start_y']].to_numpy(), main[['end_x', 'end_y']].to_numpy()])
+        km = index.project(ends, lines=np.concatenate([main['line'].to_numpy()] * 2))['km'].to_numpy()
+        km_from, km_to = km[:len(main)], km[len(main):]
+    referenced = np.isfinite(km_from) & np.isfinite(km_to) & (km_from != km_to)
+
+    # Kilometre işaretleri: (düşük km, yüksek km) aralığındaki spacing katları
+    step = spacing / 1000.0
+    low, high = np.fmin(km_from, km_to), np.fmax(km_from, km_to)
+    first = np.where(referenced, np.floor(low / step) + 1, 1)
+    last = np.where(referenced, np.ceil(high / step) - 1, np.ceil(length / spacing) - 1)
+    count = np.maximum(last - first + 1, 0).astype(np.int64)
+    owner = np.repeat(np.arange(len(main)), count)
+    mark = first[owner] + np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+    mark_km = mark * step[owner]
+    on_line = referenced[owner]
+    fraction = np.divide(mark_km - km_from[owner], (km_to - km_from)[owner],
+                         out=np.zeros(len(owner)), where=on_line)
+    pos = np.where(on_line, fraction * length[owner], mark * spacing[owner])
+    label = np.where(on_line, "km" + pd.Series(mark_km).map("{:.3f}".format).to_numpy(),
+                     "m" + pd.Series(pos).map("{:.0f}".format).to_numpy())
+    marks = pd.DataFrame({"owner": owner, "id": "e1_" + pd.Series(main['id'].to_numpy()[owner], dtype=object) +
+                          "_" + label, "pos": pos, "kind": "line"})
+
+    detectors = pd.concat([marks, entry], ignore_index=True).sort_values(["owner", "pos"], kind='stable')
+    return pd.DataFrame({"id": detectors['id'].to_numpy(),
+                         "lane": main['id'].to_numpy()[detectors['owner'].to_numpy()] + "_0",
+                         "pos": detectors['pos'].to_numpy(), "kind": detectors['kind'].to_numpy()})
@@ -0,0 +1,247 @@
+import hashlib
+import json
+import logging
+import pickle
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+
+def checkpoint_key(frame: pd.DataFrame, config: Dict[str, object], code_files: Iterable[Path] = ()) -> str:
+    """
+    Hash a unit of work's input rows, config and code into a checkpoint key.
+
+    Args:
+        frame (pd.DataFrame): Input rows of the unit (e.g. one line's raw segments), in processing order.
+        config (Dict[str, object]): Tunables the result depends on (must be JSON serializable).
+        code_files (Iterable[Path], optional): Source files whose edits invalidate the checkpoint. Defaults to ().
+
+    Returns:
+        str: Hex digest.
+    """
+    sha = hashlib.sha256()
+    sha.update(",".join(map(str, frame.columns)).encode('utf-8'))
+    sha.update(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+    sha.update(json.dumps(config, sort_keys=True, default=str).encode('utf-8'))
+    for path in code_files:
+        sha.update(Path(path).read_bytes())
+    return sha.hexdigest()
+
+
+def checkpoint_path(directory: Path, unit: str, key: str) -> Path:
+    return Path(directory) / f"{unit}_{key[:16]}.pkl"
+
+
+def load_checkpoint(directory: Path, unit: str, key: str) -> Optional[pd.DataFrame]:
+    """
+    Load a unit's result if it was checkpointed with the same key.
+
+    Args:
+        directory (Path): Checkpoint directory.
+        unit (str): Unit name (e.g. "line_710").
+        key (str): Expected checkpoint key (see checkpoint_key).
+
+    Returns:
+        Optional[pd.DataFrame]: The stored result, or None if missing or unreadable.
+    """
+    path = checkpoint_path(directory, unit, key)
+    if not path.exists():
+        return None
+    try:
+        return pd.read_pickle(path)
+    except Exception as e:
+        logging.warning(f"⚠️ Ignoring unreadable checkpoint {path}: {e}")
+        return None
+
+
+def save_checkpoint(directory: Path, unit: str, key: str, result: pd.DataFrame) -> Path:
+    """
+    Atomically store a unit's result and drop its checkpoints for older keys.
+
+    Args:
+        directory (Path): Checkpoint directory.
+        unit (str): Unit name (e.g. "line_710").
+        key (str): Checkpoint key (see checkpoint_key).
+        result (pd.DataFrame): Result to store.
+
+    Returns:
+        Path: The checkpoint file.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = checkpoint_path(directory, unit, key)
+    tmp_path = path.with_suffix('.tmp')
+    result.to_pickle(tmp_path)
+    tmp_path.replace(path)
+    for stale in directory.glob(f"{unit}_*.pkl"):
+        # "line_10_*" also matches "line_100_*", so compare the unit part exactly
+        if stale != path and stale.stem.rsplit('_', 1)[0] == unit:
+            stale.unlink()
+    return path
+
+
+def row_hashes(frame: pd.DataFrame) -> np.ndarray:
+    """64-bit content hash of every row (index ignored)."""
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def partition_fingerprints(partitions, hashes: np.ndarray, config: Dict[str, object],
+                           code_files: Iterable[Path] = ()) -> pd.Series:
+    """
+    Fingerprint every partition from the hashes of its input rows (in row order), config and code.
+
+    A row may feed several partitions (e.g. a segment feeds both its stations): pass it
+    once per partition.
+
+    Args:
+        partitions (array-like): Partition name per input row.
+        hashes (np.ndarray): Row hash per input row (see row_hashes).
+        config (Dict[str, object]): Tunables every partition depends on (must be JSON serializable).
+        code_files (Iterable[Path], optional): Source files whose edits invalidate all partitions. Defaults to ().
+
+    Returns:
+        pd.Series: Hex digest indexed by partition, in order of first appearance.
+    """
+    salt = bytes.fromhex(checkpoint_key(pd.DataFrame(), config, code_files))
+    partitions = pd.Series(partitions, dtype=object).reset_index(drop=True)
+    codes, names = pd.factorize(partitions)
+    order = np.argsort(codes, kind='stable')
+    hashes = np.asarray(hashes, dtype=np.uint64)[order]
+    bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+    return pd.Series([hashlib.sha256(salt + hashes[bounds[i]:bounds[i + 1]].tobytes()).hexdigest()
+                      for i in range(len(names))], index=pd.Index(names, dtype=object), dtype=object)
+
+
+def load_partitions(path: Path) -> Tuple[pd.Series, Dict[str, pd.DataFrame]]:
+    """
+    Load a partition store: the fingerprint of every stored partition and its result tables.
+
+    Returns:
+        Tuple[pd.Series, Dict[str, pd.DataFrame]]: Fingerprints (empty if missing or unreadable) and
+        tables whose 'partition' column names the partition of every row.
+    """
+    path = Path(path)
+    if not path.exists():
+        return pd.Series(dtype=object), {}
+    try:
+        with open(path, 'rb') as f:
+            stored = pickle.load(f)
+        return stored["fingerprints"], stored["tables"]
+    except Exception as e:
+        logging.warning(f"⚠️ Ignoring unreadable partition store {path}: {e}")
+        return pd.Series(dtype=object), {}
+
+
+def _pickle_atomic(path: Path, value) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(path)
+    return path
+
+
+def save_partitions(path: Path, fingerprints: pd.Series, tables: Dict[str, pd.DataFrame]) -> Path:
+    """Atomically store partition fingerprints and result tables (see load_partitions)."""
+    return _pickle_atomic(path, {"fingerprints": fingerprints, "tables": tables})
+
+
+class PartitionStore:
+    """
+    Partition store split into hash buckets: a fingerprint index plus one table file per bucket.
+
+    A partition always lands in the same bucket, so a run can merge, save and stream
+    the store one bucket at a time and holds a single bucket of stored rows in memory.
+    Only buckets with rebuilt or removed partitions are rewritten. Save the index
+    without the stale partitions before rewriting buckets and the full index last, so
+    an interrupted run rebuilds every partition it may have touched.
+
+    Example:
+        store = PartitionStore(STAGE_03_PARTITION_DIR)
+        stale = stale_partitions(store.fingerprints(), fingerprints)
+        for bucket in range(store.buckets):
+            tables = store.load_bucket(bucket)
+    """
+
+    def __init__(self, directory: Path, buckets: int = 64):
+        self.directory = Path(directory)
+        self.buckets = buckets
+
+    def bucket_of(self, partitions) -> np.ndarray:
+        """Bucket number per partition name (stable across runs and processes)."""
+        names = np.asarray(pd.Series(partitions, dtype=object).astype(str), dtype=object)
+        return (pd.util.hash_array(names) % np.uint64(self.buckets)).astype(np.int64)
+
+    def _bucket_path(self, bucket: int) -> Path:
+        return self.directory / f"bucket_{bucket:04d}.pkl"
+
+    def fingerprints(self) -> pd.Series:
+        """
+        Fingerprints of the stored partitions; empty when the index is missing, unreadable or
+        was written with another bucket count. Partitions whose bucket file is missing are left out.
+        """
+        path = self.directory / "index.pkl"
+        if not path.exists():
+            return pd.Series(dtype=object)
+        try:
+            with open(path, 'rb') as f:
+                index = pickle.load(f)
+        except Exception as e:
+            logging.warning(f"⚠️ Ignoring unreadable partition index {path}: {e}")
+            return pd.Series(dtype=object)
+        if index.get("buckets") != self.buckets:
+            return pd.Series(dtype=object)
+        fingerprints = index["fingerprints"]
+        present = np.array([self._bucket_path(b).exists() for b in range(self.buckets)], dtype=bool)
+        return fingerprints[present[self.bucket_of(fingerprints.index)]]
+
+    def save_fingerprints(self, fingerprints: pd.Series) -> Path:
+        return _pickle_atomic(self.directory / "index.pkl", {"buckets": self.buckets, "fingerprints": fingerprints})
+
+    def load_bucket(self, bucket: int) -> Dict[str, pd.DataFrame]:
+        """Stored tables of one bucket ({} if the bucket was never written)."""
+        path = self._bucket_path(bucket)
+        if not path.exists():
+            return {}
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def save_bucket(self, bucket: int, tables: Dict[str, pd.DataFrame]) -> Path:
+        return _pickle_atomic(self._bucket_path(bucket), tables)
+
+
+def stale_partitions(stored: pd.Series, fingerprints: pd.Series) -> pd.Index:
+    """Partitions that are new or whose fingerprint changed since they were stored."""
+    return fingerprints.index[stored.reindex(fingerprints.index).to_numpy() != fingerprints.to_numpy()]
+
+
+def merge_partitions(stored: Optional[pd.DataFrame], fresh: pd.DataFrame, fingerprints: pd.Series,
+                     rebuilt: pd.Index) -> pd.DataFrame:
+    """
+    Stored rows of unchanged partitions plus the rebuilt rows, ordered by partition.
+
+    Rows of partitions that no longer exist are dropped. Rows keep their order within a
+    partition, so a merged table equals a full rebuild.
+
+    Args:
+        stored (pd.DataFrame, optional): Stored table with a 'partition' column.
+        fresh (pd.DataFrame): Rebuilt rows of the `rebuilt` partitions, with a 'partition' column.
+        fingerprints (pd.Series): Current fingerprints (their order is the partition order).
+        rebuilt (pd.Index): Partitions whose stored rows are replaced by `fresh`.
+
+    Returns:
+        pd.DataFrame: Merged table.
+    """
+    frames = [fresh]
+    if stored is not None and len(stored):
+        keep = stored['partition'].isin(fingerprints.index) & ~stored['partition'].isin(rebuilt)
+        frames.insert(0, stored[keep])
+    frames = [frame for frame in frames if len(frame.columns)]
+    if not frames:
+        return fresh
+    merged = pd.concat(frames, ignore_index=True)
+    rank = pd.Series(np.arange(len(fingerprints)), index=fingerprints.index)
+    order = np.argsort(merged['partition'].map(rank).to_numpy(), kind='stable')
+    return merged.iloc[order].reset_index(drop=True)
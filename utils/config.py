@@ -0,0 +1,160 @@
+import dataclasses
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Tuple
+
+import utils.constants as constants
+
+# Fields the closeness threshold is derived from (see utils.constants.CLOSENESS_THRESHOLD)
+THRESHOLD_FIELDS = ("max_platform_length", "entry_offset_buffer", "min_main_line_length")
+
+
+def derive_closeness_threshold(max_platform_length: float, entry_offset_buffer: float,
+                               min_main_line_length: float) -> float:
+    return max_platform_length + entry_offset_buffer * 2 + min_main_line_length
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    """
+    Immutable set of pipeline tunables.
+
+    Field names are the lowercased names of the matching utils.constants values.
+    Instances are hashable, so they can be used as cache keys and passed to worker
+    processes; several configs can be evaluated side by side in one process.
+
+    A closeness threshold of None is derived from the platform and buffer lengths;
+    an explicit value is kept as is.
+    """
+    line_id_list: Tuple[int, ...] = tuple(constants.LINE_ID_LIST)
+    never_skip_list: Tuple[str, ...] = tuple(constants.NEVER_SKIP_LIST)
+    min_platform_length: float = constants.MIN_PLATFORM_LENGTH
+    max_platform_length: float = constants.MAX_PLATFORM_LENGTH
+    default_platform_length: float = constants.DEFAULT_PLATFORM_LENGTH
+    entry_offset_buffer: float = constants.ENTRY_OFFSET_BUFFER
+    min_main_line_length: float = constants.MIN_MAIN_LINE_LENGTH
+    max_platform_count: int = constants.MAX_PLATFORM_COUNT
+    min_platform_count: int = constants.MIN_PLATFORM_COUNT
+    default_platform_count: int = constants.DEFAULT_PLATFORM_COUNT
+    default_platform_offset: float = constants.DEFAULT_PLATFORM_OFFSET
+    main_line_speed: float = constants.MAIN_LINE_SPEED
+    station_speed: float = constants.STATION_SPEED
+    platform_miter_limit: float = constants.PLATFORM_MITER_LIMIT
+    route_chunk_size: int = constants.ROUTE_CHUNK_SIZE
+    detector_spacing: float = constants.DETECTOR_SPACING
+    detector_spacing_by_line: Tuple[Tuple[int, float], ...] = tuple(constants.DETECTOR_SPACING_BY_LINE.items())
+    entry_detector_offset: float = constants.ENTRY_DETECTOR_OFFSET
+    detector_period: float = constants.DETECTOR_PERIOD
+    platform_length_decision_method: str = constants.PLATFORM_LENGTH_DECISION_METHOD
+    fill_empty_platform_length_data_with: str = constants.FILL_EMPTY_PLATFORM_LENGTH_DATA_WITH
+    fill_empty_platform_no_data_with: str = constants.FILL_EMPTY_PLATFORM_NO_DATA_WITH
+    simplify_max_deviation: float = constants.SIMPLIFY_MAX_DEVIATION
+    map_simplify_tolerance: float = constants.MAP_SIMPLIFY_TOLERANCE
+    map_coordinate_precision: int = constants.MAP_COORDINATE_PRECISION
+    duplicate_grid_size: float = constants.DUPLICATE_GRID_SIZE
+    duplicate_tolerance: float = constants.DUPLICATE_TOLERANCE
+    overlap_min_share: float = constants.OVERLAP_MIN_SHARE
+    raster_width: int = constants.RASTER_WIDTH
+    raster_color_by: str = constants.RASTER_COLOR_BY
+    closeness_threshold: Optional[float] = field(default=None)
+
+    def __post_init__(self):
+        # Lists from constants/YAML are frozen to tuples so the config stays hashable
+        object.__setattr__(self, "line_id_list", tuple(self.line_id_list))
+        object.__setattr__(self, "never_skip_list", tuple(self.never_skip_list))
+        # {Linie: meters} → sorted ((Linie, meters), ...); TOML/YAML table keys arrive as strings
+        object.__setattr__(self, "detector_spacing_by_line",
+                           tuple(sorted((int(line), float(spacing))
+                                        for line, spacing in dict(self.detector_spacing_by_line).items())))
+        # Türetilmiş mi? replace() buna göre eşiği yeniden hesaplar (alan değil: fingerprint'e girmez)
+        object.__setattr__(self, "_derived_threshold", self.closeness_threshold is None)
+        if self.closeness_threshold is None:
+            object.__setattr__(self, "closeness_threshold",
+                               derive_closeness_threshold(*(getattr(self, name) for name in THRESHOLD_FIELDS)))
+
+    def replace(self, **changes) -> "PipelineConfig":
+        """
+        Copy with some fields changed.
+
+        A derived closeness threshold follows changes to the fields it is derived
+        from; an explicit one is kept unless it is changed itself.
+        """
+        if "closeness_threshold" not in changes and self._derived_threshold \
+                and any(name in changes for name in THRESHOLD_FIELDS):
+            changes["closeness_threshold"] = None
+        config = dataclasses.replace(self, **changes)
+        if "closeness_threshold" not in changes and self._derived_threshold:
+            object.__setattr__(config, "_derived_threshold", True)
+        return config
+
+    def to_dict(self) -> dict:
+        return {name: list(value) if isinstance(value, tuple) else value
+                for name, value in dataclasses.asdict(self).items()}
+
+    def fingerprint(self) -> str:
+        """
+        Stable SHA-256 of all fields (unlike hash(), identical across processes and runs).
+        """
+        return hashlib.sha256(json.dumps(self.to_dict(), sort_keys=True).encode('utf-8')).hexdigest()
+
+    def value(self, constant_name: str):
+        """
+        Look up a tunable by its utils.constants name (e.g. "CLOSENESS_THRESHOLD").
+        """
+        return getattr(self, constant_name.lower())
+
+    def has(self, constant_name: str) -> bool:
+        return constant_name.lower() in {f.name for f in dataclasses.fields(self)}
+
+
+def default_config() -> PipelineConfig:
+    """
+    Build the config from the current values in utils.constants.
+
+    CLOSENESS_THRESHOLD counts as derived while it matches its formula, so configs
+    built from this one re-derive it; a hand-edited value is kept.
+
+    Returns:
+        PipelineConfig: Config matching utils.constants.
+    """
+    values = {f.name: getattr(constants, f.name.upper()) for f in dataclasses.fields(PipelineConfig)}
+    if values["closeness_threshold"] == derive_closeness_threshold(*(values[name] for name in THRESHOLD_FIELDS)):
+        values["closeness_threshold"] = None
+    return PipelineConfig(**values)
+
+
+def load_config(path: Path) -> PipelineConfig:
+    """
+    Load a config from a YAML or TOML file.
+
+    Keys may use either the constant names (CLOSENESS_THRESHOLD) or the field names
+    (closeness_threshold). Missing keys fall back to utils.constants.
+
+    Args:
+        path (Path): .yaml, .yml or .toml file.
+
+    Returns:
+        PipelineConfig: The loaded config.
+    """
+    path = Path(path)
+    if path.suffix == ".toml":
+        import tomllib
+        with open(path, 'rb') as f:
+            values = tomllib.load(f)
+    elif path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as e:
+            raise ImportError("PyYAML is required to load YAML configs (pip install pyyaml)") from e
+        with open(path, 'r', encoding='utf-8') as f:
+            values = yaml.safe_load(f) or {}
+    else:
+        raise ValueError(f"Unsupported config format: {path.suffix} (use .yaml, .yml or .toml)")
+
+    values = {key.lower(): value for key, value in values.items()}
+    unknown = set(values) - {f.name for f in dataclasses.fields(PipelineConfig)}
+    if unknown:
+        raise ValueError(f"Unknown config keys in {path}: {sorted(unknown)}")
+    return default_config().replace(**values)
@@ -12,6 +12,14 @@ MAX_PLATFORM_COUNT = 20           # meters
 MIN_PLATFORM_COUNT = 2            # meters
 DEFAULT_PLATFORM_COUNT = 5        # meters
 DEFAULT_PLATFORM_OFFSET = 2       # meters
+MAIN_LINE_SPEED = 44.44           # m/s (160 km/h), speed of main line edges
+STATION_SPEED = 11.11             # m/s (40 km/h), speed of station entry and platform edges
+PLATFORM_MITER_LIMIT = 4.0        # platform track offset corners sharper than this (miter / offset) are bevelled
+ROUTE_CHUNK_SIZE = 500            # trains resolved and written per block of the .rou.xml stream
+DETECTOR_SPACING = 2000.0         # meters, main line induction loop spacing (at multiples of the KM chainage)
+DETECTOR_SPACING_BY_LINE = {}     # Linie → meters, overrides DETECTOR_SPACING per line, e.g. {710: 1000.0}
+ENTRY_DETECTOR_OFFSET = 50.0      # meters, entry detectors sit this far before the end of each main line edge
+DETECTOR_PERIOD = 60              # seconds, aggregation period of all detectors
 CLOSENESS_THRESHOLD = (
     MAX_PLATFORM_LENGTH + ENTRY_OFFSET_BUFFER * 2 + MIN_MAIN_LINE_LENGTH
 )
@@ -20,16 +28,54 @@ CLOSENESS_THRESHOLD = (
 PLATFORM_LENGTH_DECISION_METHOD = "X" #X: maximum platform length, N: for minimum platform length, A: Average platform length D: Default platform length
 FILL_EMPTY_PLATFORM_LENGTH_DATA_WITH = "N" #D:default platform length, N: Minimum platform length, X: Maximum platform length 
 FILL_EMPTY_PLATFORM_NO_DATA_WITH = "N" #D:default platform count, N: Minimum platform count, X: Maximum platform count
+SIMPLIFY_MAX_DEVIATION = 1.0      # meters, bounded-error segment simplification
+MAP_SIMPLIFY_TOLERANCE = 2.0      # meters, Douglas-Peucker tolerance for web maps
+MAP_COORDINATE_PRECISION = 5      # lat/lon decimals in web maps (5 ≈ 1 m)
+DUPLICATE_GRID_SIZE = 10.0        # meters, geometry fingerprint lattice and sample spacing
+DUPLICATE_TOLERANCE = 5.0         # meters, max Hausdorff distance of duplicate segments
+OVERLAP_MIN_SHARE = 0.5           # covered share of a segment to report it as overlapping another
+RASTER_WIDTH = 4000               # pixels, width of the network raster (height keeps the aspect ratio)
+RASTER_COLOR_BY = "linie"         # network raster colouring: "linie", "length" or "station_type"
 
 
 RAW_DIR = Path("data/raw")
 PROCESSED_DIR = Path("data/processed")
+REPORTS_DIR = Path("reports")
 POLYGON_FILE = RAW_DIR / "linie_mit_polygon.csv"
+TIMETABLE_FILE = RAW_DIR / "timetable.csv"
 FILTERED_SUB_NETWORK_POLYGON_FILE = PROCESSED_DIR / "filtered_sub_network_data.csv"
 STATION_INFO_FILE = PROCESSED_DIR / "station_platform_info.csv"
 PLATFORM_FILE = RAW_DIR / "perronkante.csv"
 STATION_HELPER_FILE = PROCESSED_DIR / "station_info_master.csv"
+STATION_MASTER_FILE = PROCESSED_DIR / "station_master.csv"
 STATION_ENTRY_NODE_FILE = PROCESSED_DIR / "station_entry_nodes.json"
-
-
-
+STATION_DISTANCE_MATRIX_FILE = PROCESSED_DIR / "station_distance_matrix.npy"
+STATION_MATRIX_INDEX_FILE = PROCESSED_DIR / "station_matrix_index.csv"
+STATION_ADJACENCY_FILE = PROCESSED_DIR / "station_adjacency.npy"
+NETWORK_DISTANCE_MATRIX_FILE = PROCESSED_DIR / "station_network_distance_matrix.npy"
+NETWORK_PREDECESSOR_FILE = PROCESSED_DIR / "station_network_predecessors.npy"
+NETWORK_MATRIX_INDEX_FILE = PROCESSED_DIR / "station_network_matrix_index.csv"
+SUMO_DIR = PROCESSED_DIR / "sumo"
+SUMO_NODES_FILE = SUMO_DIR / "network.nod.xml"
+SUMO_EDGES_FILE = SUMO_DIR / "network.edg.xml"
+SUMO_CONNECTIONS_FILE = SUMO_DIR / "network.con.xml"
+SUMO_ROUTES_FILE = SUMO_DIR / "network.rou.xml"
+SUMO_ADDITIONALS_FILE = SUMO_DIR / "network.add.xml"
+PIPELINE_MANIFEST_FILE = PROCESSED_DIR / "pipeline_manifest.json"
+RUN_REPORT_FILE = PROCESSED_DIR / "run_report.json"
+PROFILE_DIR = PROCESSED_DIR / "profiles"
+STAGE_01_CHECKPOINT_DIR = PROCESSED_DIR / "checkpoints" / "stage_01"
+STAGE_02_PARTITION_FILE = PROCESSED_DIR / "checkpoints" / "stage_02_stations.pkl"
+STAGE_03_PARTITION_DIR = PROCESSED_DIR / "checkpoints" / "stage_03_network"
+CRS_CACHE_DIR = PROCESSED_DIR / "crs_cache"
+CH_CACHE_DIR = PROCESSED_DIR / "ch_cache"
+CH_CACHE_MAX_FILES = 8            # contraction hierarchies kept (one per network, least recently used dropped)
+STATION_DIAGNOSTICS_MAP_FILE = REPORTS_DIR / "station_diagnostics_map.html"
+GEOSHAPE_MAP_FILE = REPORTS_DIR / "filtered_line_geoshapes_map.html"
+ENTRY_APPROACH_MAP_FILE = REPORTS_DIR / "multi_entry_node.html"
+NETWORK_MAP_FILE = REPORTS_DIR / "network_map.html"
+NETWORK_RASTER_FILE = REPORTS_DIR / "network_raster.png"
+DIAGNOSTICS_REPORT_HTML_FILE = REPORTS_DIR / "diagnostics_report.html"
+DIAGNOSTICS_REPORT_JSON_FILE = REPORTS_DIR / "diagnostics_report.json"
+ROUTING_BENCHMARK_FILE = REPORTS_DIR / "routing_benchmark.json"
+SIMPLIFIED_SUB_NETWORK_POLYGON_FILE = PROCESSED_DIR / "simplified_sub_network_data.csv"
@@ -0,0 +1,283 @@
+import hashlib
+import heapq
+import logging
+import os
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.constants import CH_CACHE_DIR, CH_CACHE_MAX_FILES
+
+CACHE_FORMAT = 1
+# Witness searches stop after settling this many nodes (a missed witness only adds a redundant shortcut)
+WITNESS_SETTLE_LIMIT = 60
+NO_MIDDLE = -1
+
+
+def network_hash(edge_ids: Sequence[str], csr: Tuple[np.ndarray, np.ndarray, np.ndarray]) -> str:
+    """SHA-256 of a routing graph (edge ids and CSR arrays); equal networks share one hierarchy file."""
+    sha = hashlib.sha256()
+    sha.update("\n".join(map(str, edge_ids)).encode('utf-8'))
+    for array in csr:
+        sha.update(np.ascontiguousarray(array).tobytes())
+    return sha.hexdigest()
+
+
+def _witness_distances(out: List[Dict[int, float]], source: int, skip: int, limit: float) -> Dict[int, float]:
+    """Distances from source in the remaining graph without `skip`, up to `limit` and WITNESS_SETTLE_LIMIT nodes."""
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    settled = 0
+    while heap and settled < WITNESS_SETTLE_LIMIT:
+        d, u = heapq.heappop(heap)
+        if d > dist.get(u, np.inf) or d > limit:
+            continue
+        settled += 1
+        for v, w in out[u].items():
+            nd = d + w
+            if v != skip and nd < dist.get(v, np.inf):
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return dist
+
+
+def _shortcuts(out, inn, v: int) -> List[Tuple[int, int, float]]:
+    """Shortcuts (u, x, weight) needed to contract v: pairs of neighbours without a witness path."""
+    needed = []
+    targets = out[v]
+    if not targets:
+        return needed
+    longest = max(targets.values())
+    for u, w_in in inn[v].items():
+        dist = _witness_distances(out, u, v, w_in + longest)
+        for x, w_out in targets.items():
+            if x != u and dist.get(x, np.inf) > w_in + w_out:
+                needed.append((u, x, w_in + w_out))
+    return needed
+
+
+def prune_cache(cache_dir: Path, max_files: int = CH_CACHE_MAX_FILES) -> List[Path]:
+    """
+    Remove hierarchies of other CACHE_FORMAT versions and all but the `max_files` most recently used.
+
+    Returns:
+        List[Path]: The removed files.
+    """
+    # Yazılmakta olan geçici dosyalar (".tmp.npz") atlanır
+    stored = {path for path in Path(cache_dir).glob("ch_v*.npz") if not path.name.endswith(".tmp.npz")}
+    current = sorted((path for path in stored if path.name.startswith(f"ch_v{CACHE_FORMAT}_")),
+                     key=lambda path: path.stat().st_mtime_ns, reverse=True)
+    outdated = stored - set(current)
+    removed = sorted(outdated) + current[max_files:]
+    for path in removed:
+        path.unlink()
+    return removed
+
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy of a directed weighted graph for fast point-to-point queries.
+
+    Nodes are contracted in edge-difference order (plus contracted neighbours and
+    hierarchy depth, which keeps the hierarchy flat); shortcuts keep distances between the
+    remaining nodes. A query is a bidirectional Dijkstra on the upward graphs only,
+    which settles a few dozen nodes on rail networks instead of the whole graph.
+    Shortcuts remember their middle node, so full paths are unpacked on demand.
+
+    Example:
+        hierarchy = ContractionHierarchy.load_or_build(graph.csr, network_hash(graph.edge_ids, graph.csr))
+        distance, path = hierarchy.query(source, target)
+    """
+
+    def __init__(self, rank: np.ndarray, up: Tuple[np.ndarray, ...], down: Tuple[np.ndarray, ...]):
+        """
+        Args:
+            rank (np.ndarray): (n,) contraction order of every node.
+            up (Tuple[np.ndarray, ...]): indptr, target, weight, middle of the edges u → v with rank(v) > rank(u).
+            down (Tuple[np.ndarray, ...]): indptr, source, weight, middle of the edges u → v with rank(u) > rank(v),
+                grouped by v (searched backwards from the target).
+        """
+        self.rank, self.up, self.down = rank, up, down
+        # Sorgu döngüsü için düz Python listeleri
+        self._up = [array.tolist() for array in up]
+        self._down = [array.tolist() for array in down]
+        self._middle: Dict[Tuple[int, int], int] = {}
+        for (indptr, other, _, middle), upward in ((self._up, True), (self._down, False)):
+            for node in range(len(indptr) - 1):
+                for k in range(indptr[node], indptr[node + 1]):
+                    if middle[k] != NO_MIDDLE:
+                        self._middle[(node, other[k]) if upward else (other[k], node)] = middle[k]
+
+    def __len__(self) -> int:
+        return len(self.rank)
+
+    @property
+    def shortcut_count(self) -> int:
+        return len(self._middle)
+
+    @classmethod
+    def build(cls, csr: Tuple[np.ndarray, np.ndarray, np.ndarray],
+              logger: Optional[logging.Logger] = None) -> "ContractionHierarchy":
+        """Contract every node of a CSR graph (see graph_ops.build_csr with directed=True)."""
+        logger = logger or logging.getLogger(__name__)
+        indptr, indices, data = (array.tolist() for array in csr)
+        n = len(indptr) - 1
+        out: List[Dict[int, float]] = [{} for _ in range(n)]
+        inn: List[Dict[int, float]] = [{} for _ in range(n)]
+        for u in range(n):
+            for k in range(indptr[u], indptr[u + 1]):
+                v, w = indices[k], data[k]
+                if v != u and w < out[u].get(v, np.inf):
+                    out[u][v] = inn[v][u] = w
+        middle: Dict[Tuple[int, int], int] = {}
+        deleted = [0] * n
+        level = [0] * n
+
+        def priority(v: int) -> int:
+            return 2 * (len(_shortcuts(out, inn, v)) - len(out[v]) - len(inn[v])) + deleted[v] + level[v]
+
+        heap = [(priority(v), v) for v in range(n)]
+        heapq.heapify(heap)
+        rank = np.zeros(n, dtype=np.int64)
+        up_edges, down_edges = [], []
+        order = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            # Tembel güncelleme: öncelik değiştiyse sıraya geri
+            current = priority(v)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, v))
+                continue
+            rank[v] = order
+            order += 1
+            for x, w in out[v].items():
+                up_edges.append((v, x, w, middle.get((v, x), NO_MIDDLE)))
+            for u, w in inn[v].items():
+                down_edges.append((v, u, w, middle.get((u, v), NO_MIDDLE)))
+            for u, x, w in _shortcuts(out, inn, v):
+                if w < out[u].get(x, np.inf):
+                    out[u][x] = inn[x][u] = w
+                    middle[(u, x)] = v
+            for x in out[v]:
+                del inn[x][v]
+                deleted[x] += 1
+                level[x] = max(level[x], level[v] + 1)
+            for u in inn[v]:
+                del out[u][v]
+                deleted[u] += 1
+                level[u] = max(level[u], level[v] + 1)
+            out[v], inn[v] = {}, {}
+            if order % 10000 == 0:
+                logger.debug(f"🔧 Contracted {order}/{n} nodes")
+        logger.info(f"🔧 Contraction hierarchy: {n} nodes, {len(up_edges) + len(down_edges)} upward edges "
+                    f"({sum(1 for e in up_edges + down_edges if e[3] != NO_MIDDLE)} shortcuts)")
+        return cls(rank, _group(up_edges, n), _group(down_edges, n))
+
+    def save(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_suffix('.tmp.npz')
+        np.savez(tmp_file, rank=self.rank, **{f"up_{i}": a for i, a in enumerate(self.up)},
+                 **{f"down_{i}": a for i, a in enumerate(self.down)})
+        tmp_file.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "ContractionHierarchy":
+        with np.load(path) as stored:
+            return cls(stored["rank"], tuple(stored[f"up_{i}"] for i in range(4)),
+                       tuple(stored[f"down_{i}"] for i in range(4)))
+
+    @classmethod
+    def load_or_build(cls, csr: Tuple[np.ndarray, np.ndarray, np.ndarray], key: str,
+                      cache_dir: Path = CH_CACHE_DIR, max_files: int = CH_CACHE_MAX_FILES,
+                      logger: Optional[logging.Logger] = None) -> "ContractionHierarchy":
+        """
+        Load the hierarchy stored for this network hash, or build and store it.
+
+        One file is kept per network hash, so alternating between networks (e.g. two
+        study areas) loads both. Files of other CACHE_FORMAT versions are removed, and
+        beyond `max_files` the least recently used hierarchies are dropped.
+        """
+        logger = logger or logging.getLogger(__name__)
+        cache_dir = Path(cache_dir)
+        cache_file = cache_dir / f"ch_v{CACHE_FORMAT}_{key[:16]}.npz"
+        if cache_file.exists():
+            # Son kullanım zamanı: LRU temizliği mtime'a göre
+            os.utime(cache_file)
+            return cls.load(cache_file)
+        hierarchy = cls.build(csr, logger)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        hierarchy.save(cache_file)
+        prune_cache(cache_dir, max_files)
+        logger.info(f"💾 Contraction hierarchy cached in {cache_file}")
+        return hierarchy
+
+    def distance(self, source: int, target: int) -> float:
+        return self.query(source, target, unpack=False)[0]
+
+    def query(self, source: int, target: int, unpack: bool = True) -> Tuple[float, Optional[List[int]]]:
+        """
+        Shortest distance and node path from source to target (inf and None if unreachable).
+        """
+        if source == target:
+            return 0.0, [source]
+        searches = ((self._up, {source: 0.0}, {source: -1}, [(0.0, source)]),
+                    (self._down, {target: 0.0}, {target: -1}, [(0.0, target)]))
+        best, meeting = np.inf, -1
+        active = [True, True]
+        while active[0] or active[1]:
+            for side, ((indptr, other, weight, _), dist, pred, heap) in enumerate(searches):
+                if not active[side]:
+                    continue
+                if not heap or heap[0][0] >= best:
+                    active[side] = False
+                    continue
+                d, u = heapq.heappop(heap)
+                if d > dist[u]:
+                    continue
+                opposite = searches[1 - side][1]
+                if u in opposite and d + opposite[u] < best:
+                    best, meeting = d + opposite[u], u
+                for k in range(indptr[u], indptr[u + 1]):
+                    v, nd = other[k], d + weight[k]
+                    if nd < dist.get(v, np.inf):
+                        dist[v] = nd
+                        pred[v] = u
+                        heapq.heappush(heap, (nd, v))
+        if meeting < 0:
+            return np.inf, None
+        if not unpack:
+            return best, None
+        forward, backward = searches[0][2], searches[1][2]
+        nodes = [meeting]
+        while forward[nodes[-1]] >= 0:
+            nodes.append(forward[nodes[-1]])
+        nodes.reverse()
+        while backward[nodes[-1]] >= 0:
+            nodes.append(backward[nodes[-1]])
+        return best, self._unpack(nodes)
+
+    def _unpack(self, nodes: List[int]) -> List[int]:
+        """Replace every shortcut of a node path by the original edges it stands for."""
+        path = [nodes[0]]
+        stack = [(nodes[i], nodes[i + 1]) for i in reversed(range(len(nodes) - 1))]
+        while stack:
+            a, b = stack.pop()
+            middle = self._middle.get((a, b))
+            if middle is None:
+                path.append(b)
+            else:
+                stack.append((middle, b))
+                stack.append((a, middle))
+        return path
+
+
+def _group(edges: List[Tuple[int, int, float, int]], n: int) -> Tuple[np.ndarray, ...]:
+    """(node, other, weight, middle) tuples as CSR arrays grouped by node."""
+    edges = np.array(edges, dtype=np.float64).reshape(-1, 4)
+    order = np.argsort(edges[:, 0], kind='stable')
+    edges = edges[order]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(edges[:, 0].astype(np.int64), minlength=n), out=indptr[1:])
+    return indptr, edges[:, 1].astype(np.int64), edges[:, 2], edges[:, 3].astype(np.int64)
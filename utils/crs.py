@@ -0,0 +1,141 @@
+import json
+import logging
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+from pyproj import Transformer
+
+from utils.constants import CRS_CACHE_DIR
+from utils.pipeline import file_digest
+
+# Swiss LV95 (input data) → WGS84 (web maps)
+SOURCE_CRS = "EPSG:2056"
+TARGET_CRS = "EPSG:4326"
+# Bumped whenever the .npz layout changes, so older cache files are ignored
+CACHE_FORMAT = 2
+
+
+@lru_cache(maxsize=None)
+def get_transformer(source: str = SOURCE_CRS, target: str = TARGET_CRS) -> Transformer:
+    """
+    Shared, cached pyproj transformer (x/y axis order).
+
+    Args:
+        source (str, optional): Source CRS. Defaults to EPSG:2056.
+        target (str, optional): Target CRS. Defaults to EPSG:4326.
+
+    Returns:
+        Transformer: Cached transformer instance.
+    """
+    return Transformer.from_crs(source, target, always_xy=True)
+
+
+def pack_coordinates(coord_lists: Sequence[Sequence[Sequence[float]]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pack many polylines into one flat coordinate buffer.
+
+    Args:
+        coord_lists (Sequence): One [[x, y], ...] list per polyline (empty lists allowed).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (N, 2) float64 buffer and (M + 1,) int64 offsets;
+        polyline i is xy[offsets[i]:offsets[i + 1]].
+    """
+    lengths = np.fromiter((len(c) for c in coord_lists), dtype=np.int64, count=len(coord_lists))
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    xy = np.empty((offsets[-1], 2), dtype=np.float64)
+    for i, coords in enumerate(coord_lists):
+        if len(coords):
+            # Only x/y are kept (some shapes carry a z value)
+            xy[offsets[i]:offsets[i + 1]] = np.asarray(coords, dtype=np.float64)[:, :2]
+    return xy, offsets
+
+
+def unpack_coordinates(xy: np.ndarray, offsets: np.ndarray) -> List[np.ndarray]:
+    """Split a flat buffer back into one array (view) per polyline."""
+    return [xy[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+def to_wgs84(xy: np.ndarray, transformer: Transformer = None) -> np.ndarray:
+    """
+    Convert a flat EPSG:2056 buffer to WGS84 in a single array call.
+
+    Args:
+        xy (np.ndarray): (N, 2) array of [x, y].
+        transformer (Transformer, optional): Defaults to get_transformer().
+
+    Returns:
+        np.ndarray: (N, 2) array of [lat, lon] (folium order).
+    """
+    transformer = transformer or get_transformer()
+    xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+    lon, lat = transformer.transform(xy[:, 0], xy[:, 1])
+    return np.column_stack([lat, lon])
+
+
+def parse_coordinates(value) -> list:
+    """
+    Parse a 'Geo shape' GeoJSON string or a '_coordinates' list string into [[x, y], ...].
+    """
+    if not isinstance(value, str):
+        return []
+    try:
+        parsed = json.loads(value.replace("'", '"'))
+    except Exception:
+        return []
+    if isinstance(parsed, dict):
+        parsed = parsed.get("coordinates", [])
+    return parsed if isinstance(parsed, list) and all(isinstance(c, list) for c in parsed) else []
+
+
+def artifact_coordinates(path: Path, column: str = "Geo shape", sep: str = ';',
+                         cache_dir: Path = CRS_CACHE_DIR) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    EPSG:2056 and WGS84 coordinates of every row's polyline in a CSV artifact, cached on disk.
+
+    The cache is keyed by the artifact's content hash, so an unchanged file is neither
+    re-parsed nor re-projected. Rows that fail to parse get an empty polyline, so
+    offsets stay aligned with pd.read_csv(path, sep=sep).
+
+    Args:
+        path (Path): CSV artifact (e.g. FILTERED_SUB_NETWORK_POLYGON_FILE).
+        column (str, optional): Geometry column ("Geo shape" or "_coordinates"). Defaults to "Geo shape".
+        sep (str, optional): CSV separator. Defaults to ';'.
+        cache_dir (Path, optional): Cache directory. Defaults to CRS_CACHE_DIR.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: (N, 2) [x, y] buffer, (N, 2) [lat, lon] buffer
+        and (rows + 1,) offsets.
+    """
+    path, cache_dir = Path(path), Path(cache_dir)
+    prefix = f"{path.stem}_{column.strip('_').replace(' ', '_').lower()}"
+    cache_file = cache_dir / f"{prefix}_v{CACHE_FORMAT}_{file_digest(path)[:16]}.npz"
+    if cache_file.exists():
+        with np.load(cache_file) as cached:
+            return cached["xy"], cached["latlon"], cached["offsets"]
+
+    values = pd.read_csv(path, sep=sep, usecols=[column])[column]
+    xy, offsets = pack_coordinates([parse_coordinates(v) for v in values])
+    latlon = to_wgs84(xy)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for stale in cache_dir.glob(f"{prefix}_*.npz"):
+        stale.unlink()
+    tmp_file = cache_file.with_suffix('.tmp.npz')
+    np.savez(tmp_file, xy=xy, latlon=latlon, offsets=offsets)
+    tmp_file.replace(cache_file)
+    logging.info(f"🌍 Projected {len(latlon)} vertices of {path.name} to WGS84 (cached in {cache_file})")
+    return xy, latlon, offsets
+
+
+def artifact_wgs84(path: Path, column: str = "Geo shape", sep: str = ';',
+                   cache_dir: Path = CRS_CACHE_DIR) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    WGS84 [lat, lon] buffer and offsets of a CSV artifact's polylines (see artifact_coordinates).
+    """
+    _, latlon, offsets = artifact_coordinates(path, column, sep, cache_dir)
+    return latlon, offsets
@@ -0,0 +1,303 @@
+import io
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_BLOCK_BYTES = 64 * 1024 * 1024
+SKETCH_SIZE = 1024
+GEOMETRY_PREFIXES = ('{', '[')
+
+
+# ─────────────────────────────────────────────────────
+# Approximate distinct counts (k minimum values sketch)
+# ─────────────────────────────────────────────────────
+def distinct_sketch(values: pd.Series, k: int = SKETCH_SIZE) -> np.ndarray:
+    """The k smallest distinct 64-bit hashes of the values; mergeable across chunks."""
+    hashes = np.unique(pd.util.hash_pandas_object(values, index=False).to_numpy())
+    return hashes[:k]
+
+
+def merge_sketches(a: np.ndarray, b: np.ndarray, k: int = SKETCH_SIZE) -> np.ndarray:
+    return np.union1d(a, b)[:k]
+
+
+def estimate_distinct(sketch: np.ndarray, k: int = SKETCH_SIZE) -> int:
+    """Exact below k distinct values, otherwise the KMV estimate (about 3 % error for k=1024)."""
+    if len(sketch) < k:
+        return len(sketch)
+    return int(round((k - 1) * 2.0 ** 64 / (float(sketch[k - 1]) + 1.0)))
+
+
+# ─────────────────────────────────────────────────────
+# Blocks
+# ─────────────────────────────────────────────────────
+def read_header(path: Path) -> Tuple[bytes, int]:
+    """The header line (including the newline) and the byte offset where the data starts."""
+    with open(path, 'rb') as f:
+        header = f.readline()
+    return header, len(header)
+
+
+def split_blocks(path: Path, block_bytes: int = DEFAULT_BLOCK_BYTES) -> List[Tuple[int, int]]:
+    """
+    Split the data part of a CSV into byte ranges of roughly block_bytes that end on a line break.
+
+    Quoted fields containing line breaks are not supported (the raw files have none).
+
+    Returns:
+        List[Tuple[int, int]]: (start, end) byte offsets.
+    """
+    _, start = read_header(path)
+    size = os.path.getsize(path)
+    blocks = []
+    with open(path, 'rb') as f:
+        while start < size:
+            end = size
+            if start + block_bytes < size:
+                f.seek(start + block_bytes)
+                f.readline()
+                end = f.tell()
+            blocks.append((start, end))
+            start = end
+    return blocks
+
+
+def count_lines(path: Path, start: int, end: int, buffer_bytes: int = 16 * 1024 * 1024) -> int:
+    """Number of data rows in a byte range, counted on the raw bytes without parsing."""
+    rows, last = 0, b'\n'
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            data = f.read(min(buffer_bytes, remaining))
+            if not data:
+                break
+            rows += data.count(b'\n')
+            last = data[-1:]
+            remaining -= len(data)
+    return rows + (last != b'\n')
+
+
+def profile_frame(df: pd.DataFrame) -> dict:
+    """
+    Mergeable statistics of one chunk read with dtype=str.
+
+    Returns:
+        dict: {"rows", "columns": {name: {...}}}.
+    """
+    columns = {}
+    for name in df.columns:
+        values = df[name].dropna()
+        numbers = pd.to_numeric(values, errors='coerce').dropna()
+        lengths = values.str.len()
+        columns[name] = {
+            "non_null": len(values),
+            "nulls": len(df) - len(values),
+            "numeric": len(numbers),
+            "integer": int((numbers == np.floor(numbers)).sum()),
+            "min": float(numbers.min()) if len(numbers) else None,
+            "max": float(numbers.max()) if len(numbers) else None,
+            "text_min": values.min() if len(values) and len(numbers) < len(values) else None,
+            "text_max": values.max() if len(values) and len(numbers) < len(values) else None,
+            "geometry": int(values.str.startswith(GEOMETRY_PREFIXES).sum()),
+            "length_sum": int(lengths.sum()),
+            "length_min": int(lengths.min()) if len(values) else None,
+            "length_max": int(lengths.max()) if len(values) else None,
+            "sketch": distinct_sketch(values),
+        }
+    return {"rows": len(df), "columns": columns}
+
+
+def _extreme(a, b, func):
+    return b if a is None else a if b is None else func(a, b)
+
+
+def merge_profiles(a: Optional[dict], b: dict) -> dict:
+    """Combine two chunk profiles of the same file."""
+    if a is None:
+        return b
+    columns = dict(a["columns"])
+    for name, s in b["columns"].items():
+        t = columns.get(name)
+        if t is None:
+            columns[name] = s
+            continue
+        columns[name] = {
+            **{key: t[key] + s[key] for key in ("non_null", "nulls", "numeric", "integer", "geometry", "length_sum")},
+            "min": _extreme(t["min"], s["min"], min), "max": _extreme(t["max"], s["max"], max),
+            "text_min": _extreme(t["text_min"], s["text_min"], min),
+            "text_max": _extreme(t["text_max"], s["text_max"], max),
+            "length_min": _extreme(t["length_min"], s["length_min"], min),
+            "length_max": _extreme(t["length_max"], s["length_max"], max),
+            "sketch": merge_sketches(t["sketch"], s["sketch"]),
+        }
+    return {"rows": a["rows"] + b["rows"], "columns": columns}
+
+
+def profile_block(path: Path, start: int, end: int, sep: str = ';', profile: bool = True,
+                  chunk_rows: int = 200_000) -> dict:
+    """
+    Profile (or, with profile=False, only count the rows of) one byte range of a CSV.
+
+    Only the range itself is held in memory; it is parsed in chunks of chunk_rows.
+    """
+    if not profile:
+        return {"rows": count_lines(path, start, end), "profiled_rows": 0, "profile": None}
+    header, _ = read_header(path)
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    result = None
+    reader = pd.read_csv(io.BytesIO(header + data), sep=sep, dtype=str, encoding='utf-8-sig',
+                         chunksize=chunk_rows, on_bad_lines='warn')
+    for chunk in reader:
+        result = merge_profiles(result, profile_frame(chunk))
+    if result is None:
+        result = {"rows": 0, "columns": {}}
+    return {"rows": result["rows"], "profiled_rows": result["rows"], "profile": result}
+
+
+# ─────────────────────────────────────────────────────
+# Files
+# ─────────────────────────────────────────────────────
+def summarize_profile(path: Path, rows: int, profiled_rows: int, profile: Optional[dict]) -> dict:
+    """Turn merged statistics into the reported per-column values."""
+    header, _ = read_header(path)
+    names = pd.read_csv(io.BytesIO(header), sep=';', encoding='utf-8-sig').columns.tolist()
+    columns = []
+    for name in names:
+        s = (profile or {"columns": {}})["columns"].get(name)
+        if s is None:
+            columns.append({"column": name})
+            continue
+        seen = s["non_null"] + s["nulls"]
+        if s["non_null"] == 0:
+            inferred = "empty"
+        elif s["geometry"] == s["non_null"]:
+            inferred = "geometry"
+        elif s["numeric"] == s["non_null"]:
+            inferred = "integer" if s["integer"] == s["numeric"] else "float"
+        else:
+            inferred = "string"
+        column = {
+            "column": name,
+            "type": inferred,
+            "null_rate": round(s["nulls"] / seen, 4) if seen else None,
+            "distinct_approx": estimate_distinct(s["sketch"]),
+            "min": s["min"] if inferred in ("integer", "float") else None if inferred == "geometry" else s["text_min"],
+            "max": s["max"] if inferred in ("integer", "float") else None if inferred == "geometry" else s["text_max"],
+        }
+        if inferred == "geometry":
+            column.update(chars_min=s["length_min"], chars_max=s["length_max"],
+                          chars_mean=round(s["length_sum"] / s["non_null"], 1), chars_total=s["length_sum"])
+        columns.append(column)
+    return {
+        "path": str(path), "file_name": os.path.basename(path), "bytes": os.path.getsize(path),
+        "rows": rows, "profiled_rows": profiled_rows, "columns": columns,
+    }
+
+
+def profile_directory(directory: Path, jobs: int = 1, sample: float = 1.0,
+                      block_bytes: int = DEFAULT_BLOCK_BYTES, seed: int = 0) -> List[dict]:
+    """
+    Profile every CSV in a directory. All blocks of all files are spread over one process pool.
+
+    Row counts are always exact. With sample < 1 only that share of the blocks (at least one
+    per file) is parsed; the other blocks are only line-counted, so null rates, types, min/max,
+    distinct counts and geometry sizes are estimates from the sampled blocks.
+
+    Args:
+        directory (Path): Directory with *.csv files (';'-separated).
+        jobs (int, optional): Worker processes. Defaults to 1.
+        sample (float, optional): Share of blocks to parse, in (0, 1]. Defaults to 1.0.
+        block_bytes (int, optional): Target block size. Defaults to 64 MB.
+        seed (int, optional): Seed of the block sample. Defaults to 0.
+
+    Returns:
+        List[dict]: One summary per file (see summarize_profile), sorted by file name; a file that
+        could not be read gets {"path", "file_name", "error"} instead.
+    """
+    if not 0 < sample <= 1:
+        raise ValueError(f"sample must be in (0, 1], got {sample}")
+    rng = np.random.default_rng(seed)
+    tasks = []
+    errors: Dict[Path, str] = {}
+    for path in sorted(Path(directory).glob("*.csv")):
+        try:
+            blocks = split_blocks(path, block_bytes)
+        except Exception as e:
+            errors[path] = f"{type(e).__name__}: {e}"
+            continue
+        selected = np.ones(len(blocks), dtype=bool)
+        if sample < 1 and len(blocks) > 1:
+            selected = rng.random(len(blocks)) < sample
+            selected[rng.integers(len(blocks))] = True
+        tasks += [(path, start, end, bool(keep)) for (start, end), keep in zip(blocks, selected)]
+        if not blocks:
+            tasks.append((path, 0, 0, False))
+
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_profile_task, tasks))
+    else:
+        results = [_profile_task(task) for task in tasks]
+
+    merged: Dict[Path, dict] = {}
+    for (path, *_), result in zip(tasks, results):
+        if "error" in result:
+            # Bir bloğu okunamayan dosya tümüyle hatalı raporlanır, diğer dosyalar etkilenmez
+            errors.setdefault(path, result["error"])
+            continue
+        current = merged.setdefault(path, {"rows": 0, "profiled_rows": 0, "profile": None})
+        current["rows"] += result["rows"]
+        current["profiled_rows"] += result["profiled_rows"]
+        if result["profile"] is not None:
+            current["profile"] = merge_profiles(current["profile"], result["profile"])
+
+    summaries = {}
+    for path, values in merged.items():
+        if path in errors:
+            continue
+        try:
+            summaries[path] = summarize_profile(path, **values)
+        except Exception as e:
+            errors[path] = f"{type(e).__name__}: {e}"
+    summaries.update({path: {"path": str(path), "file_name": os.path.basename(path), "error": error}
+                      for path, error in errors.items()})
+    return [summaries[path] for path in sorted(summaries)]
+
+
+def _profile_task(task) -> dict:
+    """Profile one block; a read error is returned as {"error": ...} instead of aborting the run."""
+    path, start, end, profile = task
+    if end <= start:
+        return {"rows": 0, "profiled_rows": 0, "profile": None}
+    try:
+        return profile_block(path, start, end, profile=profile)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def format_profile(summary: dict) -> str:
+    """Text report of one file, in the layout of the earlier directory diagnostics."""
+    if "error" in summary:
+        return f"❌ Error reading file: {summary['path']}\nReason: {summary['error']}\n{'─' * 60}\n"
+    report = [
+        "🧾 CSV Profile Report",
+        "─" * 60,
+        f"📂 File Path : {summary['path']}",
+        f"📄 File Name : {summary['file_name']}",
+        f"💾 Size : {summary['bytes'] / 1024 / 1024:.1f} MB",
+        f"🔢 Number of Rows : {summary['rows']}",
+    ]
+    if summary["profiled_rows"] < summary["rows"]:
+        report.append(f"🎲 Column statistics sampled from {summary['profiled_rows']} rows")
+    report.append("\n📌 Columns:")
+    table = pd.DataFrame(summary["columns"]).set_index("column")
+    with pd.option_context('display.max_columns', None, 'display.width', 200, 'display.max_colwidth', 30):
+        report.append(str(table))
+    report.append("─" * 60 + "\n")
+    return "\n".join(report)
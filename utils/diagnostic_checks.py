@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+from utils.diagnostics import DiagnosticsContext, register_check
+from utils.duplicate_ops import find_duplicate_geometry
+
+SEGMENT_KEY = ['Linie', 'START_OP', 'END_OP', 'KM START', 'KM END']
+LENGTH_BINS = [0, 500, 1000, 2000, 5000, 10000, np.inf]
+TOP_N = 10
+
+
+@register_check("polygon_length_distribution", "Polygon length distribution", tables=["segments"])
+def polygon_length_distribution(context: DiagnosticsContext) -> dict:
+    df = context.table("segments")
+    lengths = pd.to_numeric(df['polygon_length'], errors='coerce')
+    geometry_lengths = context.segment_geometry_lengths("segments")
+    mismatch = np.abs(lengths.to_numpy() - geometry_lengths) > 1.0
+
+    bins = pd.cut(lengths, LENGTH_BINS, right=False).value_counts(sort=False)
+    histogram = pd.DataFrame({"length_bin_m": bins.index.astype(str), "segments": bins.to_numpy()})
+    threshold = context.config.closeness_threshold
+    short = df[lengths < threshold]
+
+    warnings = []
+    if lengths.isna().any():
+        warnings.append(f"{int(lengths.isna().sum())} segments have a non-numeric polygon_length")
+    if mismatch.any():
+        warnings.append(f"{int(mismatch.sum())} segments differ by more than 1 m from their Geo shape length")
+    if len(short):
+        warnings.append(f"{len(short)} segments are shorter than CLOSENESS_THRESHOLD ({threshold} m)")
+    return {
+        "summary": {**{k: round(float(v), 2) for k, v in lengths.describe().items()},
+                    "below_closeness_threshold": len(short), "geometry_length_mismatches": int(mismatch.sum())},
+        "tables": {
+            "histogram": histogram,
+            "below_closeness_threshold": short[['Linie', 'START_OP', 'END_OP', 'polygon_length']],
+        },
+        "warnings": warnings,
+    }
+
+
+@register_check("top_bottom_segments", f"Top/bottom {TOP_N} segments by length", tables=["segments"])
+def top_bottom_segments(context: DiagnosticsContext) -> dict:
+    df = context.table("segments")[['Linie', 'START_OP', 'END_OP', 'polygon_length']]
+    df = df.assign(polygon_length=pd.to_numeric(df['polygon_length'], errors='coerce'))
+    return {"tables": {
+        "shortest": df.nsmallest(TOP_N, 'polygon_length'),
+        "longest": df.nlargest(TOP_N, 'polygon_length'),
+    }}
+
+
+@register_check("perronkante_stats", "Perronkante (platform edge) statistics", tables=["platforms"])
+def perronkante_stats(context: DiagnosticsContext) -> dict:
+    df = context.table("platforms")
+    lengths = pd.to_numeric(df['Length of platform edge'], errors='coerce').dropna()
+    platforms = df.assign(**{'Length of platform edge': pd.to_numeric(df['Length of platform edge'], errors='coerce')})
+    platforms = platforms[['Station abbreviation', 'Stop name', 'Length of platform edge']].dropna()
+    platform_counts = (df.groupby('Station abbreviation')['Platform number'].nunique()
+                       .sort_values(ascending=False).head(TOP_N).rename('platforms').reset_index())
+    return {
+        "summary": {
+            "rows": len(df),
+            "stations": int(df['Station abbreviation'].nunique()),
+            **{f"length_{k}": round(float(v), 2) for k, v in lengths.describe().items() if k != 'count'},
+        },
+        "tables": {
+            "shortest_platforms": platforms.nsmallest(TOP_N, 'Length of platform edge'),
+            "longest_platforms": platforms.nlargest(TOP_N, 'Length of platform edge'),
+            "most_platforms": platform_counts,
+        },
+    }
+
+
+@register_check("duplicate_segments", "Duplicate segments", tables=["segments", "raw_segments"])
+def duplicate_segments(context: DiagnosticsContext) -> dict:
+    tables, summary, warnings = {}, {}, []
+    for name in ("raw_segments", "segments"):
+        df = context.table(name)
+        if name == "raw_segments":
+            df = df[df['Linie'].isin(context.config.line_id_list)]
+        duplicates = df[df.duplicated(subset=SEGMENT_KEY, keep=False)]
+        summary[f"{name}_duplicate_rows"] = len(duplicates)
+        if len(duplicates):
+            warnings.append(f"{len(duplicates)} duplicate rows in {name} (all occurrences)")
+            tables[name] = duplicates[SEGMENT_KEY].sort_values(SEGMENT_KEY)
+    return {"summary": summary, "tables": tables, "warnings": warnings}
+
+
+@register_check("multi_segment_station_pairs", "Station pairs with several segments", tables=["segments"])
+def multi_segment_station_pairs(context: DiagnosticsContext) -> dict:
+    df = context.table("segments")
+    pair = np.where(df['START_OP'] < df['END_OP'],
+                    df['START_OP'] + ' - ' + df['END_OP'], df['END_OP'] + ' - ' + df['START_OP'])
+    grouped = (df.assign(station_pair=pair)
+               .groupby('station_pair')
+               .agg(segments=('Linie', 'size'),
+                    lines=('Linie', lambda s: ', '.join(map(str, sorted(set(s))))),
+                    min_length=('polygon_length', 'min'),
+                    max_length=('polygon_length', 'max'))
+               .reset_index())
+    multi = grouped[grouped['segments'] > 1].sort_values('segments', ascending=False)
+    return {
+        "summary": {"station_pairs": len(grouped), "pairs_with_several_segments": len(multi)},
+        "tables": {"station_pairs": multi},
+    }
+
+
+@register_check("geometry_duplicates", "Duplicate and overlapping geometry across lines", tables=["segments"])
+def geometry_duplicates(context: DiagnosticsContext) -> dict:
+    df = context.table("segments")
+    xy, offsets = context.segment_buffer("segments")
+    config = context.config
+    pairs = find_duplicate_geometry(xy, offsets, config.duplicate_grid_size, config.duplicate_tolerance,
+                                    config.overlap_min_share)
+    a, b = df.iloc[pairs['a']].reset_index(drop=True), df.iloc[pairs['b']].reset_index(drop=True)
+    table = pd.DataFrame({
+        "kind": pairs['kind'],
+        "segment_a": a['Linie'].astype(str) + ' ' + a['START_OP'] + '-' + a['END_OP'],
+        "segment_b": b['Linie'].astype(str) + ' ' + b['START_OP'] + '-' + b['END_OP'],
+        "same_linie": (a['Linie'] == b['Linie']).to_numpy(),
+        "reversed": pairs['reversed'],
+        "hausdorff_m": pairs['hausdorff_m'].round(2),
+        "share_a": pairs['share_a'].round(3),
+        "share_b": pairs['share_b'].round(3),
+    })
+    duplicates = int((table['kind'] == 'duplicate').sum())
+    overlaps = int((table['kind'] == 'overlap').sum())
+    warnings = []
+    if duplicates:
+        warnings.append(f"{duplicates} segment pairs share the same geometry "
+                        f"(within {config.duplicate_tolerance} m)")
+    return {
+        "summary": {"duplicate_pairs": duplicates, "overlap_pairs": overlaps,
+                    "cross_line_pairs": int((~table['same_linie']).sum())},
+        "tables": {"pairs": table.sort_values(['kind', 'hausdorff_m'])},
+        "warnings": warnings,
+    }
@@ -0,0 +1,167 @@
+import html
+import json
+import logging
+import time
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from utils.config import PipelineConfig, default_config
+from utils.crs import pack_coordinates, parse_coordinates
+from utils.geometry_ops import polyline_lengths
+from utils.pipeline import resolve_path
+
+# Tables shared by all checks: name → (file constant in utils.constants, pd.read_csv kwargs)
+ARTIFACTS = {
+    "segments": ("FILTERED_SUB_NETWORK_POLYGON_FILE", {"sep": ';'}),
+    "raw_segments": ("POLYGON_FILE", {"sep": ';'}),
+    "platforms": ("PLATFORM_FILE", {"sep": ';'}),
+}
+
+# Registered checks: name → {"title", "tables", "func"}
+CHECKS: Dict[str, dict] = {}
+
+
+def register_check(name: str, title: str, tables: List[str]):
+    """
+    Decorator registering a diagnostics check.
+
+    The check is called as func(context) and returns a dict with optional keys
+    "summary" (flat dict of values), "tables" (name → DataFrame) and "warnings" (list of str).
+
+    Args:
+        name (str): Unique check name.
+        title (str): Heading in the report.
+        tables (List[str]): ARTIFACTS the check reads; checks whose tables are missing are skipped.
+    """
+    def decorator(func: Callable) -> Callable:
+        if name in CHECKS:
+            raise ValueError(f"Diagnostics check {name} is registered twice")
+        CHECKS[name] = {"title": title, "tables": list(tables), "func": func}
+        return func
+    return decorator
+
+
+class DiagnosticsContext:
+    """
+    Loads every artifact at most once and shares it (and derived data) between checks.
+
+    Checks read their tunables from `config`, so a report follows the config the
+    pipeline runs with rather than utils.constants.
+    """
+
+    def __init__(self, paths: Optional[Dict[str, Path]] = None, config: Optional[PipelineConfig] = None):
+        self.paths = {name: resolve_path(constant) for name, (constant, _) in ARTIFACTS.items()}
+        self.paths.update(paths or {})
+        self.config = config or default_config()
+        self._tables = {}
+        self._derived = {}
+
+    def available(self, name: str) -> bool:
+        return Path(self.paths[name]).exists()
+
+    def table(self, name: str) -> pd.DataFrame:
+        """The artifact as a DataFrame, read on first use. Checks must not modify it."""
+        if name not in self._tables:
+            started = time.perf_counter()
+            self._tables[name] = pd.read_csv(self.paths[name], **ARTIFACTS[name][1])
+            logging.info(f"📥 Loaded {name} ({len(self._tables[name])} rows) in {time.perf_counter() - started:.2f} s")
+        return self._tables[name]
+
+    def segment_buffer(self, name: str = "segments"):
+        """The 'Geo shape' column of a segment table as a flat (xy, offsets) buffer, packed once."""
+        key = ("buffer", name)
+        if key not in self._derived:
+            self._derived[key] = pack_coordinates([parse_coordinates(v) for v in self.table(name)['Geo shape']])
+        return self._derived[key]
+
+    def segment_geometry_lengths(self, name: str = "segments") -> np.ndarray:
+        """Polyline length of every row of a segment table, recomputed once from 'Geo shape'."""
+        key = ("geometry_lengths", name)
+        if key not in self._derived:
+            self._derived[key] = polyline_lengths(*self.segment_buffer(name))
+        return self._derived[key]
+
+
+def run_checks(context: DiagnosticsContext, names: Optional[List[str]] = None) -> List[dict]:
+    """
+    Run the selected registered checks over a shared context.
+
+    Args:
+        context (DiagnosticsContext): Shared tables.
+        names (List[str], optional): Checks to run. Defaults to all registered checks.
+
+    Returns:
+        List[dict]: One result per check with name, title, status (ok/warning/skipped/error),
+        seconds, summary, tables and warnings.
+    """
+    unknown = set(names or []) - set(CHECKS)
+    if unknown:
+        raise KeyError(f"Unknown diagnostics checks: {sorted(unknown)}. Known: {sorted(CHECKS)}")
+
+    results = []
+    for name in names or list(CHECKS):
+        check = CHECKS[name]
+        result = {"name": name, "title": check["title"], "summary": {}, "tables": {}, "warnings": []}
+        missing = [t for t in check["tables"] if not context.available(t)]
+        started = time.perf_counter()
+        if missing:
+            result.update(status="skipped", warnings=[f"missing tables: {missing}"])
+        else:
+            try:
+                result.update(check["func"](context))
+                result["status"] = "warning" if result["warnings"] else "ok"
+            except Exception as e:
+                logging.exception(f"❌ Diagnostics check {name} failed")
+                result.update(status="error", warnings=[f"{type(e).__name__}: {e}"])
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        logging.info(f"🔎 {name}: {result['status']} ({result['seconds']} s)")
+        results.append(result)
+    return results
+
+
+def write_json_report(path: Path, results: List[dict]) -> Path:
+    """Write the results as JSON (tables as lists of records)."""
+    report = {
+        "created_at": datetime.now().isoformat(timespec='seconds'),
+        "checks": [
+            {**result, "tables": {name: json.loads(table.to_json(orient='records'))
+                                  for name, table in result["tables"].items()}}
+            for result in results
+        ],
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+    return path
+
+
+def write_html_report(path: Path, results: List[dict]) -> Path:
+    """Write the results as one self-contained HTML page."""
+    icons = {"ok": "✅", "warning": "⚠️", "skipped": "⏭️", "error": "❌"}
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Network diagnostics</title>",
+        "<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin:.5em 0 1.5em}"
+        "td,th{border:1px solid #ccc;padding:2px 8px;text-align:right}th{background:#eee}"
+        ".warn{color:#a60}</style></head><body>",
+        f"<h1>Network diagnostics</h1><p>{datetime.now():%Y-%m-%d %H:%M}</p><ul>",
+    ]
+    parts += [f"<li>{icons[r['status']]} <a href='#{r['name']}'>{html.escape(r['title'])}</a> ({r['status']})</li>"
+              for r in results]
+    parts.append("</ul>")
+    for result in results:
+        parts.append(f"<h2 id='{result['name']}'>{icons[result['status']]} {html.escape(result['title'])}</h2>")
+        parts += [f"<p class='warn'>{html.escape(str(w))}</p>" for w in result["warnings"]]
+        if result["summary"]:
+            parts.append(pd.Series(result["summary"], dtype=object).to_frame("value").to_html(border=0))
+        for name, table in result["tables"].items():
+            parts.append(f"<h3>{html.escape(name)}</h3>{table.to_html(index=False, border=0)}")
+    parts.append("</body></html>")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(parts), encoding='utf-8')
+    return path
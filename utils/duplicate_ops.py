@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+import shapely
+from typing import Set, Tuple
+
+from utils.geometry_ops import resample_fractions, resample_spacing
+
+FINGERPRINT_SAMPLES = 9
+
+
+def geometry_fingerprints(xy: np.ndarray, offsets: np.ndarray, grid: float, samples: int = FINGERPRINT_SAMPLES,
+                          shift: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Orientation-independent, quantized fingerprint of every polyline.
+
+    Each polyline is resampled at `samples` equal length fractions (so vertex density
+    does not matter), snapped to a `grid` meter lattice shifted by `shift`, and put in
+    canonical orientation (lexicographically smaller end first) before hashing.
+
+    Args:
+        xy (np.ndarray): (N, 2) flat buffer in a metric CRS.
+        offsets (np.ndarray): (M + 1,) polyline offsets.
+        grid (float): Lattice size (meters).
+        samples (int, optional): Points per polyline. Defaults to FINGERPRINT_SAMPLES.
+        shift (float, optional): Lattice offset (meters). Defaults to 0.0.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (M,) uint64 fingerprints (0 for empty polylines) and
+        (M,) bool flags telling which polylines were reversed into canonical orientation.
+    """
+    points = resample_fractions(xy, offsets, samples)
+    empty = np.isnan(points[:, 0, 0])
+    cells = np.floor((np.nan_to_num(points) + shift) / grid).astype(np.int64)
+    first, last = cells[:, 0], cells[:, -1]
+    reverse = (first[:, 0] > last[:, 0]) | ((first[:, 0] == last[:, 0]) & (first[:, 1] > last[:, 1]))
+    cells[reverse] = cells[reverse, ::-1]
+    fingerprints = pd.util.hash_pandas_object(pd.DataFrame(cells.reshape(len(cells), -1)), index=False).to_numpy()
+    return np.where(empty, np.uint64(0), fingerprints), reverse
+
+
+def fingerprint_pairs(xy: np.ndarray, offsets: np.ndarray, grid: float) -> Set[Tuple[int, int]]:
+    """
+    Pairs (i < j) of polylines with equal fingerprints on the base or the half-shifted lattice.
+
+    Hashing is O(n); only members of the same bucket are paired.
+    """
+    pairs = set()
+    for shift in (0.0, grid / 2):
+        fingerprints, _ = geometry_fingerprints(xy, offsets, grid, shift=shift)
+        buckets = pd.Series(np.arange(len(fingerprints)))[fingerprints != 0].groupby(fingerprints[fingerprints != 0])
+        for members in buckets:
+            members = members[1].to_numpy()
+            pairs.update((int(a), int(b)) for k, a in enumerate(members) for b in members[k + 1:])
+    return pairs
+
+
+def shared_cell_pairs(xy: np.ndarray, offsets: np.ndarray, grid: float, min_shared: int = 3) -> Set[Tuple[int, int]]:
+    """
+    Pairs (i < j) of polylines whose samples (every `grid` meters) share at least `min_shared` grid cells.
+
+    This catches partial overlaps and near duplicates whose fingerprints fall on different cells.
+    """
+    points, owner = resample_spacing(xy, offsets, grid)
+    cells = pd.DataFrame({
+        "owner": owner,
+        "cx": np.floor(points[:, 0] / grid).astype(np.int64),
+        "cy": np.floor(points[:, 1] / grid).astype(np.int64),
+    }).drop_duplicates()
+    joined = cells.merge(cells, on=["cx", "cy"], suffixes=("_a", "_b"))
+    joined = joined[joined["owner_a"] < joined["owner_b"]]
+    counts = joined.groupby(["owner_a", "owner_b"]).size()
+    return {(int(a), int(b)) for a, b in counts[counts >= min_shared].index}
+
+
+def confirm_pairs(xy: np.ndarray, offsets: np.ndarray, pairs: Set[Tuple[int, int]], tolerance: float,
+                  spacing: float) -> pd.DataFrame:
+    """
+    Measure every candidate pair geometrically.
+
+    Args:
+        xy (np.ndarray): (N, 2) flat buffer in a metric CRS.
+        offsets (np.ndarray): (M + 1,) polyline offsets.
+        pairs (Set[Tuple[int, int]]): Candidate pairs.
+        tolerance (float): Distance (meters) within which a sample counts as covered.
+        spacing (float): Sample spacing (meters) for the coverage shares.
+
+    Returns:
+        pd.DataFrame: a, b, hausdorff_m, share_a (part of a within tolerance of b), share_b,
+        reversed (b runs against a).
+    """
+    columns = ["a", "b", "hausdorff_m", "share_a", "share_b", "reversed"]
+    if not pairs:
+        return pd.DataFrame(columns=columns)
+    points, owner = resample_spacing(xy, offsets, spacing)
+    starts = np.searchsorted(owner, np.arange(len(offsets) - 1), side='left')
+    ends = np.searchsorted(owner, np.arange(len(offsets) - 1), side='right')
+    lines = {}
+
+    def line(i):
+        if i not in lines:
+            part = xy[offsets[i]:offsets[i + 1]]
+            lines[i] = shapely.linestrings(part) if len(part) >= 2 else shapely.points(part[0])
+        return lines[i]
+
+    rows = []
+    for a, b in sorted(pairs):
+        samples_a, samples_b = points[starts[a]:ends[a]], points[starts[b]:ends[b]]
+        share_a = float(np.mean(shapely.distance(line(b), shapely.points(samples_a)) <= tolerance))
+        share_b = float(np.mean(shapely.distance(line(a), shapely.points(samples_b)) <= tolerance))
+        start_a, end_a, start_b = xy[offsets[a]], xy[offsets[a + 1] - 1], xy[offsets[b]]
+        rows.append((a, b, float(shapely.hausdorff_distance(line(a), line(b))), share_a, share_b,
+                     bool(np.hypot(*(start_a - start_b)) > np.hypot(*(end_a - start_b)))))
+    return pd.DataFrame(rows, columns=columns)
+
+
+def find_duplicate_geometry(xy: np.ndarray, offsets: np.ndarray, grid: float, tolerance: float,
+                            min_overlap_share: float) -> pd.DataFrame:
+    """
+    Find duplicated and overlapping polylines, regardless of line id or orientation.
+
+    Candidates come from hashing only (equal fingerprints, or shared grid cells); the
+    geometric measurement runs on those pairs and never on all pairs.
+
+    Args:
+        xy (np.ndarray): (N, 2) flat buffer in a metric CRS.
+        offsets (np.ndarray): (M + 1,) polyline offsets.
+        grid (float): Fingerprint lattice and sample spacing (meters).
+        tolerance (float): Maximum Hausdorff distance (meters) of a duplicate.
+        min_overlap_share (float): Minimum covered share of either polyline to report an overlap.
+
+    Returns:
+        pd.DataFrame: confirm_pairs columns plus 'kind' ('duplicate' or 'overlap'), one row per pair.
+    """
+    candidates = fingerprint_pairs(xy, offsets, grid) | shared_cell_pairs(xy, offsets, grid)
+    pairs = confirm_pairs(xy, offsets, candidates, tolerance, spacing=grid)
+    pairs["kind"] = np.where(pairs["hausdorff_m"] <= tolerance, "duplicate", "overlap")
+    keep = (pairs["kind"] == "duplicate") | (pairs[["share_a", "share_b"]].max(axis=1) >= min_overlap_share)
+    return pairs[keep].reset_index(drop=True)
@@ -0,0 +1,339 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+
+def point_segment_distances(points: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Distance of every point to the segment a-b (not the infinite line), in the units of the input.
+
+    Args:
+        points (np.ndarray): (N, 2) points.
+        a (np.ndarray): Segment start [x, y].
+        b (np.ndarray): Segment end [x, y].
+
+    Returns:
+        np.ndarray: (N,) distances.
+    """
+    ab = b - a
+    denom = float(ab @ ab)
+    if denom == 0.0:
+        return np.hypot(points[:, 0] - a[0], points[:, 1] - a[1])
+    t = np.clip(((points - a) @ ab) / denom, 0.0, 1.0)
+    closest = a + t[:, None] * ab
+    return np.hypot(points[:, 0] - closest[:, 0], points[:, 1] - closest[:, 1])
+
+
+def douglas_peucker_mask(xy: np.ndarray, tolerance: float, keep: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Douglas-Peucker simplification of one polyline, returned as a keep-mask.
+
+    Every dropped vertex lies within `tolerance` of the simplified polyline.
+    Endpoints are always kept; vertices flagged in `keep` are kept too and split
+    the polyline into independently simplified pieces.
+
+    Args:
+        xy (np.ndarray): (N, 2) vertices in a metric CRS (e.g. EPSG:2056).
+        tolerance (float): Maximum deviation (meters).
+        keep (np.ndarray, optional): (N,) bool mask of vertices that must survive. Defaults to None.
+
+    Returns:
+        np.ndarray: (N,) bool mask of kept vertices.
+    """
+    n = len(xy)
+    mask = np.zeros(n, dtype=bool) if keep is None else np.asarray(keep, dtype=bool).copy()
+    if n == 0:
+        return mask
+    mask[0] = mask[-1] = True
+
+    anchors = np.flatnonzero(mask)
+    stack = list(zip(anchors[:-1], anchors[1:]))
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        distances = point_segment_distances(xy[start + 1:end], xy[start], xy[end])
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = start + 1 + farthest
+            mask[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return mask
+
+
+def _simplify_chunk(xy: np.ndarray, offsets: np.ndarray, tolerance: float, keep: Optional[np.ndarray]) -> np.ndarray:
+    mask = np.zeros(len(xy), dtype=bool)
+    for i in range(len(offsets) - 1):
+        start, end = offsets[i], offsets[i + 1]
+        mask[start:end] = douglas_peucker_mask(xy[start:end], tolerance, None if keep is None else keep[start:end])
+    return mask
+
+
+def simplify_buffer_mask(xy: np.ndarray, offsets: np.ndarray, tolerance: float,
+                         keep: Optional[np.ndarray] = None, jobs: int = 1, chunk_size: int = 256) -> np.ndarray:
+    """
+    Douglas-Peucker keep-mask for every polyline of a flat coordinate buffer.
+
+    Args:
+        xy (np.ndarray): (N, 2) flat buffer (see utils.crs.pack_coordinates).
+        offsets (np.ndarray): (M + 1,) polyline offsets.
+        tolerance (float): Maximum deviation (meters).
+        keep (np.ndarray, optional): (N,) bool mask of vertices that must survive. Defaults to None.
+        jobs (int, optional): Worker processes; chunks of polylines are simplified in parallel. Defaults to 1.
+        chunk_size (int, optional): Polylines per worker task. Defaults to 256.
+
+    Returns:
+        np.ndarray: (N,) bool mask of kept vertices.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if jobs <= 1 or len(offsets) - 1 <= chunk_size:
+        return _simplify_chunk(xy, offsets, tolerance, keep)
+
+    bounds = list(range(0, len(offsets) - 1, chunk_size)) + [len(offsets) - 1]
+    mask = np.zeros(len(xy), dtype=bool)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = []
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            start, end = offsets[first], offsets[last]
+            futures.append((start, end, executor.submit(
+                _simplify_chunk, xy[start:end], offsets[first:last + 1] - start, tolerance,
+                None if keep is None else keep[start:end])))
+        for start, end, future in futures:
+            mask[start:end] = future.result()
+    return mask
+
+
+def compact_offsets(mask: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    Offsets of the buffer xy[mask], i.e. after dropping the masked-out vertices.
+    """
+    kept = np.concatenate([[0], np.cumsum(mask, dtype=np.int64)])
+    return kept[offsets]
+
+
+def polyline_lengths(xy: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    Length of every polyline in a flat buffer, computed in one pass.
+
+    Args:
+        xy (np.ndarray): (N, 2) flat buffer in a metric CRS.
+        offsets (np.ndarray): (M + 1,) polyline offsets.
+
+    Returns:
+        np.ndarray: (M,) lengths (0 for polylines with fewer than two vertices).
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if len(xy) < 2:
+        return np.zeros(len(offsets) - 1)
+    # Cumulative distance along the whole buffer; steps between two polylines fall outside every [start, end - 1]
+    cumulative = np.concatenate([[0.0], np.cumsum(np.hypot(*np.diff(xy, axis=0).T))])
+    starts = np.minimum(offsets[:-1], len(xy) - 1)
+    ends = np.maximum(offsets[1:] - 1, 0)
+    return np.where(offsets[1:] - offsets[:-1] >= 2, cumulative[ends] - cumulative[starts], 0.0)
+
+
+def nearest_vertex(xy: np.ndarray, point) -> int:
+    """Index of the vertex of xy closest to point."""
+    return int(np.argmin(np.hypot(xy[:, 0] - point[0], xy[:, 1] - point[1])))
+
+
+def interpolate_along(xy: np.ndarray, offsets: np.ndarray, owner: np.ndarray, distances: np.ndarray) -> np.ndarray:
+    """
+    Points at given distances along given polylines of a flat buffer, in one vectorized pass.
+
+    Args:
+        xy (np.ndarray): (N, 2) flat buffer in a metric CRS.
+        offsets (np.ndarray): (M + 1,) polyline offsets.
+        owner (np.ndarray): (K,) polyline index of every requested point.
+        distances (np.ndarray): (K,) distance from the polyline start (clipped to its length).
+
+    Returns:
+        np.ndarray: (K, 2) points; NaN for empty polylines.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    owner = np.asarray(owner, dtype=np.int64)
+    if len(xy) == 0:
+        return np.full((len(owner), 2), np.nan)
+    steps = np.hypot(*np.diff(xy, axis=0).T)
+    # Steps between two polylines do not count, so the cumulative distance restarts flat at every boundary
+    boundaries = offsets[1:-1] - 1
+    steps[boundaries[(boundaries >= 0) & (boundaries < len(steps))]] = 0.0
+    cumulative = np.concatenate([[0.0], np.cumsum(steps)])
+
+    starts, ends = offsets[owner], offsets[owner + 1]
+    first = np.minimum(starts, len(xy) - 1)
+    target = cumulative[first] + np.clip(distances, 0.0, cumulative[np.maximum(ends - 1, 0)] - cumulative[first])
+    j = np.clip(np.searchsorted(cumulative, target, side='left'), starts + 1, np.maximum(ends - 1, starts + 1))
+    j = np.minimum(j, len(xy) - 1)
+    step = cumulative[j] - cumulative[j - 1]
+    weight = np.divide(target - cumulative[j - 1], step, out=np.zeros_like(step), where=step > 0)
+    points = xy[j - 1] + weight[:, None] * (xy[j] - xy[j - 1])
+
+    single = ends - starts == 1
+    points[single] = xy[first[single]]
+    points[ends == starts] = np.nan
+    return points
+
+
+def resample_fractions(xy: np.ndarray, offsets: np.ndarray, samples: int) -> np.ndarray:
+    """
+    `samples` points at equal length fractions (0 … 1) of every polyline.
+
+    Returns:
+        np.ndarray: (M, samples, 2) points; reversing a polyline reverses its samples.
+    """
+    count = len(offsets) - 1
+    fractions = np.linspace(0.0, 1.0, samples)
+    owner = np.repeat(np.arange(count), samples)
+    distances = np.tile(fractions, count) * np.repeat(polyline_lengths(xy, offsets), samples)
+    return interpolate_along(xy, offsets, owner, distances).reshape(count, samples, 2)
+
+
+def resample_spacing(xy: np.ndarray, offsets: np.ndarray, spacing: float):
+    """
+    Points every `spacing` meters along every polyline (start and end included).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (K, 2) points and (K,) owning polyline index.
+    """
+    lengths = polyline_lengths(xy, offsets)
+    counts = np.where(np.diff(offsets) > 0, np.ceil(lengths / spacing).astype(np.int64) + 1, 0)
+    owner = np.repeat(np.arange(len(lengths)), counts)
+    position = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    distances = np.minimum(position * spacing, lengths[owner])
+    return interpolate_along(xy, offsets, owner, distances), owner
+
+
+def select_polylines(xy: np.ndarray, offsets: np.ndarray, index: np.ndarray):
+    """
+    Gather polylines of a flat buffer (repeats allowed) into a new flat buffer.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (K, 2) buffer and offsets of the selected polylines, in `index` order.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    index = np.asarray(index, dtype=np.int64)
+    counts = offsets[index + 1] - offsets[index]
+    new_offsets = np.concatenate([[0], np.cumsum(counts)])
+    gather = np.repeat(offsets[index] - new_offsets[:-1], counts) + np.arange(new_offsets[-1])
+    return xy[gather], new_offsets
+
+
+def drop_repeated_vertices(xy: np.ndarray, offsets: np.ndarray):
+    """
+    Remove vertices equal to their predecessor in the same polyline.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Compacted buffer and offsets.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    mask = np.ones(len(xy), dtype=bool)
+    if len(xy) > 1:
+        mask[1:] = (np.diff(xy, axis=0) != 0).any(axis=1)
+    mask[offsets[:-1][offsets[:-1] < len(xy)]] = True
+    return xy[mask], compact_offsets(mask, offsets)
+
+
+def trim_polylines(xy: np.ndarray, offsets: np.ndarray, start: np.ndarray, end: np.ndarray):
+    """
+    Part of every polyline between two distances from its start (linear substring), in one pass.
+
+    The cut points are interpolated; vertices strictly between them are kept.
+
+    Args:
+        xy (np.ndarray): (N, 2) flat buffer in a metric CRS.
+        offsets (np.ndarray): (M + 1,) polyline offsets.
+        start (np.ndarray): (M,) start distance of every polyline (clipped to its length).
+        end (np.ndarray): (M,) end distance, not smaller than start.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Trimmed buffer and offsets; empty input polylines stay empty.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    count = len(offsets) - 1
+    lengths = polyline_lengths(xy, offsets)
+    start = np.clip(np.broadcast_to(np.asarray(start, dtype=np.float64), count), 0.0, lengths)
+    end = np.clip(np.broadcast_to(np.asarray(end, dtype=np.float64), count), start, lengths)
+
+    owner = np.repeat(np.arange(count), np.diff(offsets))
+    steps = np.hypot(*np.diff(xy, axis=0).T) if len(xy) > 1 else np.zeros(0)
+    cumulative = np.concatenate([[0.0], np.cumsum(steps)])
+    along = cumulative - cumulative[np.minimum(offsets[:-1], max(len(xy) - 1, 0))][owner]
+    inner = (along > start[owner]) & (along < end[owner])
+
+    filled = np.flatnonzero(np.diff(offsets) > 0)
+    ends = np.repeat(filled, 2)
+    cuts = interpolate_along(xy, offsets, ends, np.column_stack([start[filled], end[filled]]).ravel())
+    # Sıralama anahtarı: kesim noktaları uçlarda, aradaki köşeler mesafeye göre
+    points = np.concatenate([cuts, xy[inner]])
+    keys = np.concatenate([np.column_stack([start[filled], end[filled]]).ravel(), along[inner]])
+    owners = np.concatenate([ends, owner[inner]])
+    rank = np.concatenate([np.tile([0, 2], len(filled)), np.ones(inner.sum(), dtype=np.int64)])
+    order = np.lexsort((keys, rank, owners))
+    new_offsets = np.concatenate([[0], np.cumsum(np.bincount(owners, minlength=count))])
+    return points[order], new_offsets
+
+
+def offset_polylines(xy: np.ndarray, offsets: np.ndarray, distances: np.ndarray, miter_limit: float = 4.0):
+    """
+    Offset curve of every polyline by its own signed distance, all polylines in one vectorized pass.
+
+    Every vertex moves along its miter direction (the bisector of the normals of its
+    two edges) by distance / cos(half the turn angle). Where that factor exceeds
+    `miter_limit` the corner is bevelled: the vertex becomes two points, one on each
+    edge normal. End vertices move along the normal of their only edge.
+
+    Args:
+        xy (np.ndarray): (N, 2) flat buffer in a metric CRS.
+        offsets (np.ndarray): (M + 1,) polyline offsets.
+        distances (np.ndarray): (M,) offset per polyline; positive is left of the drawing direction.
+        miter_limit (float, optional): Largest miter length as a multiple of the distance. Defaults to 4.0.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Offset buffer and offsets. Polylines with fewer than two
+        distinct vertices are returned unchanged.
+    """
+    xy, offsets = drop_repeated_vertices(np.asarray(xy, dtype=np.float64), offsets)
+    count = len(offsets) - 1
+    distances = np.broadcast_to(np.asarray(distances, dtype=np.float64), count)
+    n = len(xy)
+    if n == 0:
+        return xy.copy(), offsets
+    owner = np.repeat(np.arange(count), np.diff(offsets))
+    first = np.zeros(n, dtype=bool)
+    first[offsets[:-1][np.diff(offsets) > 0]] = True
+    last = np.roll(first, -1)
+    last[-1] = True
+
+    # Kenar normalleri (sola dönük birim vektör); polyline sınırındaki kenarlar kullanılmaz
+    direction = np.diff(xy, axis=0)
+    length = np.hypot(direction[:, 0], direction[:, 1])
+    edge_normal = np.column_stack([-direction[:, 1], direction[:, 0]]) / np.where(length > 0, length, 1.0)[:, None]
+    incoming = np.zeros((n, 2))
+    outgoing = np.zeros((n, 2))
+    incoming[1:] = edge_normal
+    outgoing[:-1] = edge_normal
+    incoming[first] = outgoing[first]
+    outgoing[last] = incoming[last]
+    single = first & last
+    incoming[single] = outgoing[single] = 0.0
+
+    bisector = incoming + outgoing
+    norm = np.hypot(bisector[:, 0], bisector[:, 1])
+    miter = bisector / np.where(norm > 0, norm, 1.0)[:, None]
+    cos_half = (miter * incoming).sum(axis=1)
+    scale = np.divide(1.0, cos_half, out=np.full(n, np.inf), where=cos_half > 0)
+    bevel = (scale > miter_limit) & ~single
+    scale[~np.isfinite(scale)] = 0.0
+
+    d = distances[owner][:, None]
+    joined = xy + d * miter * scale[:, None]
+    # Köşe kırpma: keskin köşe iki noktaya bölünür (gelen ve giden kenarın normali)
+    repeat = np.where(bevel, 2, 1)
+    points = np.repeat(joined, repeat, axis=0)
+    at = np.cumsum(repeat) - repeat
+    points[at[bevel]] = xy[bevel] + d[bevel] * incoming[bevel]
+    points[at[bevel] + 1] = xy[bevel] + d[bevel] * outgoing[bevel]
+    new_offsets = np.concatenate([[0], np.cumsum(np.bincount(owner, weights=repeat, minlength=count).astype(np.int64))])
+    return points, new_offsets
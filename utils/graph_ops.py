@@ -0,0 +1,156 @@
+import heapq
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+# Sentinel used in predecessor arrays for "no predecessor" (source node or unreachable)
+NO_PREDECESSOR = -1
+
+# CSR arrays shared with pool workers (set once per worker by _init_worker)
+_WORKER_CSR = None
+
+
+def build_csr(src: Sequence[int], dst: Sequence[int], weights: Sequence[float],
+              n_nodes: int, directed: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build a CSR (compressed sparse row) adjacency from an edge list.
+
+    Args:
+        src (Sequence[int]): Source node index of every edge.
+        dst (Sequence[int]): Target node index of every edge.
+        weights (Sequence[float]): Edge weight (e.g. polygon_length in meters).
+        n_nodes (int): Total number of nodes.
+        directed (bool, optional): If False, every edge is added in both directions. Defaults to False.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: (indptr, indices, data) arrays.
+    """
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    weights = np.asarray(weights, dtype=np.float64)
+
+    if not directed:
+        src, dst = np.concatenate([src, dst]), np.concatenate([dst, src])
+        weights = np.concatenate([weights, weights])
+
+    order = np.lexsort((dst, src))
+    src, dst, weights = src[order], dst[order], weights[order]
+
+    indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n_nodes), out=indptr[1:])
+    return indptr, dst.astype(np.int32), weights
+
+
+def dijkstra(indptr, indices, data, source: int, target: Optional[int] = None,
+             limit: float = np.inf) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Single-source shortest paths over a CSR graph with non-negative weights.
+
+    Args:
+        indptr, indices, data: CSR arrays (numpy arrays or plain lists).
+        source (int): Source node index.
+        target (int, optional): Stop as soon as this node is settled. Defaults to None (settle all).
+        limit (float, optional): Do not expand nodes farther than this distance. Defaults to inf.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Distance array (inf if unreachable) and predecessor array
+        (NO_PREDECESSOR for the source and unreachable nodes).
+    """
+    if isinstance(indptr, np.ndarray):
+        indptr, indices, data = indptr.tolist(), indices.tolist(), data.tolist()
+
+    n_nodes = len(indptr) - 1
+    dist = [np.inf] * n_nodes
+    pred = [NO_PREDECESSOR] * n_nodes
+    settled = [False] * n_nodes
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+
+    while heap:
+        d, u = heapq.heappop(heap)
+        if settled[u]:
+            continue
+        settled[u] = True
+        if u == target:
+            break
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nd = d + data[k]
+            if nd < dist[v] and nd <= limit:
+                dist[v] = nd
+                pred[v] = u
+                heapq.heappush(heap, (nd, v))
+
+    return np.asarray(dist, dtype=np.float64), np.asarray(pred, dtype=np.int32)
+
+
+def reconstruct_path(pred_row: np.ndarray, source: int, target: int) -> List[int]:
+    """
+    Rebuild the node sequence from source to target using a predecessor row.
+
+    Args:
+        pred_row (np.ndarray): Predecessor array computed from `source`.
+        source (int): Source node index.
+        target (int): Target node index.
+
+    Returns:
+        List[int]: Node indices from source to target, or empty list if unreachable.
+    """
+    if source == target:
+        return [source]
+    path = [target]
+    node = target
+    while node != source:
+        node = int(pred_row[node])
+        if node == NO_PREDECESSOR:
+            return []
+        path.append(node)
+    return path[::-1]
+
+
+def _init_worker(indptr, indices, data):
+    global _WORKER_CSR
+    _WORKER_CSR = (indptr.tolist(), indices.tolist(), data.tolist())
+
+
+def _solve_block(sources: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+    indptr, indices, data = _WORKER_CSR
+    results = [dijkstra(indptr, indices, data, s) for s in sources]
+    return np.vstack([r[0] for r in results]), np.vstack([r[1] for r in results])
+
+
+def multi_source_dijkstra(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray,
+                          sources: Sequence[int], jobs: Optional[int] = None,
+                          block_size: int = 64) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+    """
+    Run single-source shortest paths from many sources in a process pool.
+
+    Blocks are yielded as soon as they finish so the caller can write them
+    into a memory-mapped matrix without holding the full result in memory.
+
+    Args:
+        indptr, indices, data (np.ndarray): CSR arrays.
+        sources (Sequence[int]): Source node indices (one output row each).
+        jobs (int, optional): Number of worker processes. 1 runs in-process. Defaults to os.cpu_count().
+        block_size (int, optional): Number of sources per task. Defaults to 64.
+
+    Yields:
+        Tuple[int, np.ndarray, np.ndarray]: (first row offset, distance block, predecessor block).
+    """
+    sources = list(sources)
+    blocks = [(start, sources[start:start + block_size]) for start in range(0, len(sources), block_size)]
+
+    if jobs == 1:
+        _init_worker(indptr, indices, data)
+        for start, block in blocks:
+            dist_block, pred_block = _solve_block(block)
+            yield start, dist_block, pred_block
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(indptr, indices, data)) as executor:
+        futures = {executor.submit(_solve_block, block): start for start, block in blocks}
+        for future in as_completed(futures):
+            start = futures[future]
+            dist_block, pred_block = future.result()
+            yield start, dist_block, pred_block
@@ -0,0 +1,212 @@
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+from utils.geometry_ops import polyline_lengths
+
+DEFAULT_CELL_SIZE = 50.0  # meters, edge grid and default search radius of project()
+
+
+class LinearReferenceIndex:
+    """
+    KM chainage ↔ coordinate index of every Linie, in contiguous arrays.
+
+    Every segment vertex gets a chainage by calibrating the cumulative polyline
+    length of its segment to the segment's KM START / KM END. Vertices are stored
+    sorted by (line, km), so chainage lookups are a single searchsorted over all
+    queries; interpolation never crosses from one segment to another.
+
+    Example:
+        index = LinearReferenceIndex.from_segments(segment_df, xy, offsets)
+        points = index.locate([710, 710], [1.25, 2.0])
+        positions = index.project(points)
+    """
+
+    def __init__(self, line: np.ndarray, km: np.ndarray, xy: np.ndarray, segment: np.ndarray,
+                 cell_size: float = DEFAULT_CELL_SIZE):
+        """
+        Args:
+            line (np.ndarray): (N,) line id of every vertex, sorted.
+            km (np.ndarray): (N,) chainage (km), sorted within every line.
+            xy (np.ndarray): (N, 2) vertex coordinates in a metric CRS.
+            segment (np.ndarray): (N,) segment row of every vertex.
+            cell_size (float, optional): Edge grid cell (meters) used by project(). Defaults to DEFAULT_CELL_SIZE.
+        """
+        self.line, self.km, self.xy, self.segment = line, km, xy, segment
+        self.line_ids, first = np.unique(line, return_index=True)
+        self.line_offsets = np.append(first, len(line)).astype(np.int64)
+        # Tek searchsorted için (hat sırası, km) tek bir artan anahtarda
+        self._km_min = float(km.min()) if len(km) else 0.0
+        self._span = float(km.max() - self._km_min) + 1.0 if len(km) else 1.0
+        self._key = np.repeat(np.arange(len(self.line_ids)), np.diff(self.line_offsets)) * self._span + \
+            (km - self._km_min)
+        self.cell_size = cell_size
+        self._grid = None
+
+    @classmethod
+    def from_segments(cls, segment_df: pd.DataFrame, xy: np.ndarray, offsets: np.ndarray,
+                      cell_size: float = DEFAULT_CELL_SIZE) -> "LinearReferenceIndex":
+        """
+        Build the index from segment rows (Linie, KM START, KM END) and their flat coordinate buffer.
+
+        Segments without chainage or with fewer than two vertices are left out.
+        """
+        offsets = np.asarray(offsets, dtype=np.int64)
+        counts = np.diff(offsets)
+        km_start = pd.to_numeric(segment_df['KM START'], errors='coerce').to_numpy(dtype=np.float64)
+        km_end = pd.to_numeric(segment_df['KM END'], errors='coerce').to_numpy(dtype=np.float64)
+        usable = (counts >= 2) & np.isfinite(km_start) & np.isfinite(km_end)
+
+        owner = np.repeat(np.arange(len(counts)), counts)
+        steps = np.hypot(*np.diff(xy, axis=0).T) if len(xy) > 1 else np.zeros(0)
+        cumulative = np.concatenate([[0.0], np.cumsum(steps)])
+        along = cumulative - cumulative[np.minimum(offsets[:-1], max(len(xy) - 1, 0))][owner]
+        lengths = polyline_lengths(xy, offsets)
+        fraction = np.divide(along, lengths[owner], out=np.zeros_like(along), where=lengths[owner] > 0)
+        km = km_start[owner] + fraction * (km_end - km_start)[owner]
+
+        keep = usable[owner]
+        lines = segment_df['Linie'].to_numpy()[owner][keep]
+        km, points, segment = km[keep], xy[keep], owner[keep]
+        # Ters yönde çizilmiş segmentlerde km azalır; sıralama köşe sırasını da çevirir
+        order = np.lexsort((np.arange(len(km)), km, lines))
+        return cls(lines[order], km[order], points[order], segment[order], cell_size)
+
+    def __len__(self) -> int:
+        return len(self.km)
+
+    def line_range(self, line) -> tuple:
+        """(first km, last km) of a line."""
+        rank = int(np.searchsorted(self.line_ids, line))
+        if rank >= len(self.line_ids) or self.line_ids[rank] != line:
+            raise KeyError(f"Line {line} is not in the index")
+        return float(self.km[self.line_offsets[rank]]), float(self.km[self.line_offsets[rank + 1] - 1])
+
+    def _rank(self, lines: np.ndarray):
+        """Position of every line id in line_ids, and whether it is indexed at all."""
+        rank = np.minimum(np.searchsorted(self.line_ids, lines), len(self.line_ids) - 1)
+        return rank, self.line_ids[rank] == lines
+
+    def locate(self, lines, km) -> np.ndarray:
+        """
+        Coordinates of chainage positions, all queries in one searchsorted pass.
+
+        Args:
+            lines (array-like): (K,) line id of every query (a scalar applies to all).
+            km (array-like): (K,) chainage (km).
+
+        Returns:
+            np.ndarray: (K, 2) points; NaN for unknown lines and chainages outside the line.
+        """
+        km = np.atleast_1d(np.asarray(km, dtype=np.float64))
+        lines = np.broadcast_to(np.asarray(lines), km.shape)
+        points = np.full((len(km), 2), np.nan)
+        if not len(self.km):
+            return points
+        rank, known = self._rank(lines)
+        lo, hi = self.line_offsets[rank], self.line_offsets[rank + 1]
+        inside = known & (km >= self.km[lo]) & (km <= self.km[hi - 1])
+
+        j = np.searchsorted(self._key, rank * self._span + (km - self._km_min), side='left')
+        j = np.clip(j, lo + 1, np.maximum(hi - 1, lo + 1))
+        j = np.minimum(j, len(self.km) - 1)
+        a, b = j - 1, j
+        step = self.km[b] - self.km[a]
+        t = np.clip(np.divide(km - self.km[a], step, out=np.zeros_like(step), where=step > 0), 0.0, 1.0)
+        # Segment sınırında (boşluk veya çakışma) enterpolasyon yapılmaz, yakın uca oturtulur
+        across = self.segment[a] != self.segment[b]
+        t[across] = np.round(t[across])
+        points[inside] = (self.xy[a] + t[:, None] * (self.xy[b] - self.xy[a]))[inside]
+        return points
+
+    def _edge_grid(self):
+        """Edges (vertex j-1 → j of the same segment) bucketed by every grid cell their bounding box touches."""
+        if self._grid is None:
+            edge = np.flatnonzero(self.segment[1:] == self.segment[:-1]) + 1
+            low = np.floor(np.minimum(self.xy[edge - 1], self.xy[edge]) / self.cell_size).astype(np.int64)
+            high = np.floor(np.maximum(self.xy[edge - 1], self.xy[edge]) / self.cell_size).astype(np.int64)
+            span = high - low + 1
+            count = span[:, 0] * span[:, 1]
+            owner = np.repeat(np.arange(len(edge)), count)
+            local = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+            cx = low[owner, 0] + local % span[owner, 0]
+            cy = low[owner, 1] + local // span[owner, 0]
+            keys = _cell_key(cx, cy)
+            order = np.argsort(keys, kind='stable')
+            self._grid = (keys[order], edge[owner[order]])
+        return self._grid
+
+    def project(self, points, lines=None, max_distance: Optional[float] = None,
+                max_pairs: int = 4_000_000) -> pd.DataFrame:
+        """
+        Nearest position on the indexed lines of every point, batched.
+
+        Candidate edges come from the cells around each point (sorted cell keys and
+        searchsorted ranges); only those are measured, in batches of about `max_pairs`
+        point-edge pairs to bound memory.
+
+        Args:
+            points (array-like): (K, 2) points in the index CRS.
+            lines (array-like, optional): (K,) only project onto this line (scalar applies to all). Defaults to None.
+            max_distance (float, optional): Search radius (meters). Defaults to the cell size.
+
+        Returns:
+            pd.DataFrame: line, km, distance, segment per point; NaN (segment -1) when no line is within reach.
+        """
+        points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+        count = len(points)
+        max_distance = self.cell_size if max_distance is None else max_distance
+        line = np.full(count, None, dtype=object)
+        km, distance, segment = np.full(count, np.nan), np.full(count, np.nan), np.full(count, -1, dtype=np.int64)
+        if count and len(self.km) >= 2:
+            keys, edges = self._edge_grid()
+            wanted = None if lines is None else np.broadcast_to(np.asarray(lines), (count,))
+            x, y = np.ascontiguousarray(self.xy[:, 0]), np.ascontiguousarray(self.xy[:, 1])
+
+            reach = int(np.ceil(max_distance / self.cell_size))
+            shifts = np.arange(-reach, reach + 1)
+            cell = np.floor(points / self.cell_size).astype(np.int64)
+            query_keys = _cell_key((cell[:, [0]] + np.repeat(shifts, len(shifts))[None, :]).ravel(),
+                                   (cell[:, [1]] + np.tile(shifts, len(shifts))[None, :]).ravel())
+            start = np.searchsorted(keys, query_keys, 'left')
+            hits = np.searchsorted(keys, query_keys, 'right') - start
+            per_point = hits.reshape(count, -1).sum(axis=1)
+            first_pair = np.cumsum(per_point) - per_point
+            batches = np.unique(np.append(np.searchsorted(first_pair, np.arange(0, per_point.sum(), max_pairs),
+                                                          side='right') - 1, count))
+            width = len(shifts) ** 2
+            for lo, hi in zip(batches[:-1], batches[1:]):
+                rows = slice(lo * width, hi * width)
+                pair_query = np.repeat(np.repeat(np.arange(lo, hi), width), hits[rows])
+                n = hits[rows]
+                pair_edge = edges[np.repeat(start[rows] - np.cumsum(n) + n, n) + np.arange(n.sum())]
+                if wanted is not None:
+                    match = self.line[pair_edge] == wanted[pair_query]
+                    pair_query, pair_edge = pair_query[match], pair_edge[match]
+                if not len(pair_query):
+                    continue
+
+                ax, ay = x[pair_edge - 1], y[pair_edge - 1]
+                dx, dy = x[pair_edge] - ax, y[pair_edge] - ay
+                px, py = points[pair_query, 0] - ax, points[pair_query, 1] - ay
+                denom = dx * dx + dy * dy
+                t = np.clip(np.divide(px * dx + py * dy, denom, out=np.zeros_like(denom), where=denom > 0), 0.0, 1.0)
+                gap = np.hypot(t * dx - px, t * dy - py)
+
+                # Her nokta için en yakın kenar (pair_query sıralı: grup minimumu reduceat ile)
+                group = np.flatnonzero(np.concatenate([[True], pair_query[1:] != pair_query[:-1]]))
+                nearest = np.repeat(np.minimum.reduceat(gap, group), np.diff(np.append(group, len(gap))))
+                candidates = np.flatnonzero(gap == nearest)
+                best = candidates[np.concatenate([[True], pair_query[candidates][1:] != pair_query[candidates][:-1]])]
+                best = best[gap[best] <= max_distance]
+                q, e = pair_query[best], pair_edge[best]
+                line[q] = self.line[e]
+                km[q] = self.km[e - 1] + t[best] * (self.km[e] - self.km[e - 1])
+                distance[q] = gap[best]
+                segment[q] = self.segment[e]
+        return pd.DataFrame({"line": line, "km": km, "distance": distance, "segment": segment})
+
+
+def _cell_key(cx: np.ndarray, cy: np.ndarray) -> np.ndarray:
+    """One int64 per grid cell (cell coordinates are far below 2**31 for metric CRSs)."""
+    return (cx.astype(np.int64) << 32) + (cy.astype(np.int64) & 0xFFFFFFFF)
@@ -0,0 +1,362 @@
+import ast
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from utils.config import PipelineConfig
+from utils.crs import pack_coordinates
+from utils.geometry_ops import nearest_vertex
+from utils.station_layout import LayoutTemplateCache, place_track_nodes, platform_shapes, snap_track_nodes
+
+def sumo_id(*parts) -> str:
+    """Join id parts with '_' (whitespace inside a part becomes '-', SUMO ids must not contain spaces)."""
+    return "_".join("-".join(str(part).split()) for part in parts)
+
+
+def entry_node_id(station: str, connected_station: str) -> str:
+    return sumo_id(station, "entry", connected_station)
+
+
+def parse_entry_nodes(station_df: pd.DataFrame, logger: Optional[logging.Logger] = None) -> pd.DataFrame:
+    """
+    Flatten the 'entry_nodes' column of STATION_HELPER_FILE into one row per entry node.
+
+    Returns:
+        pd.DataFrame: id, station, connected_station, direction ('West'/'East'), line, x, y.
+    """
+    logger = logger or logging.getLogger(__name__)
+    rows = []
+    for station, entry_nodes in zip(station_df['station'], station_df['entry_nodes']):
+        try:
+            entry_nodes = ast.literal_eval(entry_nodes) if isinstance(entry_nodes, str) else list(entry_nodes)
+        except (ValueError, SyntaxError, TypeError):
+            logger.warning(f"⚠️ Could not parse entry nodes of {station}")
+            continue
+        for node in entry_nodes:
+            rows.append((entry_node_id(station, node['Connected Station']), station, node['Connected Station'],
+                         node['Direction'], node['Line'], float(node['Coordinates'][0]), float(node['Coordinates'][1])))
+    entries = pd.DataFrame(rows, columns=["id", "station", "connected_station", "direction", "line", "x", "y"])
+    return entries.drop_duplicates("id").reset_index(drop=True)
+
+
+def segment_index(segment_df: pd.DataFrame) -> dict:
+    """Unordered station pair → row numbers of the segments between them."""
+    index = {}
+    for i, (start_op, end_op) in enumerate(zip(segment_df['START_OP'], segment_df['END_OP'])):
+        index.setdefault(frozenset((start_op, end_op)), []).append(i)
+    return index
+
+
+def incident_stations(segment_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Every (station, segment row) pair of segments starting or ending at a station, start ends first."""
+    rows = np.arange(len(segment_df))
+    return np.concatenate([segment_df['START_OP'].to_numpy(), segment_df['END_OP'].to_numpy()]), \
+        np.concatenate([rows, rows])
+
+
+def station_points(segment_df: pd.DataFrame, xy: np.ndarray, offsets: np.ndarray) -> pd.DataFrame:
+    """
+    Station position as the mean of the segment end vertices at the station.
+
+    Returns:
+        pd.DataFrame: x, y indexed by station.
+    """
+    has_points = offsets[1:] > offsets[:-1]
+    first, last = offsets[:-1][has_points], offsets[1:][has_points] - 1
+    ends = pd.DataFrame({
+        "station": np.concatenate([segment_df['START_OP'].to_numpy()[has_points],
+                                   segment_df['END_OP'].to_numpy()[has_points]]),
+        "x": np.concatenate([xy[first, 0], xy[last, 0]]),
+        "y": np.concatenate([xy[first, 1], xy[last, 1]]),
+    })
+    return ends.groupby("station", sort=True)[["x", "y"]].mean()
+
+
+def station_axes(stations: pd.DataFrame, entries: pd.DataFrame) -> pd.DataFrame:
+    """
+    West → East unit vector of every station, from the mean of its West and East entry nodes.
+
+    A station with entry nodes on one side only points from/to that side; a station
+    without entry nodes gets the x axis.
+
+    Args:
+        stations (pd.DataFrame): x, y indexed by station (see station_points).
+        entries (pd.DataFrame): parse_entry_nodes output.
+
+    Returns:
+        pd.DataFrame: stations with ux, uy added.
+    """
+    axes = stations.copy()
+    dx = np.zeros(len(axes))
+    dy = np.zeros(len(axes))
+    if len(entries):
+        sides = entries.groupby(["station", "direction"])[["x", "y"]].mean().unstack("direction").reindex(axes.index)
+        for sign, side in ((-1.0, "West"), (1.0, "East")):
+            if ("x", side) not in sides.columns:
+                continue
+            x, y = sides[("x", side)].to_numpy(), sides[("y", side)].to_numpy()
+            found = ~np.isnan(x)
+            dx[found] += sign * (x[found] - axes['x'].to_numpy()[found])
+            dy[found] += sign * (y[found] - axes['y'].to_numpy()[found])
+    norm = np.hypot(dx, dy)
+    axes['ux'] = np.where(norm > 0, dx / np.where(norm > 0, norm, 1.0), 1.0)
+    axes['uy'] = np.where(norm > 0, dy / np.where(norm > 0, norm, 1.0), 0.0)
+    return axes
+
+
+def station_axis_lines(segment_df: pd.DataFrame, xy: np.ndarray, offsets: np.ndarray, entries: pd.DataFrame,
+                       extend: float = 0.0) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """
+    Main-line alignment through every station, West → East, as a flat buffer.
+
+    The line follows the segment from the first West entry node to the station and on
+    to the first East entry node; a station with entries on one side only gets that
+    side. Both ends are prolonged straight by `extend` meters so platforms centered on
+    the station always fit.
+
+    Returns:
+        Tuple[pd.DataFrame, np.ndarray, np.ndarray]: line (buffer position) and center (distance of the
+        station from the line start) indexed by station, and the buffer and its offsets.
+    """
+    pairs = segment_index(segment_df)
+    first = entries.sort_values(["station", "direction", "connected_station"]).drop_duplicates(["station", "direction"])
+    pieces = {}
+    for station, connected, direction, x, y in zip(first['station'], first['connected_station'], first['direction'],
+                                                   first['x'], first['y']):
+        rows = pairs.get(frozenset((station, connected)))
+        if not rows or offsets[rows[0] + 1] - offsets[rows[0]] < 2:
+            continue
+        polyline = xy[offsets[rows[0]]:offsets[rows[0] + 1]]
+        k = nearest_vertex(polyline, (x, y))
+        # İstasyondan entry node'a doğru
+        piece = polyline[:k + 1] if segment_df['START_OP'].iat[rows[0]] == station else polyline[k:][::-1]
+        if len(piece) >= 2:
+            pieces.setdefault(station, {})[direction] = piece
+
+    names, centers, lines = [], [], []
+    for station, sides in pieces.items():
+        west, east = sides.get("West"), sides.get("East")
+        line = np.vstack([part for part in (None if west is None else west[::-1], east) if part is not None])
+        line = line[np.concatenate([[True], (np.diff(line, axis=0) != 0).any(axis=1)])]
+        if len(line) < 2:
+            continue
+        head, tail = line[0] - line[1], line[-1] - line[-2]
+        line = np.vstack([line[0] + extend * head / np.hypot(*head), line,
+                          line[-1] + extend * tail / np.hypot(*tail)])
+        center = extend + (np.hypot(*np.diff(west, axis=0).T).sum() if west is not None else 0.0)
+        names.append(station)
+        centers.append(center)
+        lines.append(line)
+
+    axis_xy, axis_offsets = pack_coordinates(lines)
+    return pd.DataFrame({"line": np.arange(len(names)), "center": centers}, index=pd.Index(names, name="station")), \
+        axis_xy, axis_offsets
+
+
+def _id_part(values) -> pd.Series:
+    """Vectorized sumo_id part: whitespace becomes '-'."""
+    return pd.Series(values, dtype=object).astype(str).str.split().str.join("-").reset_index(drop=True)
+
+
+def build_track_nodes(station_df: pd.DataFrame, axes: pd.DataFrame, config: Optional[PipelineConfig] = None,
+                      cache: Optional[LayoutTemplateCache] = None) -> pd.DataFrame:
+    """
+    West and East track node of every platform track of every station.
+
+    Tracks are parallel to the station axis, `decided_platform_length` long and
+    `default_platform_offset` apart, centered on the station position. Each distinct
+    layout is built once (see utils.station_layout) and only rotated and moved per station.
+
+    Args:
+        station_df (pd.DataFrame): STATION_HELPER_FILE rows (station, platform_count, decided_platform_length, type).
+        axes (pd.DataFrame): station_axes output.
+        config (PipelineConfig, optional): Tunables. Defaults to utils.constants.
+        cache (LayoutTemplateCache, optional): Template cache to reuse. Defaults to a new one for config.
+
+    Returns:
+        pd.DataFrame: id, station, track (1-based), side, x, y, type and key (the "<station>_track_<n>" id prefix).
+    """
+    cache = LayoutTemplateCache(config) if cache is None else cache
+    return place_track_nodes(station_df, axes, cache)
+
+
+def main_line_edges(segment_df: pd.DataFrame, xy: np.ndarray, offsets: np.ndarray, entries: pd.DataFrame,
+                    logger: Optional[logging.Logger] = None) -> Iterator[Tuple[str, str, str, np.ndarray]]:
+    """
+    Yield both directions of the main-line edge between the facing entry nodes of every station pair.
+
+    The shape is the part of the segment polyline between the two entry vertices.
+
+    Yields:
+        Tuple[str, str, str, np.ndarray]: edge id, from node, to node, (K, 2) shape.
+    """
+    logger = logger or logging.getLogger(__name__)
+    by_pair = entries.set_index(["station", "connected_station"])
+    for pair, rows in segment_index(segment_df).items():
+        if len(pair) != 2:
+            continue
+        i = rows[0]
+        start_op, end_op = segment_df['START_OP'].iat[i], segment_df['END_OP'].iat[i]
+        if (start_op, end_op) not in by_pair.index or (end_op, start_op) not in by_pair.index:
+            logger.warning(f"⚠️ No entry node pair for segment {start_op} - {end_op}, main line edge skipped")
+            continue
+        polyline = xy[offsets[i]:offsets[i + 1]]
+        a = nearest_vertex(polyline, by_pair.loc[(start_op, end_op), ["x", "y"]].to_numpy())
+        b = nearest_vertex(polyline, by_pair.loc[(end_op, start_op), ["x", "y"]].to_numpy())
+        if b <= a:
+            logger.warning(f"⚠️ Entry nodes of {start_op} - {end_op} overlap, main line edge skipped")
+            continue
+        shape = polyline[a:b + 1]
+        from_node, to_node = entry_node_id(start_op, end_op), entry_node_id(end_op, start_op)
+        yield sumo_id("main", start_op, end_op), from_node, to_node, shape
+        yield sumo_id("main", end_op, start_op), to_node, from_node, shape[::-1]
+
+
+def _entry_track_pairs(entries: pd.DataFrame, tracks: pd.DataFrame) -> pd.DataFrame:
+    """Every entry node joined with every track node on its side of the station."""
+    pairs = entries.merge(tracks, left_on=["station", "direction"], right_on=["station", "side"],
+                          suffixes=("_entry", "_track"))
+    pairs["entry_edge"] = pairs['id_entry'] + "_to_track_" + pairs['track'].astype(str)
+    pairs["exit_edge"] = pairs['key'] + "_to_entry_" + _id_part(pairs['connected_station'])
+    return pairs
+
+
+def station_entry_edges(entries: pd.DataFrame, tracks: pd.DataFrame) -> pd.DataFrame:
+    """
+    Track entry (entry → track node) and track exit (track node → entry) edges.
+
+    Every entry node is linked to every track node on its side of the station.
+
+    Returns:
+        pd.DataFrame: id, from, to, from_x, from_y, to_x, to_y.
+    """
+    pairs = _entry_track_pairs(entries, tracks)
+    inbound = pd.DataFrame({
+        "id": pairs['entry_edge'], "from": pairs['id_entry'], "to": pairs['id_track'],
+        "from_x": pairs['x_entry'], "from_y": pairs['y_entry'], "to_x": pairs['x_track'], "to_y": pairs['y_track'],
+    })
+    outbound = pd.DataFrame({
+        "id": pairs['exit_edge'], "from": pairs['id_track'], "to": pairs['id_entry'],
+        "from_x": pairs['x_track'], "from_y": pairs['y_track'], "to_x": pairs['x_entry'], "to_y": pairs['y_entry'],
+    })
+    return pd.concat([inbound, outbound], ignore_index=True)
+
+
+def platform_edges(tracks: pd.DataFrame, shapes: Optional[pd.Series] = None) -> pd.DataFrame:
+    """
+    Both directions of every platform track (east_to_west and west_to_east).
+
+    Args:
+        tracks (pd.DataFrame): build_track_nodes output.
+        shapes (pd.Series, optional): West → East shape per track key (see station_layout.platform_shapes);
+            east_to_west edges get it reversed. Defaults to None (straight edges).
+
+    Returns:
+        pd.DataFrame: id, from, to, from_x, from_y, to_x, to_y, station, track, shape (None when straight).
+    """
+    west = tracks[tracks['side'] == "West"].set_index('key')
+    east = tracks[tracks['side'] == "East"].set_index('key').reindex(west.index)
+    key = west.index.to_series(index=range(len(west)))
+    lookup = {} if shapes is None else shapes.to_dict()
+    forward = [lookup.get(k) for k in west.index]
+    reverse = [None if s is None else s[::-1] for s in forward]
+    columns = {"station": west['station'].to_numpy(), "track": west['track'].to_numpy()}
+    east_to_west = pd.DataFrame({
+        "id": key + "_east_to_west", "from": east['id'].to_numpy(), "to": west['id'].to_numpy(),
+        "from_x": east['x'].to_numpy(), "from_y": east['y'].to_numpy(),
+        "to_x": west['x'].to_numpy(), "to_y": west['y'].to_numpy(), **columns, "shape": reverse,
+    })
+    west_to_east = pd.DataFrame({
+        "id": key + "_west_to_east", "from": west['id'].to_numpy(), "to": east['id'].to_numpy(),
+        "from_x": west['x'].to_numpy(), "from_y": west['y'].to_numpy(),
+        "to_x": east['x'].to_numpy(), "to_y": east['y'].to_numpy(), **columns,
+        "shape": forward,
+    })
+    return pd.concat([east_to_west, west_to_east], ignore_index=True)
+
+
+def station_connections(entries: pd.DataFrame, tracks: pd.DataFrame,
+                        main_edges: Optional[Set[str]] = None) -> pd.DataFrame:
+    """
+    Every connection inside and at the border of the stations, as one columnar table.
+
+    Kinds:
+        main_to_entry: main_<C>_<S> → <S>_entry_<C>_to_track_<n>
+        entry_to_platform: track entry edge → the platform edge leaving that side
+        platform_to_exit: the platform edge arriving at a side → its track exit edges
+        exit_to_main: <S>_track_<n>_to_entry_<C> → main_<S>_<C>
+        uturn: at the west node <key>_east_to_west → <key>_west_to_east, and the reverse at the east node
+
+    Args:
+        entries (pd.DataFrame): parse_entry_nodes output.
+        tracks (pd.DataFrame): build_track_nodes output.
+        main_edges (Set[str], optional): Main line edge ids actually written; connections to
+            other main line ids are dropped. Defaults to None (keep all).
+
+    Returns:
+        pd.DataFrame: from, to, via (node where the connection is made), kind.
+    """
+    pairs = _entry_track_pairs(entries, tracks)
+    east = pairs['side'] == "East"
+    station, connected = _id_part(pairs['station']), _id_part(pairs['connected_station'])
+    main_in = "main_" + connected + "_" + station
+    main_out = "main_" + station + "_" + connected
+    # Giriş tarafından ayrılan / o tarafa varan peron kenarı
+    leaving = pairs['key'] + np.where(east, "_east_to_west", "_west_to_east")
+    arriving = pairs['key'] + np.where(east, "_west_to_east", "_east_to_west")
+
+    keys = tracks.loc[tracks['side'] == "West", 'key'].reset_index(drop=True)
+    frames = [
+        pd.DataFrame({"from": main_in, "to": pairs['entry_edge'], "via": pairs['id_entry'], "kind": "main_to_entry"}),
+        pd.DataFrame({"from": pairs['entry_edge'], "to": leaving, "via": pairs['id_track'], "kind": "entry_to_platform"}),
+        pd.DataFrame({"from": arriving, "to": pairs['exit_edge'], "via": pairs['id_track'], "kind": "platform_to_exit"}),
+        pd.DataFrame({"from": pairs['exit_edge'], "to": main_out, "via": pairs['id_entry'], "kind": "exit_to_main"}),
+        pd.DataFrame({"from": keys + "_east_to_west", "to": keys + "_west_to_east", "via": keys + "_west",
+                      "kind": "uturn"}),
+        pd.DataFrame({"from": keys + "_west_to_east", "to": keys + "_east_to_west", "via": keys + "_east",
+                      "kind": "uturn"}),
+    ]
+    connections = pd.concat(frames, ignore_index=True)
+    return connections if main_edges is None else drop_missing_main_edges(connections, main_edges)
+
+
+def drop_missing_main_edges(connections: pd.DataFrame, main_edges: Set[str]) -> pd.DataFrame:
+    """Drop connections from or to a main line edge that was not written (e.g. no facing entry node)."""
+    main_edges = set(main_edges)
+    is_main = connections['from'].str.startswith("main_") | connections['to'].str.startswith("main_")
+    known = connections['from'].isin(main_edges) | connections['to'].isin(main_edges)
+    return connections[~is_main | known].reset_index(drop=True)
+
+
+def build_station_network(station_df: pd.DataFrame, axes: pd.DataFrame, entries: pd.DataFrame,
+                          config: Optional[PipelineConfig] = None, main_edges: Optional[Set[str]] = None,
+                          cache: Optional[LayoutTemplateCache] = None,
+                          axis_lines: Optional[Tuple[pd.DataFrame, np.ndarray, np.ndarray]] = None
+                          ) -> Dict[str, pd.DataFrame]:
+    """
+    All station-side records (track nodes, entry/exit and platform edges, connections) in one pass.
+
+    Args:
+        station_df (pd.DataFrame): STATION_HELPER_FILE rows.
+        axes (pd.DataFrame): station_axes output.
+        entries (pd.DataFrame): parse_entry_nodes output.
+        config (PipelineConfig, optional): Tunables. Defaults to utils.constants.
+        main_edges (Set[str], optional): See station_connections.
+        cache (LayoutTemplateCache, optional): Station layout templates. Defaults to a new one for config.
+        axis_lines (Tuple, optional): station_axis_lines output. When given, platform tracks follow the
+            main-line alignment (station_layout.platform_shapes) and their nodes sit at the shape ends.
+
+    Returns:
+        Dict[str, pd.DataFrame]: "tracks", "edges" (with 'kind' and 'shape' columns) and "connections".
+    """
+    tracks = build_track_nodes(station_df, axes, config, cache=cache)
+    shapes = None
+    if axis_lines is not None:
+        shapes = platform_shapes(station_df, tracks, *axis_lines, config=cache.config if cache is not None else config)
+        tracks = snap_track_nodes(tracks, shapes)
+    edges = pd.concat([
+        station_entry_edges(entries, tracks).assign(kind="station_entry", shape=None),
+        platform_edges(tracks, shapes).drop(columns=["station", "track"]).assign(kind="platform"),
+    ], ignore_index=True)
+    return {"tracks": tracks, "edges": edges, "connections": station_connections(entries, tracks, main_edges)}
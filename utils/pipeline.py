@@ -0,0 +1,374 @@
+import ast
+import hashlib
+import importlib
+import inspect
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import utils.constants as constants
+
+MANIFEST_VERSION = 1
+NODE_DECLARATION = "PIPELINE_NODE"
+# Tunable modules: their values are fingerprinted per node through "constants", not as code
+UNTRACKED_MODULES = {"utils.constants", "utils.config"}
+
+
+def read_node_declaration(path: Path) -> Optional[Union[dict, List[dict]]]:
+    """
+    Read a module's PIPELINE_NODE literal without importing the module.
+
+    Args:
+        path (Path): Python source file.
+
+    Returns:
+        Optional[Union[dict, List[dict]]]: The declaration (a list when the module declares
+        several nodes), or None if the module does not declare a node.
+    """
+    source = Path(path).read_text(encoding='utf-8')
+    if NODE_DECLARATION not in source:
+        return None
+    for statement in ast.parse(source, filename=str(path)).body:
+        if (isinstance(statement, ast.Assign)
+                and any(isinstance(t, ast.Name) and t.id == NODE_DECLARATION for t in statement.targets)):
+            return ast.literal_eval(statement.value)
+    return None
+
+
+def discover_nodes(root: Path, sources: List[str]) -> Dict[str, dict]:
+    """
+    Collect pipeline node declarations from source files and directories.
+
+    Modules are only parsed, not imported, so listing and planning stay fast;
+    the entry function is imported when the node actually runs (see load_entry_point).
+    Any module in a listed directory that declares PIPELINE_NODE is registered; a module
+    with several entry points declares a list of nodes.
+
+    Args:
+        root (Path): Project root (module names are derived relative to it).
+        sources (List[str]): Files or directories (non-recursive) relative to root.
+
+    Returns:
+        Dict[str, dict]: Node name → declaration extended with "module" and "source".
+    """
+    nodes = {}
+    for source in sources:
+        source_path = Path(root) / source
+        files = sorted(source_path.glob('*.py')) if source_path.is_dir() else [source_path]
+        for file in files:
+            declaration = read_node_declaration(file)
+            if declaration is None:
+                continue
+            for node in (declaration if isinstance(declaration, list) else [declaration]):
+                node = dict(node)
+                node["module"] = ".".join(file.relative_to(root).with_suffix('').parts)
+                node["source"] = str(file)
+                if node["name"] in nodes:
+                    raise ValueError(f"Pipeline node {node['name']} is declared in both "
+                                     f"{nodes[node['name']]['module']} and {node['module']}")
+                nodes[node["name"]] = node
+    return nodes
+
+
+def code_files(source: Path, root: Path) -> List[Path]:
+    """
+    A module's source file and every project module it imports, transitively.
+
+    Imports are read from the syntax tree (nothing is imported); modules outside
+    root (standard library, third party) and UNTRACKED_MODULES are left out.
+
+    Args:
+        source (Path): Python source file.
+        root (Path): Project root (module names are resolved relative to it).
+
+    Returns:
+        List[Path]: Source files, sorted.
+    """
+    root = Path(root)
+    seen, pending = set(), [Path(source)]
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        for statement in ast.walk(ast.parse(path.read_text(encoding='utf-8'), filename=str(path))):
+            if isinstance(statement, ast.Import):
+                names = [alias.name for alias in statement.names]
+            elif isinstance(statement, ast.ImportFrom) and statement.module and not statement.level:
+                # "from utils import x" may import the module utils.x
+                names = [statement.module] + [f"{statement.module}.{alias.name}" for alias in statement.names]
+            else:
+                continue
+            for name in names:
+                if name in UNTRACKED_MODULES:
+                    continue
+                base = root.joinpath(*name.split('.'))
+                for candidate in (base.with_suffix('.py'), base / '__init__.py'):
+                    if candidate.is_file() and candidate not in seen:
+                        pending.append(candidate)
+    return sorted(seen)
+
+
+def code_digest(files: List[Path], root: Path, hash_cache: Optional[dict] = None) -> str:
+    """SHA-256 over the content digests of source files, keyed by their path relative to root."""
+    digests = {Path(path).relative_to(root).as_posix(): file_digest(path, hash_cache) for path in files}
+    return hashlib.sha256(json.dumps(digests, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def entry_kwargs(func, debug: bool = False, config=None, jobs: Optional[int] = None) -> dict:
+    """
+    Keyword arguments for a node entry function; config and jobs (worker processes
+    inside the node) are only passed to entries that accept them.
+    """
+    kwargs = {"debug": debug}
+    parameters = inspect.signature(func).parameters
+    if config is not None and "config" in parameters:
+        kwargs["config"] = config
+    if jobs is not None and "jobs" in parameters:
+        kwargs["jobs"] = jobs
+    return kwargs
+
+
+def load_entry_point(node: dict):
+    """
+    Import a node's module and return its entry function.
+
+    Args:
+        node (dict): Pipeline node declaration with "module" and "entry".
+
+    Returns:
+        Callable: The entry function (called with debug=...).
+    """
+    return getattr(importlib.import_module(node["module"]), node["entry"])
+
+
+def resolve_path(name: str) -> Path:
+    """
+    Resolve a file constant name (e.g. "POLYGON_FILE") declared by a pipeline node.
+
+    Args:
+        name (str): Name of a Path constant in utils.constants.
+
+    Returns:
+        Path: The resolved path.
+    """
+    value = getattr(constants, name, None)
+    if not isinstance(value, Path):
+        raise KeyError(f"{name} is not a file constant in utils.constants")
+    return value
+
+
+def constant_values(names: List[str], config=None) -> Dict[str, object]:
+    """
+    Collect the current values of the tunable constants a node depends on.
+
+    Args:
+        names (List[str]): Constant names in utils.constants.
+        config (PipelineConfig, optional): Config overriding the constants it covers. Defaults to None.
+
+    Returns:
+        Dict[str, object]: Constant name → value.
+    """
+    return {
+        name: config.value(name) if config is not None and config.has(name) else getattr(constants, name)
+        for name in names
+    }
+
+
+def file_digest(path: Path, hash_cache: Optional[dict] = None) -> Optional[str]:
+    """
+    SHA-256 of a file's content, streamed in 1 MB blocks.
+
+    The digest is reused from hash_cache when size and modification time are unchanged,
+    so large unchanged inputs are not re-read on every run.
+
+    Args:
+        path (Path): File to hash.
+        hash_cache (dict, optional): {path: [size, mtime_ns, digest]}, updated in place. Defaults to None.
+
+    Returns:
+        Optional[str]: Hex digest, or None if the file does not exist.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    stat = path.stat()
+    key = str(path)
+    if hash_cache is not None:
+        cached = hash_cache.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(block)
+    digest = sha.hexdigest()
+    if hash_cache is not None:
+        hash_cache[key] = [stat.st_size, stat.st_mtime_ns, digest]
+    return digest
+
+
+def node_fingerprint(node: dict, hash_cache: Optional[dict] = None, config=None) -> dict:
+    """
+    Fingerprint a node from its input file contents, constants and source code.
+
+    The code digest covers the node's module and the project modules it imports
+    (see code_files), so a change in a shared helper re-runs the nodes using it.
+
+    Args:
+        node (dict): Pipeline node declaration.
+        hash_cache (dict, optional): File digest cache (see file_digest). Defaults to None.
+        config (PipelineConfig, optional): Config the node runs with. Defaults to None (utils.constants).
+
+    Returns:
+        dict: {"inputs": {...}, "config": str, "code": str, "fingerprint": str}
+    """
+    inputs = {name: file_digest(resolve_path(name), hash_cache) for name in node.get("inputs", [])}
+    values = json.dumps(constant_values(node.get("constants", []), config), sort_keys=True, default=str)
+    config_digest = hashlib.sha256(values.encode('utf-8')).hexdigest()
+    code = None
+    if node.get("source"):
+        # Proje kökü: kaynak dosyadan modül derinliği kadar yukarı
+        root = Path(node["source"]).resolve().parents[len(node["module"].split('.')) - 1]
+        code = code_digest(code_files(Path(node["source"]).resolve(), root), root, hash_cache)
+
+    combined = json.dumps({"inputs": inputs, "config": config_digest, "code": code}, sort_keys=True)
+    return {
+        "inputs": inputs,
+        "config": config_digest,
+        "code": code,
+        "fingerprint": hashlib.sha256(combined.encode('utf-8')).hexdigest(),
+    }
+
+
+def build_dag(nodes: Dict[str, dict]) -> Dict[str, set]:
+    """
+    Derive node dependencies by matching declared inputs to declared outputs.
+
+    Args:
+        nodes (Dict[str, dict]): Node name → node declaration.
+
+    Returns:
+        Dict[str, set]: Node name → names of the nodes producing its inputs.
+    """
+    producers = {}
+    for name, node in nodes.items():
+        for output in node.get("outputs", []):
+            if output in producers:
+                raise ValueError(f"{output} is produced by both {producers[output]} and {name}")
+            producers[output] = name
+
+    return {
+        name: {producers[i] for i in node.get("inputs", []) if i in producers and producers[i] != name}
+        for name, node in nodes.items()
+    }
+
+
+def topological_order(nodes: Dict[str, dict]) -> List[str]:
+    """
+    Order nodes so every node comes after the nodes producing its inputs.
+
+    Ties are broken by stage number, then name, so the order is stable between runs.
+
+    Args:
+        nodes (Dict[str, dict]): Node name → node declaration.
+
+    Returns:
+        List[str]: Node names in execution order.
+    """
+    dependencies = build_dag(nodes)
+    remaining = {name: set(deps) for name, deps in dependencies.items()}
+
+    def sort_key(name):
+        stage = nodes[name].get("stage")
+        return (stage if stage is not None else float('inf'), name)
+
+    order = []
+    while remaining:
+        ready = sorted((name for name, deps in remaining.items() if not deps), key=sort_key)
+        if not ready:
+            raise ValueError(f"Pipeline has a dependency cycle between: {sorted(remaining)}")
+        for name in ready:
+            order.append(name)
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return order
+
+
+def load_manifest(path: Path) -> dict:
+    """
+    Load the previous run's manifest, or an empty one if missing or outdated.
+
+    Args:
+        path (Path): Manifest JSON file.
+
+    Returns:
+        dict: {"version": int, "nodes": {...}, "file_hashes": {...}}
+    """
+    empty = {"version": MANIFEST_VERSION, "nodes": {}, "file_hashes": {}}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logging.warning(f"⚠️ Ignoring unreadable pipeline manifest {path}: {e}")
+        return empty
+    if manifest.get("version") != MANIFEST_VERSION:
+        return empty
+    return manifest
+
+
+def save_manifest(path: Path, manifest: dict) -> None:
+    """
+    Atomically write the pipeline manifest.
+
+    Args:
+        path (Path): Manifest JSON file.
+        manifest (dict): Manifest content.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    tmp_path.replace(path)
+
+
+def is_up_to_date(node: dict, fingerprint: dict, manifest: dict) -> bool:
+    """
+    Check whether a node can be skipped.
+
+    Args:
+        node (dict): Pipeline node declaration.
+        fingerprint (dict): Current fingerprint (see node_fingerprint).
+        manifest (dict): Previous run's manifest.
+
+    Returns:
+        bool: True if the fingerprint matches the last successful run and all outputs still exist.
+    """
+    previous = manifest["nodes"].get(node["name"])
+    if not previous or previous.get("fingerprint") != fingerprint["fingerprint"]:
+        return False
+    return all(resolve_path(name).exists() for name in node.get("outputs", []))
+
+
+def record_success(node: dict, fingerprint: dict, manifest: dict, hash_cache: dict) -> None:
+    """
+    Store a finished node's fingerprint and output digests in the manifest.
+
+    Args:
+        node (dict): Pipeline node declaration.
+        fingerprint (dict): Fingerprint computed before the node ran.
+        manifest (dict): Manifest to update in place.
+        hash_cache (dict): File digest cache.
+    """
+    manifest["nodes"][node["name"]] = {
+        **fingerprint,
+        "outputs": {name: file_digest(resolve_path(name), hash_cache) for name in node.get("outputs", [])},
+        "finished_at": datetime.now().isoformat(timespec='seconds'),
+    }
+    manifest["file_hashes"] = hash_cache
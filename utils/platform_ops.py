@@ -2,14 +2,9 @@ import pandas as pd
 import statistics
 import logging
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import ast
-from utils.constants import (
-    MAX_PLATFORM_COUNT, MIN_PLATFORM_COUNT, DEFAULT_PLATFORM_COUNT,
-    MIN_PLATFORM_LENGTH, MAX_PLATFORM_LENGTH, DEFAULT_PLATFORM_LENGTH,
-    PLATFORM_LENGTH_DECISION_METHOD, FILL_EMPTY_PLATFORM_LENGTH_DATA_WITH,
-    FILL_EMPTY_PLATFORM_NO_DATA_WITH, FILTERED_SUB_NETWORK_POLYGON_FILE, ENTRY_OFFSET_BUFFER
-)
+from utils.config import PipelineConfig, default_config
 from utils.segment_ops import parse_geo_shape
 
 def find_direction_between_coordinates(coord1, coord2):
@@ -61,32 +56,35 @@ def calculate_platform_lengths(current_station_perron_df, op, logger):
         return None, None, None, 0
 
 
-def decide_platform_length(min_len, max_len, avg_len):
-    if PLATFORM_LENGTH_DECISION_METHOD == "X":
-        return min(MAX_PLATFORM_LENGTH, max_len)
-    elif PLATFORM_LENGTH_DECISION_METHOD == "N":
-        return max(MIN_PLATFORM_LENGTH, min_len)
-    elif PLATFORM_LENGTH_DECISION_METHOD == "A":
-        return max(MIN_PLATFORM_LENGTH, min(MAX_PLATFORM_LENGTH, avg_len))
+def decide_platform_length(min_len, max_len, avg_len, config: Optional[PipelineConfig] = None):
+    config = config or default_config()
+    if config.platform_length_decision_method == "X":
+        return min(config.max_platform_length, max_len)
+    elif config.platform_length_decision_method == "N":
+        return max(config.min_platform_length, min_len)
+    elif config.platform_length_decision_method == "A":
+        return max(config.min_platform_length, min(config.max_platform_length, avg_len))
     else:
-        return DEFAULT_PLATFORM_LENGTH
+        return config.default_platform_length
 
 
-def get_fallback_values():
+def get_fallback_values(config: Optional[PipelineConfig] = None):
+    config = config or default_config()
     length = {
-        "X": MAX_PLATFORM_LENGTH,
-        "N": MIN_PLATFORM_LENGTH
-    }.get(FILL_EMPTY_PLATFORM_LENGTH_DATA_WITH, DEFAULT_PLATFORM_LENGTH)
+        "X": config.max_platform_length,
+        "N": config.min_platform_length
+    }.get(config.fill_empty_platform_length_data_with, config.default_platform_length)
 
     count = {
-        "X": MAX_PLATFORM_COUNT,
-        "N": MIN_PLATFORM_COUNT
-    }.get(FILL_EMPTY_PLATFORM_NO_DATA_WITH, DEFAULT_PLATFORM_COUNT)
+        "X": config.max_platform_count,
+        "N": config.min_platform_count
+    }.get(config.fill_empty_platform_no_data_with, config.default_platform_count)
 
     return length, count
 
 
-def build_station_info(polygon_df, perron_df, logger) -> pd.DataFrame:
+def build_station_info(polygon_df, perron_df, logger, config: Optional[PipelineConfig] = None) -> pd.DataFrame:
+    config = config or default_config()
     unique_ops = set(polygon_df['START_OP']).union(polygon_df['END_OP'])
     
     # Melt START_OP and END_OP, keep Linie as id
@@ -105,16 +103,16 @@ def build_station_info(polygon_df, perron_df, logger) -> pd.DataFrame:
         current_station_perron_df = perron_df[perron_df['Station abbreviation'] == op]
 
         if current_station_perron_df.empty:
-            platform_length, platform_count = get_fallback_values()
+            platform_length, platform_count = get_fallback_values(config)
             min_len = max_len = avg_len = platform_length
         else:
             min_len, max_len, avg_len, platform_count = calculate_platform_lengths(current_station_perron_df, op, logger)
             if min_len is None:
-                platform_length, platform_count = get_fallback_values()
+                platform_length, platform_count = get_fallback_values(config)
                 min_len = max_len = avg_len = platform_length
             else:
-                platform_length = decide_platform_length(min_len, max_len, avg_len)
-                platform_count = max(MIN_PLATFORM_COUNT, min(MAX_PLATFORM_COUNT, platform_count))
+                platform_length = decide_platform_length(min_len, max_len, avg_len, config)
+                platform_count = max(config.min_platform_count, min(config.max_platform_count, platform_count))
 
         result = {
             "station": op,
@@ -189,7 +187,9 @@ def define_station_types(platform_df: pd.DataFrame) -> pd.DataFrame:
     platform_df.reset_index(drop=True, inplace=True)
     return platform_df
 
-def find_entry_nodes(platform_df: pd.DataFrame,polygon_df: pd.DataFrame, logger: logging.Logger) -> pd.DataFrame:
+def find_entry_nodes(platform_df: pd.DataFrame,polygon_df: pd.DataFrame, logger: logging.Logger,
+                     config: Optional[PipelineConfig] = None) -> pd.DataFrame:
+    config = config or default_config()
     platform_df['entry_nodes'] = platform_df.apply(lambda row: [], axis=1)
 
     for idx, row in platform_df.iterrows():
@@ -218,7 +218,7 @@ def find_entry_nodes(platform_df: pd.DataFrame,polygon_df: pd.DataFrame, logger:
                             average_polygon_coord_dist = round(polygon_length/num_of_coords)
                             platform_length = int(row['decided_platform_length'])
                             print(platform_length)
-                            total_entry_offset = int(ENTRY_OFFSET_BUFFER + platform_length/2)
+                            total_entry_offset = int(config.entry_offset_buffer + platform_length/2)
                             number_of_entr_coord_points = int(total_entry_offset/average_polygon_coord_dist)
                             logger.info(f"FOUND SEGMENT for station {row['station']}: Direction: {direction} - Line ID: {line_id} - {start_segment['START_OP'].to_string(index=False)} - {start_segment['END_OP'].to_string(index=False)} length: {str(polygon_length)}")
                             if number_of_entr_coord_points >= num_of_coords:
@@ -245,7 +245,7 @@ def find_entry_nodes(platform_df: pd.DataFrame,polygon_df: pd.DataFrame, logger:
                             average_polygon_coord_dist = round(polygon_length/num_of_coords)
                             platform_length = int(row['decided_platform_length'])
                             print(platform_length)
-                            total_entry_offset = int(ENTRY_OFFSET_BUFFER + platform_length/2)
+                            total_entry_offset = int(config.entry_offset_buffer + platform_length/2)
                             number_of_entr_coord_points = int(total_entry_offset/average_polygon_coord_dist)
                             entry_node_coord_index = number_of_entr_coord_points * -1
                             logger.info(f"FOUND SEGMENT for station {row['station']}: Direction: {direction} - Line ID: {line_id} - {end_segment['START_OP'].to_string(index=False)} - {end_segment['END_OP'].to_string(index=False)} length: {str(polygon_length)}")
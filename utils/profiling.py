@@ -0,0 +1,214 @@
+import json
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, peak RSS is reported as None
+    resource = None
+
+REPORT_VERSION = 1
+COMPARED_METRICS = ("wall_s", "cpu_s", "peak_rss_mb")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size of the current process in MB.
+
+    Returns:
+        Optional[float]: Peak RSS, or None where getrusage is not available.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def cpu_seconds() -> float:
+    """
+    CPU time (user + system) of the current process and its waited-for child processes.
+
+    Children only count once they have exited, e.g. the workers of a process pool
+    after it is shut down. Without getrusage only the current process is counted.
+    """
+    if resource is None:
+        return time.process_time()
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def profile_call(func: Callable, profile_path: Optional[Path] = None, **kwargs) -> Dict[str, float]:
+    """
+    Call func(**kwargs) and measure wall time, CPU time and peak RSS.
+
+    CPU time includes worker processes the call starts and joins (see cpu_seconds).
+    Peak RSS is a process-wide high-water mark of this process only, so it is only
+    per-call accurate when the call runs in a fresh worker process.
+
+    Args:
+        func (Callable): Function to run.
+        profile_path (Path, optional): If given, run under cProfile and dump pstats here. Defaults to None.
+
+    Returns:
+        Dict[str, float]: wall_s, cpu_s, peak_rss_mb and pstats (path or None).
+    """
+    profiler = None
+    if profile_path is not None:
+        import cProfile
+        profiler = cProfile.Profile()
+
+    wall_started = time.perf_counter()
+    cpu_started = cpu_seconds()
+    if profiler is not None:
+        profiler.runcall(func, **kwargs)
+    else:
+        func(**kwargs)
+    metrics = {
+        "wall_s": round(time.perf_counter() - wall_started, 3),
+        "cpu_s": round(cpu_seconds() - cpu_started, 3),
+        "peak_rss_mb": peak_rss_mb(),
+        "pstats": None,
+    }
+
+    if profiler is not None:
+        Path(profile_path).parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(profile_path))
+        metrics["pstats"] = str(profile_path)
+    return metrics
+
+
+def count_rows(path: Path) -> Optional[int]:
+    """
+    Count data rows of a pipeline artifact without parsing it.
+
+    CSV files count newline-terminated lines minus the header, JSON files the
+    length of the top-level container, .npy files the first dimension.
+
+    Args:
+        path (Path): Artifact file.
+
+    Returns:
+        Optional[int]: Row count, or None for missing or unsupported files.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        if path.suffix == '.csv':
+            lines = 0
+            last = b'\n'
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    lines += block.count(b'\n')
+                    last = block[-1:]
+            if last != b'\n':
+                lines += 1
+            return max(lines - 1, 0)
+        if path.suffix == '.json':
+            with open(path, 'r', encoding='utf-8') as f:
+                return len(json.load(f))
+        if path.suffix == '.npy':
+            import numpy as np
+            return int(np.load(path, mmap_mode='r').shape[0])
+    except Exception as e:
+        logging.warning(f"⚠️ Could not count rows of {path}: {e}")
+    return None
+
+
+def write_report(path: Path, nodes: Dict[str, dict], **metadata) -> dict:
+    """
+    Write the machine-readable run report, keeping the previous one next to it.
+
+    The previous report is moved to <name>.previous.json so it can be compared against.
+
+    Args:
+        path (Path): Report file (e.g. data/processed/run_report.json).
+        nodes (Dict[str, dict]): Node name → metrics.
+        **metadata: Extra top-level fields (e.g. jobs).
+
+    Returns:
+        dict: The written report.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        path.replace(previous_report_path(path))
+    report = {
+        "version": REPORT_VERSION,
+        "created_at": datetime.now().isoformat(timespec='seconds'),
+        **metadata,
+        "nodes": nodes,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def previous_report_path(path: Path) -> Path:
+    path = Path(path)
+    return path.with_name(f"{path.stem}.previous{path.suffix}")
+
+
+def load_report(path: Path) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_reports(current: dict, previous: dict, threshold: float = 0.2,
+                    min_delta: Optional[Dict[str, float]] = None) -> List[dict]:
+    """
+    Compare two run reports and list metric regressions.
+
+    Only nodes that actually ran in both reports are compared (cached nodes have no timings).
+
+    Args:
+        current (dict): New run report.
+        previous (dict): Baseline run report.
+        threshold (float, optional): Relative increase that counts as a regression. Defaults to 0.2 (20 %).
+        min_delta (Dict[str, float], optional): Absolute increase per metric below which changes are ignored,
+            to avoid flagging noise on very short stages. Defaults to 0.5 s for times and 20 MB for RSS.
+
+    Returns:
+        List[dict]: One entry per metric change with node, metric, previous, current, change and regression flag.
+    """
+    min_delta = min_delta or {"wall_s": 0.5, "cpu_s": 0.5, "peak_rss_mb": 20.0}
+    rows = []
+    for name, metrics in current.get("nodes", {}).items():
+        baseline = previous.get("nodes", {}).get(name)
+        if not baseline:
+            continue
+        for metric in COMPARED_METRICS:
+            new, old = metrics.get(metric), baseline.get(metric)
+            if new is None or old is None:
+                continue
+            change = (new - old) / old if old else (float('inf') if new > 0 else 0.0)
+            rows.append({
+                "node": name,
+                "metric": metric,
+                "previous": old,
+                "current": new,
+                "change": change,
+                "regression": change > threshold and (new - old) >= min_delta.get(metric, 0.0),
+            })
+    return rows
+
+
+def print_comparison(rows: List[dict], threshold: float) -> None:
+    print(f"\n📊 Run report comparison (regression threshold: {threshold:.0%})")
+    if not rows:
+        print("   No common profiled nodes to compare.")
+        return
+    for row in rows:
+        icon = "🔺" if row["regression"] else "  "
+        print(f"   {icon} {row['node']:<32} {row['metric']:<12} {row['previous']:>10} → {row['current']:<10} "
+              f"({row['change']:+.0%})")
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"⚠️ {len(regressions)} regression(s) above {threshold:.0%}")
+    else:
+        print("✅ No regressions")
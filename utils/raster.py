@@ -0,0 +1,123 @@
+import struct
+import zlib
+import numpy as np
+from pathlib import Path
+from typing import Sequence, Tuple
+
+# Colour ramp for continuous values (viridis stops), interpolated linearly
+RAMP = np.array([[68, 1, 84], [59, 82, 139], [33, 145, 140], [94, 201, 98], [253, 231, 37]], dtype=np.float64)
+BACKGROUND = (255, 255, 255)
+
+
+def hex_to_rgb(colors: Sequence[str]) -> np.ndarray:
+    """'#rrggbb' strings as an (K, 3) uint8 array."""
+    return np.array([[int(c[i:i + 2], 16) for i in (1, 3, 5)] for c in colors], dtype=np.uint8)
+
+
+def ramp_colors(values: np.ndarray) -> np.ndarray:
+    """Map values to the colour ramp between their 2nd and 98th percentile (NaN → grey)."""
+    values = np.asarray(values, dtype=np.float64)
+    colors = np.full((len(values), 3), 160, dtype=np.uint8)
+    valid = np.isfinite(values)
+    if not valid.any():
+        return colors
+    low, high = np.percentile(values[valid], [2, 98])
+    t = np.clip((values[valid] - low) / (high - low if high > low else 1.0), 0.0, 1.0) * (len(RAMP) - 1)
+    i = np.minimum(t.astype(np.int64), len(RAMP) - 2)
+    colors[valid] = np.round(RAMP[i] + (t - i)[:, None] * (RAMP[i + 1] - RAMP[i])).astype(np.uint8)
+    return colors
+
+
+def raster_shape(xy: np.ndarray, width: int, margin: float = 0.02) -> Tuple[np.ndarray, int]:
+    """
+    Bounds (with margin) of a metric buffer and the image height keeping its aspect ratio.
+
+    Returns:
+        Tuple[np.ndarray, int]: [xmin, ymin, xmax, ymax] and the height in pixels.
+    """
+    finite = xy[np.isfinite(xy).all(axis=1)]
+    low, high = finite.min(axis=0), finite.max(axis=0)
+    pad = (high - low).max() * margin + 1.0
+    bounds = np.concatenate([low - pad, high + pad])
+    height = max(1, int(round(width * (bounds[3] - bounds[1]) / (bounds[2] - bounds[0]))))
+    return bounds, height
+
+
+def to_pixels(xy: np.ndarray, bounds: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Metric coordinates to (column, row) pixel coordinates, north up."""
+    scale = width / (bounds[2] - bounds[0])
+    return np.column_stack([(xy[:, 0] - bounds[0]) * scale, (bounds[3] - xy[:, 1]) * scale])
+
+
+def draw_polylines(image: np.ndarray, pixels: np.ndarray, offsets: np.ndarray, colors: np.ndarray,
+                   thickness: int = 1, max_steps: int = 4_000_000) -> np.ndarray:
+    """
+    Rasterize every polyline of a flat pixel buffer into the image (DDA over all edges at once).
+
+    Every edge is sampled once per pixel of its longer axis; edges are processed in
+    batches of about `max_steps` samples to bound memory. Later polylines draw on top.
+
+    Args:
+        image (np.ndarray): (H, W, 3) uint8 image, modified in place.
+        pixels (np.ndarray): (N, 2) pixel coordinates (see to_pixels).
+        offsets (np.ndarray): (M + 1,) polyline offsets.
+        colors (np.ndarray): (M, 3) uint8 colour per polyline.
+        thickness (int, optional): Line width in pixels. Defaults to 1.
+
+    Returns:
+        np.ndarray: The image.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if len(pixels) < 2:
+        return image
+    owner = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    edge = np.flatnonzero(owner[:-1] == owner[1:])
+    p0, p1 = pixels[edge], pixels[edge + 1]
+    steps = np.ceil(np.abs(p1 - p0).max(axis=1)).astype(np.int64) + 1
+    edge_colors = colors[owner[edge]]
+    height, width = image.shape[:2]
+    spread = np.arange(thickness) - (thickness - 1) // 2
+
+    first_step = np.cumsum(steps) - steps
+    batches = np.unique(np.append(np.searchsorted(first_step, np.arange(0, steps.sum(), max_steps)), len(edge)))
+    for start, end in zip(batches[:-1], batches[1:]):
+        n = steps[start:end]
+        index = np.repeat(np.arange(start, end), n)
+        t = (np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)) / np.maximum(np.repeat(n - 1, n), 1)
+        points = np.round(p0[index] + t[:, None] * (p1[index] - p0[index])).astype(np.int64)
+        for dx in spread:
+            for dy in spread:
+                col, row = points[:, 0] + dx, points[:, 1] + dy
+                inside = (col >= 0) & (col < width) & (row >= 0) & (row < height)
+                image[row[inside], col[inside]] = edge_colors[index[inside]]
+    return image
+
+
+def draw_points(image: np.ndarray, pixels: np.ndarray, colors: np.ndarray, radius: int = 2) -> np.ndarray:
+    """Draw filled squares of side 2 * radius + 1 at the given pixel coordinates."""
+    height, width = image.shape[:2]
+    centers = np.round(pixels).astype(np.int64)
+    for dx in range(-radius, radius + 1):
+        for dy in range(-radius, radius + 1):
+            col, row = centers[:, 0] + dx, centers[:, 1] + dy
+            inside = (col >= 0) & (col < width) & (row >= 0) & (row < height)
+            image[row[inside], col[inside]] = colors[inside]
+    return image
+
+
+def write_png(path: Path, image: np.ndarray) -> Path:
+    """Write an (H, W, 3) uint8 image as an RGB PNG (standard library only)."""
+    height, width = image.shape[:2]
+    raw = np.hstack([np.zeros((height, 1), dtype=np.uint8), image.reshape(height, -1)]).tobytes()
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(raw, 6)))
+        f.write(chunk(b'IEND', b''))
+    return path
@@ -0,0 +1,263 @@
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.constants import CH_CACHE_DIR
+from utils.contraction import ContractionHierarchy, network_hash
+from utils.graph_ops import NO_PREDECESSOR, build_csr, dijkstra
+from utils.sumo_xml import edge_table, iter_elements
+
+# Routing graph arrays shared with pool workers (set once per worker by _init_worker)
+_WORKER_GRAPH = None
+# Cache lookup sentinel (None is a valid cached result: unreachable)
+_MISSING = object()
+
+
+class PathCache:
+    """
+    Least-recently-used cache of (from edge, to edge) → edge index path.
+
+    Unreachable pairs are cached too (as None), so they are not searched again.
+    """
+
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self._paths: "OrderedDict[Tuple[int, int], Optional[Tuple[int, ...]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, key: Tuple[int, int]) -> bool:
+        return key in self._paths
+
+    def get(self, key: Tuple[int, int], default=None):
+        if key in self._paths:
+            self.hits += 1
+            self._paths.move_to_end(key)
+            return self._paths[key]
+        self.misses += 1
+        return default
+
+    def put(self, key: Tuple[int, int], path: Optional[Tuple[int, ...]]) -> None:
+        self._paths[key] = path
+        self._paths.move_to_end(key)
+        while len(self._paths) > self.maxsize:
+            self._paths.popitem(last=False)
+
+
+class RoutingGraph:
+    """
+    Edge graph of a SUMO network for train routing: vertices are edges, arcs are connections.
+
+    Routing over connections (not nodes) keeps every route drivable in SUMO, e.g. a
+    train cannot turn back on the main line without a u-turn connection. The cost of
+    an arc is the length of the edge it leads to, so a path costs the length driven
+    after leaving its first edge. The CSR arrays are built once and shared with pool
+    workers.
+
+    Example:
+        graph = RoutingGraph.from_network(SUMO_EDGES_FILE, SUMO_CONNECTIONS_FILE, SUMO_NODES_FILE)
+        routes = graph.route_many([["main_A_B", "B_track_1_west_to_east"], ...], jobs=4)
+    """
+
+    def __init__(self, edge_ids: Sequence[str], lengths: Sequence[float], connections: pd.DataFrame,
+                 cache_size: int = 100_000):
+        """
+        Args:
+            edge_ids (Sequence[str]): Edge ids.
+            lengths (Sequence[float]): Edge length (meters) per edge.
+            connections (pd.DataFrame): from, to edge ids; connections with unknown edges are ignored.
+            cache_size (int, optional): Path cache size (see PathCache). Defaults to 100_000.
+        """
+        self.edge_ids = np.asarray(edge_ids, dtype=object)
+        self.lengths = np.asarray(lengths, dtype=np.float64)
+        self.index: Dict[str, int] = {edge_id: i for i, edge_id in enumerate(self.edge_ids)}
+        source = connections['from'].map(self.index)
+        target = connections['to'].map(self.index)
+        known = source.notna() & target.notna()
+        source, target = source[known].to_numpy(dtype=np.int64), target[known].to_numpy(dtype=np.int64)
+        self.csr = build_csr(source, target, self.lengths[target], len(self.edge_ids), directed=True)
+        self.cache = PathCache(cache_size)
+        self.hierarchy: Optional[ContractionHierarchy] = None
+
+    @classmethod
+    def from_network(cls, edges_file: Path, connections_file: Path, nodes_file: Optional[Path] = None,
+                     cache_size: int = 100_000) -> "RoutingGraph":
+        """
+        Read a stage 03 network (.edg.xml, .con.xml and, for edges without a shape, .nod.xml).
+        """
+        edges = edge_table(edges_file, nodes_file)
+        connections = pd.DataFrame([(c['from'], c['to']) for c in iter_elements(connections_file, "connection")],
+                                   columns=["from", "to"])
+        return cls(edges['id'].tolist(), edges['length'].to_numpy(), connections, cache_size)
+
+    def use_contraction(self, cache_dir: Path = CH_CACHE_DIR) -> ContractionHierarchy:
+        """
+        Answer cache misses from a contraction hierarchy instead of Dijkstra.
+
+        The hierarchy is stored per network hash, so it is built once per network and
+        loaded by every later run (e.g. each timetable variant) on the same network.
+        """
+        self.hierarchy = ContractionHierarchy.load_or_build(self.csr, network_hash(self.edge_ids, self.csr), cache_dir)
+        return self.hierarchy
+
+    def _solve(self, source: int, target: int) -> Optional[Tuple[int, ...]]:
+        if self.hierarchy is None:
+            return _shortest_path(self.csr, source, target)
+        _, path = self.hierarchy.query(source, target)
+        return None if path is None else tuple(path)
+
+    def _ids(self, path: Optional[Tuple[int, ...]]) -> Optional[List[str]]:
+        return None if path is None else self.edge_ids[list(path)].tolist()
+
+    def path(self, from_edge: str, to_edge: str) -> Optional[List[str]]:
+        """Shortest edge sequence from `from_edge` to `to_edge` (both included); None if unreachable."""
+        key = (self.index[from_edge], self.index[to_edge])
+        path = self.cache.get(key, _MISSING)
+        if path is _MISSING:
+            path = self._solve(*key)
+            self.cache.put(key, path)
+        return self._ids(path)
+
+    def route(self, stops: Sequence[str]) -> Optional[List[str]]:
+        """Edge sequence through all stops in order (consecutive legs joined at the stop edge)."""
+        return self.route_many([stops], jobs=1)[0]
+
+    def route_many(self, stop_sequences: Sequence[Sequence[str]], jobs: Optional[int] = None,
+                   block_size: int = 64) -> List[Optional[List[str]]]:
+        """
+        Resolve many stop sequences at once.
+
+        The legs of all sequences are deduplicated; legs already in the cache cost a
+        lookup, the rest are grouped by origin and searched in a process pool (one
+        Dijkstra per origin covers all its destinations). With use_contraction() the
+        misses are answered in-process from the hierarchy instead.
+
+        Args:
+            stop_sequences (Sequence[Sequence[str]]): Edge ids per train (origin, stops, destination).
+            jobs (int, optional): Worker processes; 1 runs in-process. Defaults to os.cpu_count().
+            block_size (int, optional): Origins per worker task. Defaults to 64.
+
+        Returns:
+            List[Optional[List[str]]]: Edge ids per sequence; None when a leg is unreachable or a stop is unknown.
+        """
+        sequences = [[self.index.get(stop) for stop in stops] for stops in stop_sequences]
+        legs = {(a, b) for stops in sequences if None not in stops for a, b in zip(stops[:-1], stops[1:])}
+        resolved = self._resolve(legs, jobs, block_size)
+
+        routes = []
+        for stops in sequences:
+            if None in stops or not stops:
+                routes.append(None)
+                continue
+            route = [stops[0]]
+            for a, b in zip(stops[:-1], stops[1:]):
+                leg = resolved[(a, b)]
+                if leg is None:
+                    route = None
+                    break
+                route.extend(leg[1:])
+            routes.append(self._ids(route))
+        return routes
+
+
+    def leg_lengths(self, pairs: Sequence[Tuple[str, str]], jobs: Optional[int] = None,
+                    block_size: int = 64) -> np.ndarray:
+        """
+        Length (meters) driven after leaving `from` until the end of `to`, per (from, to) edge id pair.
+
+        Legs are resolved like route_many (cache, then hierarchy or process pool).
+
+        Returns:
+            np.ndarray: One length per pair; inf when unreachable or an edge is unknown.
+        """
+        keys = [(self.index.get(a), self.index.get(b)) for a, b in pairs]
+        resolved = self._resolve({key for key in keys if None not in key}, jobs, block_size)
+        lengths = np.full(len(keys), np.inf)
+        for i, key in enumerate(keys):
+            path = resolved.get(key)
+            if path is not None:
+                lengths[i] = self.lengths[list(path[1:])].sum()
+        return lengths
+
+    def _resolve(self, legs, jobs: Optional[int], block_size: int) -> Dict[Tuple[int, int], Optional[Tuple[int, ...]]]:
+        """Edge index path per (from, to) leg: cache hits first, the misses are searched and cached."""
+        resolved, missing = {}, []
+        for leg in sorted(legs):
+            path = self.cache.get(leg, _MISSING)
+            if path is _MISSING:
+                missing.append(leg)
+            else:
+                resolved[leg] = path
+        if self.hierarchy is not None:
+            solved = ((key, self._solve(*key)) for key in missing)
+        else:
+            solved = solve_legs(self.csr, missing, jobs, block_size)
+        for key, path in solved:
+            self.cache.put(key, path)
+            resolved[key] = path
+        return resolved
+
+
+def _path_to(pred: np.ndarray, source: int, target: int) -> Optional[Tuple[int, ...]]:
+    """Edge index path from a predecessor row (None if unreachable)."""
+    path = [target]
+    while path[-1] != source:
+        node = int(pred[path[-1]])
+        if node == NO_PREDECESSOR:
+            return None
+        path.append(node)
+    return tuple(path[::-1])
+
+
+def _shortest_path(csr, source: int, target: int) -> Optional[Tuple[int, ...]]:
+    if source == target:
+        return (source,)
+    _, pred = dijkstra(*csr, source, target=target)
+    return _path_to(pred, source, target)
+
+
+def _init_worker(indptr, indices, data):
+    global _WORKER_GRAPH
+    _WORKER_GRAPH = (indptr.tolist(), indices.tolist(), data.tolist())
+
+
+def _solve_origins(block: List[Tuple[int, List[int]]]) -> List[Tuple[Tuple[int, int], Optional[Tuple[int, ...]]]]:
+    results = []
+    for source, targets in block:
+        # Tek hedef: erken durdurma; birden fazla hedef: tüm ağaç bir kez
+        _, pred = dijkstra(*_WORKER_GRAPH, source, target=targets[0] if len(targets) == 1 else None)
+        results.extend(((source, target), (source,) if target == source else _path_to(pred, source, target))
+                       for target in targets)
+    return results
+
+
+def solve_legs(csr: Tuple[np.ndarray, np.ndarray, np.ndarray], legs: Sequence[Tuple[int, int]],
+               jobs: Optional[int] = None, block_size: int = 64):
+    """
+    Shortest paths of many (from, to) edge index pairs, grouped by origin, optionally in a process pool.
+
+    Yields:
+        Tuple[Tuple[int, int], Optional[Tuple[int, ...]]]: (from, to) and its edge index path (None if unreachable).
+    """
+    by_origin: Dict[int, List[int]] = {}
+    for source, target in legs:
+        by_origin.setdefault(source, []).append(target)
+    origins = list(by_origin.items())
+    blocks = [origins[start:start + block_size] for start in range(0, len(origins), block_size)]
+
+    if jobs == 1 or len(blocks) <= 1:
+        _init_worker(*csr)
+        for block in blocks:
+            yield from _solve_origins(block)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=csr) as executor:
+        futures = [executor.submit(_solve_origins, block) for block in blocks]
+        for future in as_completed(futures):
+            yield from future.result()
@@ -0,0 +1,191 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from utils.config import PipelineConfig, default_config
+from utils.geometry_ops import offset_polylines, select_polylines, trim_polylines
+
+# Template key: (platform_count, decided_platform_length rounded to LENGTH_RESOLUTION); every track has
+# a West and an East node (both platform edge directions and u-turns need them), whatever the station type
+TemplateKey = Tuple[int, float]
+LENGTH_RESOLUTION = 0.1
+
+
+@dataclass(frozen=True)
+class LayoutTemplate:
+    """
+    Station layout in a local frame: x along the station axis (West → East), y to its left.
+
+    Attributes:
+        key (TemplateKey): Parameters the layout was built from.
+        track (np.ndarray): (n,) 1-based track number of every node.
+        side (np.ndarray): (n,) 'West' / 'East' of every node.
+        suffix (np.ndarray): (n,) node id suffix, e.g. "_track_3_west".
+        local (np.ndarray): (n, 2) node positions in the local frame.
+    """
+    key: TemplateKey
+    track: np.ndarray
+    side: np.ndarray
+    suffix: np.ndarray
+    local: np.ndarray
+
+
+def build_template(key: TemplateKey, config: Optional[PipelineConfig] = None) -> LayoutTemplate:
+    """
+    Compute the track nodes of one layout: `count` tracks `length` long, `default_platform_offset` apart.
+
+    Args:
+        key (TemplateKey): (platform_count, decided_platform_length).
+        config (PipelineConfig, optional): Tunables. Defaults to utils.constants.
+
+    Returns:
+        LayoutTemplate: Nodes ordered by track, West before East.
+    """
+    config = config or default_config()
+    count, length = key
+    track = np.repeat(np.arange(1, count + 1), 2)
+    side = np.tile(np.array(["West", "East"], dtype=object), count)
+    lateral = (track - (count + 1) / 2.0) * config.default_platform_offset
+    along = np.where(side == "West", -length / 2.0, length / 2.0)
+    suffix = np.array([f"_track_{t}_{s.lower()}" for t, s in zip(track, side)], dtype=object)
+    return LayoutTemplate(key=key, track=track, side=side, suffix=suffix, local=np.column_stack([along, lateral]))
+
+
+class LayoutTemplateCache:
+    """
+    Build every distinct station layout once per config and reuse it.
+
+    Example:
+        cache = LayoutTemplateCache(config)
+        tracks = place_track_nodes(station_df, axes, cache)
+    """
+
+    def __init__(self, config: Optional[PipelineConfig] = None):
+        self.config = config or default_config()
+        self._templates: Dict[TemplateKey, LayoutTemplate] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def get(self, key: TemplateKey) -> LayoutTemplate:
+        template = self._templates.get(key)
+        if template is None:
+            self.misses += 1
+            template = self._templates[key] = build_template(key, self.config)
+        else:
+            self.hits += 1
+        return template
+
+
+def template_keys(info: pd.DataFrame, config: PipelineConfig) -> pd.DataFrame:
+    """Key columns (count, length) of every station row."""
+    lengths = info['decided_platform_length'].fillna(config.default_platform_length).astype(float)
+    return pd.DataFrame({
+        "count": info['platform_count'].fillna(0).astype(np.int64),
+        "length": (lengths / LENGTH_RESOLUTION).round() * LENGTH_RESOLUTION,
+    }, index=info.index)
+
+
+def place_track_nodes(station_df: pd.DataFrame, axes: pd.DataFrame,
+                      cache: Optional[LayoutTemplateCache] = None) -> pd.DataFrame:
+    """
+    Track nodes of every station: its template rotated to the station heading and moved to its center.
+
+    Stations are grouped by template key; each group is placed with one batched
+    rotation and translation.
+
+    Args:
+        station_df (pd.DataFrame): STATION_HELPER_FILE rows (station, platform_count, decided_platform_length, type).
+        axes (pd.DataFrame): x, y, ux, uy indexed by station (see network_ops.station_axes).
+        cache (LayoutTemplateCache, optional): Template cache. Defaults to a new cache with default_config().
+
+    Returns:
+        pd.DataFrame: id, station, track, side, x, y, type, key — sorted by station, track, side.
+    """
+    cache = LayoutTemplateCache() if cache is None else cache
+    info = station_df.set_index('station').join(axes, how='inner')
+    keys = template_keys(info, cache.config)
+
+    frames = []
+    for key, stations in keys.groupby(["count", "length"], sort=False).groups.items():
+        template = cache.get((int(key[0]), float(key[1])))
+        n = len(template.local)
+        if n == 0:
+            continue
+        placed = info.loc[stations]
+        center = placed[['x', 'y']].to_numpy(dtype=np.float64)
+        u = placed[['ux', 'uy']].to_numpy(dtype=np.float64)
+        # Lokal (a, b) → dünya: merkez + a * u + b * (-uy, ux)
+        a, b = template.local[:, 0], template.local[:, 1]
+        world_x = center[:, [0]] + a * u[:, [0]] - b * u[:, [1]]
+        world_y = center[:, [1]] + a * u[:, [1]] + b * u[:, [0]]
+        names = pd.Series(np.repeat(placed.index.to_numpy(), n), dtype=object)
+        prefix = names.astype(str).str.split().str.join("-")
+        frames.append(pd.DataFrame({
+            "id": prefix + np.tile(template.suffix, len(placed)),
+            "station": names,
+            "track": np.tile(template.track, len(placed)),
+            "side": np.tile(template.side, len(placed)),
+            "x": world_x.ravel(), "y": world_y.ravel(),
+            "type": np.repeat(placed['type'].to_numpy(), n) if 'type' in placed else None,
+            "key": prefix + "_track_" + pd.Series(np.tile(template.track, len(placed))).astype(str),
+        }))
+    if not frames:
+        return pd.DataFrame(columns=["id", "station", "track", "side", "x", "y", "type", "key"])
+    return pd.concat(frames, ignore_index=True).sort_values(["station", "track", "side"], ignore_index=True)
+
+
+def platform_shapes(station_df: pd.DataFrame, tracks: pd.DataFrame, lines: pd.DataFrame, axis_xy: np.ndarray,
+                    axis_offsets: np.ndarray, config: Optional[PipelineConfig] = None) -> pd.Series:
+    """
+    Curved West → East shape of every platform track, following the main-line alignment of its station.
+
+    Every station axis is trimmed to `decided_platform_length` around the station, then
+    copied once per track and offset by the track's lateral position (the same
+    `default_platform_offset` spacing as the templates) in a single offset_polylines pass.
+
+    Args:
+        station_df (pd.DataFrame): STATION_HELPER_FILE rows.
+        tracks (pd.DataFrame): place_track_nodes output.
+        lines (pd.DataFrame): line and center per station (see network_ops.station_axis_lines).
+        axis_xy (np.ndarray): Axis line buffer.
+        axis_offsets (np.ndarray): Axis line offsets.
+        config (PipelineConfig, optional): Tunables. Defaults to utils.constants.
+
+    Returns:
+        pd.Series: (K, 2) shape per track key ("<station>_track_<n>"); stations without an axis line are left out.
+    """
+    config = config or default_config()
+    lengths = (station_df.set_index('station')['decided_platform_length'].astype(float)
+               .fillna(config.default_platform_length).reindex(lines.index).fillna(config.default_platform_length))
+    trimmed_xy, trimmed_offsets = trim_polylines(axis_xy, axis_offsets, lines['center'] - lengths / 2.0,
+                                                 lines['center'] + lengths / 2.0)
+
+    west = tracks[(tracks['side'] == "West") & tracks['station'].isin(lines.index)]
+    if not len(west):
+        return pd.Series(dtype=object)
+    count = tracks.groupby('station')['track'].max().reindex(west['station']).to_numpy()
+    lateral = (west['track'].to_numpy() - (count + 1) / 2.0) * config.default_platform_offset
+    shape_xy, shape_offsets = offset_polylines(
+        *select_polylines(trimmed_xy, trimmed_offsets, lines.loc[west['station'], 'line'].to_numpy()),
+        lateral, config.platform_miter_limit)
+    return pd.Series(np.split(shape_xy, shape_offsets[1:-1]), index=west['key'].to_numpy(), dtype=object)
+
+
+def snap_track_nodes(tracks: pd.DataFrame, shapes: pd.Series) -> pd.DataFrame:
+    """Move the West / East node of every shaped track to the first / last point of its shape."""
+    tracks = tracks.copy()
+    if not len(shapes):
+        return tracks
+    ends = pd.DataFrame({
+        "West_x": [shape[0, 0] for shape in shapes], "West_y": [shape[0, 1] for shape in shapes],
+        "East_x": [shape[-1, 0] for shape in shapes], "East_y": [shape[-1, 1] for shape in shapes],
+    }, index=shapes.index)
+    for side in ("West", "East"):
+        rows = (tracks['side'] == side) & tracks['key'].isin(ends.index)
+        tracks.loc[rows, 'x'] = ends.loc[tracks.loc[rows, 'key'], f"{side}_x"].to_numpy()
+        tracks.loc[rows, 'y'] = ends.loc[tracks.loc[rows, 'key'], f"{side}_y"].to_numpy()
+    return tracks
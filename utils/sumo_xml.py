@@ -0,0 +1,139 @@
+import os
+import xml.etree.ElementTree as ET
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+from xml.sax.saxutils import quoteattr
+
+SUMO_SCHEMAS = {
+    "nodes": "http://sumo.dlr.de/xsd/nodes_file.xsd",
+    "edges": "http://sumo.dlr.de/xsd/edges_file.xsd",
+    "connections": "http://sumo.dlr.de/xsd/connections_file.xsd",
+    "routes": "http://sumo.dlr.de/xsd/routes_file.xsd",
+    "additional": "http://sumo.dlr.de/xsd/additional_file.xsd",
+}
+
+
+class XmlStreamWriter:
+    """
+    Write a flat SUMO plain-XML file element by element, without building a DOM.
+
+    Elements are written as soon as they are produced, so memory does not grow with
+    the file. The file is written under a temporary name and moved into place only
+    when the block exits without an exception.
+
+    Example:
+        with XmlStreamWriter(path, "nodes") as xml:
+            xml.element("node", id="A", x=0.0, y=0.0)
+    """
+
+    def __init__(self, path: Path, root: str, buffer_bytes: int = 1024 * 1024, **root_attrs):
+        self.path = Path(path)
+        self.root = root
+        self.buffer_bytes = buffer_bytes
+        self.root_attrs = root_attrs
+        self.count = 0
+        self._depth = 1
+        self._file = None
+
+    def __enter__(self) -> "XmlStreamWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp = self.path.with_name(self.path.name + ".tmp")
+        self._file = open(self._tmp, 'w', encoding='utf-8', buffering=self.buffer_bytes)
+        self._file.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        attrs = dict(self.root_attrs)
+        if self.root in SUMO_SCHEMAS:
+            attrs = {"xmlns:xsi": "http://www.w3.org/2001/XMLSchema-instance",
+                     "xsi:noNamespaceSchemaLocation": SUMO_SCHEMAS[self.root], **attrs}
+        self._file.write(f"<{self.root}{self._attributes(attrs)}>\n")
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self._file.write(f"</{self.root}>\n")
+        self._file.close()
+        if exc_type is None:
+            os.replace(self._tmp, self.path)
+        else:
+            os.remove(self._tmp)
+
+    @staticmethod
+    def _attributes(attrs: dict) -> str:
+        return "".join(f" {name}={quoteattr(_format_value(value))}" for name, value in attrs.items()
+                       if value is not None)
+
+    def element(self, tag: str, **attrs) -> None:
+        """Write one empty element; attributes set to None are left out."""
+        self._file.write(f"{'    ' * self._depth}<{tag}{self._attributes(attrs)}/>\n")
+        self.count += 1
+
+    def start(self, tag: str, **attrs) -> None:
+        """Open an element with children (close it with end())."""
+        self._file.write(f"{'    ' * self._depth}<{tag}{self._attributes(attrs)}>\n")
+        self._depth += 1
+        self.count += 1
+
+    def end(self, tag: str) -> None:
+        self._depth -= 1
+        self._file.write(f"{'    ' * self._depth}</{tag}>\n")
+
+
+def _format_value(value) -> str:
+    if isinstance(value, (float, np.floating)):
+        return f"{value:.2f}"
+    return str(value)
+
+
+def format_shape(points: np.ndarray, precision: int = 2) -> Optional[str]:
+    """
+    SUMO shape attribute "x1,y1 x2,y2 ..." of an (N, 2) array; None for fewer than two points.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) < 2:
+        return None
+    return " ".join(f"{x:.{precision}f},{y:.{precision}f}" for x, y in points[:, :2])
+
+
+def iter_elements(path: Path, tag: str) -> Iterator[Dict[str, str]]:
+    """
+    Stream the attributes of every `tag` element of a SUMO XML file, clearing parsed elements as it goes.
+    """
+    for _, element in ET.iterparse(path, events=("end",)):
+        if element.tag == tag:
+            yield dict(element.attrib)
+            element.clear()
+
+
+def parse_shape(shape: Optional[str]) -> np.ndarray:
+    """(K, 2) array of a SUMO shape attribute (empty for None)."""
+    if not shape:
+        return np.zeros((0, 2))
+    return np.array([point.split(",")[:2] for point in shape.split()], dtype=np.float64)
+
+
+def edge_table(edges_file: Path, nodes_file: Optional[Path] = None) -> pd.DataFrame:
+    """
+    Read a .edg.xml file into one row per edge, in a single streaming pass.
+
+    The length is the `length` attribute if set, else the length of the shape (for edges
+    without a shape: the straight line between the nodes of `nodes_file`).
+
+    Returns:
+        pd.DataFrame: id, from, to, length and the first (start_x, start_y) and last (end_x, end_y) shape point.
+    """
+    nodes = {}
+    if nodes_file is not None:
+        nodes = {node['id']: (float(node['x']), float(node['y'])) for node in iter_elements(nodes_file, "node")}
+    rows = []
+    for edge in iter_elements(edges_file, "edge"):
+        shape = parse_shape(edge.get('shape'))
+        if len(shape) < 2 and edge.get('from') in nodes and edge.get('to') in nodes:
+            shape = np.array([nodes[edge['from']], nodes[edge['to']]])
+        if edge.get('length'):
+            length = float(edge['length'])
+        else:
+            length = float(np.hypot(*np.diff(shape, axis=0).T).sum()) if len(shape) >= 2 else 0.0
+        start, end = (shape[0], shape[-1]) if len(shape) else ((np.nan, np.nan), (np.nan, np.nan))
+        rows.append((edge['id'], edge.get('from'), edge.get('to'), length, *start, *end))
+    return pd.DataFrame(rows, columns=["id", "from", "to", "length", "start_x", "start_y", "end_x", "end_y"])
@@ -0,0 +1,136 @@
+import logging
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Iterator, Optional
+
+from utils.network_ops import _id_part
+from utils.routing import RoutingGraph
+
+# Columnar timetable: one row per train stop
+TIMETABLE_COLUMNS = ["train_id", "line", "stop_sequence", "station", "arrival", "departure", "consist_length"]
+
+
+def parse_clock(values) -> np.ndarray:
+    """
+    Times as seconds after midnight: numbers pass through, "HH:MM[:SS]" strings are converted
+    (hours may exceed 24 for trains running past midnight); empty values become NaN.
+    """
+    values = pd.Series(values)
+    numeric = pd.to_numeric(values, errors='coerce')
+    text = values.where(numeric.isna()).dropna().astype(str).str.strip()
+    parts = text[text != ""].str.split(":", expand=True)
+    if len(parts):
+        parts = parts.reindex(columns=range(3)).apply(pd.to_numeric, errors='coerce').fillna(0)
+        numeric.loc[parts.index] = parts[0] * 3600 + parts[1] * 60 + parts[2]
+    return numeric.to_numpy(dtype=np.float64)
+
+
+def load_timetable(path: Path, sep: str = ';') -> pd.DataFrame:
+    """
+    Read a columnar timetable and order it for streaming (see TIMETABLE_COLUMNS).
+
+    A missing arrival/departure falls back to the other time of the same stop.
+
+    Returns:
+        pd.DataFrame: TIMETABLE_COLUMNS plus 'depart' (first departure of the train), sorted by
+        depart, train_id and stop_sequence.
+    """
+    timetable = pd.read_csv(path, sep=sep, dtype={"train_id": str, "station": str})
+    missing = set(TIMETABLE_COLUMNS) - set(timetable.columns)
+    if missing:
+        raise ValueError(f"Timetable {path} is missing columns: {sorted(missing)}")
+    return order_timetable(timetable[TIMETABLE_COLUMNS])
+
+
+def order_timetable(timetable: pd.DataFrame) -> pd.DataFrame:
+    """Normalize times and sort stops by the train's first departure (see load_timetable)."""
+    timetable = timetable.copy()
+    arrival, departure = parse_clock(timetable['arrival']), parse_clock(timetable['departure'])
+    timetable['arrival'] = np.where(np.isnan(arrival), departure, arrival)
+    timetable['departure'] = np.where(np.isnan(departure), arrival, departure)
+    timetable = timetable.sort_values(["train_id", "stop_sequence"], kind='stable')
+    timetable['depart'] = timetable.groupby('train_id', sort=False)['departure'].transform('first')
+    return timetable.sort_values(["depart", "train_id", "stop_sequence"], kind='stable').reset_index(drop=True)
+
+
+def assign_stop_edges(timetable: pd.DataFrame, station_df: pd.DataFrame,
+                      logger: Optional[logging.Logger] = None) -> pd.DataFrame:
+    """
+    Assign every stop a platform track of its station.
+
+    Stops at stations without platform tracks in the network are dropped first. Tracks
+    are handed out round-robin per station in departure order; the direction is chosen
+    later from the network (see choose_stop_edges).
+
+    Args:
+        timetable (pd.DataFrame): order_timetable output.
+        station_df (pd.DataFrame): STATION_HELPER_FILE rows (station, platform_count).
+
+    Returns:
+        pd.DataFrame: The kept stops with a 'platform' column ("<station>_track_<n>"), same order as the input.
+    """
+    logger = logger or logging.getLogger(__name__)
+    counts = station_df.set_index('station')['platform_count'].fillna(0).astype(np.int64)
+    known = timetable['station'].map(counts).fillna(0) > 0
+    if (~known).any():
+        logger.warning(f"⚠️ {int((~known).sum())} stops at {timetable.loc[~known, 'station'].nunique()} stations "
+                       f"without platform tracks in the network were dropped")
+    stops = timetable[known].copy()
+    track = stops.groupby('station', sort=False).cumcount() % stops['station'].map(counts) + 1
+    stops['platform'] = (_id_part(stops['station']) + "_track_" + track.astype(str).to_numpy()).to_numpy()
+    return stops
+
+
+def choose_stop_edges(stops: pd.DataFrame, graph: RoutingGraph) -> pd.DataFrame:
+    """
+    Pick the platform edge direction of every stop from the network.
+
+    Each stop may use either direction of its track. Per train, the combination with
+    the shortest total route is kept (a shortest path over the two directions of each
+    stop, with leg lengths from the routing graph), so trains that skip stations or
+    turn back get platform edges they can actually reach. All legs of the block are
+    resolved in one leg_lengths call.
+
+    Args:
+        stops (pd.DataFrame): assign_stop_edges output (whole trains, in order).
+        graph (RoutingGraph): Routing graph of the network.
+
+    Returns:
+        pd.DataFrame: stops with an 'edge' column; unreachable trains keep west_to_east where undecided.
+    """
+    platform = stops['platform'].to_numpy(dtype=object)
+    candidates = np.stack([platform + "_west_to_east", platform + "_east_to_west"], axis=1)
+    train = stops['train_id'].to_numpy()
+    legs = np.flatnonzero(train[1:] == train[:-1])
+    pairs = [(candidates[i, a], candidates[i + 1, b]) for i in legs for a in (0, 1) for b in (0, 1)]
+    leg_cost = np.full((len(stops), 2, 2), np.inf)
+    if pairs:
+        leg_cost[legs] = graph.leg_lengths(pairs).reshape(-1, 2, 2)
+    known = np.vectorize(lambda edge: edge in graph.index, otypes=[bool])(candidates)
+
+    choice = np.zeros(len(stops), dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, train[1:] != train[:-1]])
+    for first, end in zip(starts, np.r_[starts[1:], len(stops)]):
+        # İleri geçiş: her durak için iki yönün en kısa toplamı ve önceki yön
+        cost = np.where(known[first], 0.0, np.inf)
+        previous = np.zeros((end - first, 2), dtype=np.int64)
+        for i in range(first + 1, end):
+            total = cost[:, None] + leg_cost[i - 1]
+            previous[i - first] = np.argmin(total, axis=0)
+            cost = total.min(axis=0)
+        # Geri izleme
+        state = int(np.argmin(cost))
+        for i in range(end - 1, first - 1, -1):
+            choice[i] = state
+            state = previous[i - first, state]
+    stops = stops.copy()
+    stops['edge'] = candidates[np.arange(len(stops)), choice]
+    return stops
+
+
+def iter_train_chunks(stops: pd.DataFrame, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Consecutive blocks of whole trains (at most `chunk_size` trains each), in timetable order."""
+    train_number = (stops['train_id'] != stops['train_id'].shift()).cumsum() - 1
+    for _, chunk in stops.groupby(train_number // chunk_size, sort=True):
+        yield chunk
@@ -0,0 +1,153 @@
+import folium
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+from utils.geometry_ops import simplify_buffer_mask, compact_offsets
+
+# Line colours (CSS hex, usable in GeoJSON path styles)
+LINE_COLORS = [
+    '#e6194b', '#3cb44b', '#4363d8', '#f58231', '#911eb4', '#46f0f0', '#f032e6',
+    '#bcf60c', '#008080', '#9a6324', '#800000', '#808000', '#000075', '#fabebe',
+    '#aaffc3', '#ffd8b1', '#e6beff', '#808080', '#000000', '#ffe119'
+]
+
+
+def line_color_map(line_ids: Sequence) -> Dict[int, str]:
+    """Assign a colour to each line id, in order of first appearance."""
+    return {line_id: LINE_COLORS[i % len(LINE_COLORS)] for i, line_id in enumerate(pd.unique(pd.Series(line_ids)))}
+
+
+def quantize(latlon: np.ndarray, precision: int) -> np.ndarray:
+    """Round [lat, lon] to `precision` decimals (5 ≈ 1 m) to shrink the embedded GeoJSON."""
+    return np.round(np.asarray(latlon, dtype=np.float64), precision)
+
+
+def segment_layer(segment_df: pd.DataFrame, xy: np.ndarray, latlon: np.ndarray, offsets: np.ndarray,
+                  tolerance: float, precision: int) -> dict:
+    """
+    Build one FeatureCollection with a simplified LineString per segment.
+
+    Simplification runs on the metric EPSG:2056 buffer, so `tolerance` is in meters;
+    only the kept vertices are written (as [lon, lat], GeoJSON order).
+
+    Args:
+        segment_df (pd.DataFrame): Segments aligned with the buffers (Linie, START_OP, END_OP, polygon_length).
+        xy (np.ndarray): (N, 2) EPSG:2056 buffer.
+        latlon (np.ndarray): (N, 2) WGS84 [lat, lon] buffer.
+        offsets (np.ndarray): (rows + 1,) offsets.
+        tolerance (float): Douglas-Peucker tolerance (meters).
+        precision (int): Decimals kept in lat/lon.
+
+    Returns:
+        dict: GeoJSON FeatureCollection; properties carry the line colour for styling.
+    """
+    mask = simplify_buffer_mask(xy, offsets, tolerance)
+    kept_offsets = compact_offsets(mask, offsets)
+    lonlat = quantize(latlon[mask], precision)[:, ::-1]
+    colors = line_color_map(segment_df['Linie'])
+    lengths = segment_df['polygon_length'] if 'polygon_length' in segment_df else pd.Series(np.nan, index=segment_df.index)
+
+    features = []
+    for i, (line_id, start_op, end_op, length) in enumerate(
+            zip(segment_df['Linie'], segment_df['START_OP'], segment_df['END_OP'], lengths)):
+        coords = lonlat[kept_offsets[i]:kept_offsets[i + 1]]
+        if len(coords) < 2:
+            continue
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "LineString", "coordinates": coords.tolist()},
+            "properties": {
+                "Linie": int(line_id), "START_OP": start_op, "END_OP": end_op,
+                "length_m": None if pd.isna(length) else round(float(length)), "color": colors[line_id],
+            },
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+
+def point_layer(latlon: np.ndarray, properties: List[dict], precision: int) -> dict:
+    """
+    Build one FeatureCollection of Point features.
+
+    Args:
+        latlon (np.ndarray): (K, 2) WGS84 [lat, lon].
+        properties (List[dict]): One property dict per point.
+        precision (int): Decimals kept in lat/lon.
+
+    Returns:
+        dict: GeoJSON FeatureCollection.
+    """
+    lonlat = quantize(latlon, precision)[:, ::-1].reshape(-1, 2)
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": coords}, "properties": props}
+            for coords, props in zip(lonlat.tolist(), properties)
+        ],
+    }
+
+
+def station_center_points(segment_df: pd.DataFrame, latlon: np.ndarray, offsets: np.ndarray):
+    """
+    Station positions as the mean of the segment endpoints touching each station.
+
+    Returns:
+        Tuple[np.ndarray, List[dict]]: (K, 2) [lat, lon] and {"station": ...} properties.
+    """
+    has_points = offsets[1:] > offsets[:-1]
+    ends = pd.DataFrame({
+        "station": np.concatenate([segment_df['START_OP'].to_numpy()[has_points],
+                                   segment_df['END_OP'].to_numpy()[has_points]]),
+        "lat": np.concatenate([latlon[offsets[:-1][has_points], 0], latlon[offsets[1:][has_points] - 1, 0]]),
+        "lon": np.concatenate([latlon[offsets[:-1][has_points], 1], latlon[offsets[1:][has_points] - 1, 1]]),
+    })
+    centers = ends.groupby("station", sort=True)[["lat", "lon"]].mean()
+    return centers.to_numpy(), [{"station": station} for station in centers.index]
+
+
+def save_layered_map(path: Path, segments: dict, stations: dict = None, entry_nodes: dict = None,
+                     location=(46.8, 8.3), zoom_start: int = 8) -> Path:
+    """
+    Write a folium map with one GeoJSON layer per feature collection.
+
+    Each layer is a single GeoJson element (one style function and one tooltip
+    template), instead of one PolyLine/Marker per feature.
+
+    Args:
+        path (Path): Output HTML file.
+        segments (dict): Segment FeatureCollection (see segment_layer).
+        stations (dict, optional): Station center FeatureCollection. Defaults to None.
+        entry_nodes (dict, optional): Entry node FeatureCollection. Defaults to None.
+
+    Returns:
+        Path: The written file.
+    """
+    m = folium.Map(location=list(location), zoom_start=zoom_start, prefer_canvas=True)
+
+    folium.GeoJson(
+        segments, name="Segments (by Linie)",
+        style_function=lambda feature: {"color": feature["properties"]["color"], "weight": 3, "opacity": 0.8},
+        tooltip=folium.GeoJsonTooltip(fields=["Linie", "START_OP", "END_OP", "length_m"],
+                                      aliases=["Linie", "Start", "End", "Length (m)"]),
+    ).add_to(m)
+    if stations is not None and stations["features"]:
+        folium.GeoJson(
+            stations, name="Station centers",
+            marker=folium.CircleMarker(radius=4, color="#1f4e9c", fill=True, fill_opacity=0.9),
+            tooltip=folium.GeoJsonTooltip(fields=["station"], aliases=["Station"]),
+        ).add_to(m)
+    if entry_nodes is not None and entry_nodes["features"]:
+        folium.GeoJson(
+            entry_nodes, name="Entry nodes",
+            marker=folium.CircleMarker(radius=3, color="#222222", fill=True, fill_color="#ffd400", fill_opacity=0.9),
+            tooltip=folium.GeoJsonTooltip(fields=["station", "connected_station", "direction", "line"],
+                                          aliases=["Station", "Towards", "Direction", "Linie"]),
+        ).add_to(m)
+    folium.LayerControl().add_to(m)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    m.save(str(path))
+    return path
+